@@ -6,7 +6,9 @@ Provides abstraction layer for DuckDB (dev) and PostgreSQL (prod).
 
 import os
 import logging
-from typing import Optional, Protocol, Any
+import threading
+import weakref
+from typing import Optional, Protocol, Any, List, Tuple
 from pathlib import Path
 import pandas as pd
 from contextlib import contextmanager
@@ -25,11 +27,27 @@ class DatabaseBackend(Protocol):
         """Execute a non-SELECT query."""
         ...
     
+    def execute_many(self, sql: str, params_seq: List[tuple]) -> None:
+        """Execute a non-SELECT query once per parameter tuple, in one transaction."""
+        ...
+    
+    def execute_prepared(self, name: str, sql: str, params_seq: List[tuple]) -> None:
+        """Like execute_many, reusing a statement prepared once under ``name``."""
+        ...
+    
+    def copy_rows(self, table_name: str, columns: List[str], rows: List[tuple]) -> None:
+        """Bulk-append plain rows to a table, in one transaction."""
+        ...
+    
     def insert_df(self, df: pd.DataFrame, table_name: str, if_exists: str = 'append',
                   conflict_columns: Optional[list] = None) -> None:
         """Insert a pandas DataFrame into a table with optional upsert."""
         ...
     
+    def insert_dfs(self, frames: List[Tuple[pd.DataFrame, str, Optional[list]]]) -> None:
+        """Append several DataFrames, each as (df, table_name, conflict_columns), in one transaction."""
+        ...
+    
     def table_exists(self, table_name: str) -> bool:
         """Check if a table exists."""
         ...
@@ -60,6 +78,14 @@ class DuckDBBackend:
         
         db_existed = self.db_path.exists()
         
+        # A DuckDB connection is not safe to share between threads, and its
+        # transactions are per connection: threads other than the one that
+        # opened the database each get their own cursor (see _conn)
+        self._owner_thread = threading.get_ident()
+        self._local = threading.local()
+        self._cursors: List[Any] = []
+        self._cursors_lock = threading.Lock()
+        
         try:
             self._connection = duckdb.connect(str(self.db_path), read_only=read_only)
             self._configure_connection()
@@ -122,19 +148,92 @@ class DuckDBBackend:
         finally:
             clear_schema_db()
     
+    @property
+    def _conn(self):
+        """
+        The calling thread's handle on the database.
+        
+        The opening thread uses the main connection; any other thread gets a
+        cursor of it, created on first use, so its transactions cannot
+        interleave with (or be committed by) another thread's.
+        """
+        if threading.get_ident() == self._owner_thread:
+            return self._connection
+        cursor = getattr(self._local, 'cursor', None)
+        if cursor is None:
+            cursor = self._connection.cursor()
+            self._local.cursor = cursor
+            with self._cursors_lock:
+                self._cursors.append(cursor)
+        return cursor
+    
     def query(self, sql: str, params: Optional[tuple] = None) -> pd.DataFrame:
         """Execute a SELECT query and return results as DataFrame."""
+        conn = self._conn
         if params:
-            return self._connection.execute(sql, params).df()
-        return self._connection.execute(sql).df()
+            return conn.execute(sql, params).df()
+        return conn.execute(sql).df()
     
     def execute(self, sql: str, params: Optional[tuple] = None) -> None:
         """Execute a non-SELECT query."""
+        conn = self._conn
         if params:
-            self._connection.execute(sql, params)
+            conn.execute(sql, params)
         else:
-            self._connection.execute(sql)
-        self._connection.commit()
+            conn.execute(sql)
+        conn.commit()
+    
+    def execute_many(self, sql: str, params_seq: List[tuple]) -> None:
+        """Execute a non-SELECT query once per parameter tuple.
+        
+        All rows are written in one transaction and committed once.
+        """
+        if not params_seq:
+            return
+        conn = self._conn
+        conn.begin()
+        try:
+            conn.executemany(sql, params_seq)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    
+    def execute_prepared(self, name: str, sql: str, params_seq: List[tuple]) -> None:
+        """Execute a non-SELECT query once per parameter tuple.
+        
+        DuckDB's executemany already prepares the statement once per call,
+        so ``name`` is unused and this is execute_many.
+        """
+        self.execute_many(sql, params_seq)
+    
+    def copy_rows(self, table_name: str, columns: List[str], rows: List[tuple]) -> None:
+        """Bulk-append plain rows to a table.
+        
+        The rows are registered as one DataFrame and inserted with a single
+        INSERT ... SELECT instead of a statement per row.
+        
+        Args:
+            table_name: Target table name.
+            columns: Column names, in the order the row values appear.
+            rows: Row tuples.
+        """
+        if not rows:
+            return
+        conn = self._conn
+        conn.register('temp_rows', pd.DataFrame(rows, columns=columns, dtype=object))
+        conn.begin()
+        try:
+            column_list = ', '.join(columns)
+            conn.execute(
+                f"INSERT INTO {table_name} ({column_list}) SELECT {column_list} FROM temp_rows"
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.unregister('temp_rows')
     
     def insert_df(self, df: pd.DataFrame, table_name: str, if_exists: str = 'append',
                   conflict_columns: Optional[list] = None) -> None:
@@ -149,7 +248,8 @@ class DuckDBBackend:
         """
         if df.empty:
             return
-        self._connection.register('temp_df', df)
+        conn = self._conn
+        conn.register('temp_df', df)
         
         if if_exists == 'replace':
             # Drop and recreate table for replace mode
@@ -162,7 +262,40 @@ class DuckDBBackend:
             self.execute(f"INSERT OR REPLACE INTO {table_name} ({columns}) SELECT {columns} FROM temp_df")
         else:
             self.execute(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM temp_df")
-        self._connection.unregister('temp_df')
+        conn.unregister('temp_df')
+    
+    def insert_dfs(self, frames: List[Tuple[pd.DataFrame, str, Optional[list]]]) -> None:
+        """Append several DataFrames to their tables in a single transaction.
+        
+        Either every frame is written or none are, and the whole batch is
+        committed once instead of once per table.
+        
+        Args:
+            frames: List of (df, table_name, conflict_columns) tuples. Empty
+                frames are skipped; conflict_columns behaves as in insert_df.
+        """
+        frames = [frame for frame in frames if not frame[0].empty]
+        if not frames:
+            return
+        
+        conn = self._conn
+        conn.begin()
+        try:
+            for i, (df, table_name, conflict_columns) in enumerate(frames):
+                view_name = f'temp_df_{i}'
+                conn.register(view_name, df)
+                try:
+                    columns = ', '.join(df.columns)
+                    insert = 'INSERT OR REPLACE INTO' if conflict_columns else 'INSERT INTO'
+                    conn.execute(
+                        f"{insert} {table_name} ({columns}) SELECT {columns} FROM {view_name}"
+                    )
+                finally:
+                    conn.unregister(view_name)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
     
     def table_exists(self, table_name: str) -> bool:
         """Check if a table exists."""
@@ -180,6 +313,10 @@ class DuckDBBackend:
     def close(self) -> None:
         """Close the database connection."""
         if hasattr(self, '_connection') and self._connection:
+            with self._cursors_lock:
+                for cursor in self._cursors:
+                    cursor.close()
+                self._cursors.clear()
             self._connection.close()
             self._connection = None
 
@@ -203,6 +340,9 @@ class PostgreSQLBackend:
         
         logger.info("PostgreSQL connection pool established")
         
+        # Names PREPAREd on each pooled connection (see execute_prepared)
+        self._prepared: "weakref.WeakKeyDictionary[Any, set]" = weakref.WeakKeyDictionary()
+        
         # Initialize schema if needed
         self._initialize_schema()
     
@@ -272,6 +412,113 @@ class PostgreSQLBackend:
         finally:
             self._return_connection(conn)
     
+    def execute_many(self, sql: str, params_seq: List[tuple]) -> None:
+        """Execute a non-SELECT query once per parameter tuple.
+        
+        Uses one pooled connection and one transaction, and sends the
+        statements in pages rather than one round trip per row.
+        """
+        import psycopg2.extras
+        
+        if not params_seq:
+            return
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cursor:
+                psycopg2.extras.execute_batch(cursor, sql, params_seq)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            self._return_connection(conn)
+    
+    def execute_prepared(self, name: str, sql: str, params_seq: List[tuple]) -> None:
+        """Execute a query once per parameter tuple via a server-side prepared statement.
+        
+        The statement is PREPAREd the first time each pooled connection runs
+        it and EXECUTEd by name afterwards, so the server parses and plans it
+        once per session rather than once per call.
+        
+        Args:
+            name: Prepared statement name, unique per distinct ``sql``.
+            sql: Statement with %s placeholders.
+            params_seq: Parameter tuples.
+        """
+        import psycopg2.extras
+        
+        if not params_seq:
+            return
+        n_params = sql.count('%s')
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cursor:
+                prepared = self._prepared.setdefault(conn, set())
+                if name not in prepared:
+                    numbered = sql.split('%s')
+                    body = ''.join(
+                        part + (f'${i}' if i <= n_params else '')
+                        for i, part in enumerate(numbered, 1)
+                    )
+                    cursor.execute(f"PREPARE {name} AS {body}")
+                    # Prepared statements belong to the session and survive rollback
+                    prepared.add(name)
+                psycopg2.extras.execute_batch(
+                    cursor,
+                    f"EXECUTE {name} ({', '.join(['%s'] * n_params)})",
+                    params_seq
+                )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            self._return_connection(conn)
+    
+    @staticmethod
+    def _copy_text_value(value: Any) -> str:
+        """Encode one value for COPY's text format."""
+        if value is None:
+            return '\\N'
+        return (
+            str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r')
+        )
+    
+    def copy_rows(self, table_name: str, columns: List[str], rows: List[tuple]) -> None:
+        """Bulk-append plain rows to a table with COPY FROM STDIN.
+        
+        Args:
+            table_name: Target table name.
+            columns: Column names, in the order the row values appear.
+            rows: Row tuples; values are sent as text and None as NULL.
+        """
+        import io
+        
+        if not rows:
+            return
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write('\t'.join(self._copy_text_value(value) for value in row))
+            buffer.write('\n')
+        buffer.seek(0)
+        
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {table_name} ({', '.join(columns)}) FROM STDIN", buffer
+                )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            self._return_connection(conn)
+    
     def insert_df(self, df: pd.DataFrame, table_name: str, if_exists: str = 'append',
                   conflict_columns: Optional[list] = None) -> None:
         """Insert a pandas DataFrame into a table with optional upsert.
@@ -319,6 +566,47 @@ class PostgreSQLBackend:
             )
             engine.dispose()
     
+    def insert_dfs(self, frames: List[Tuple[pd.DataFrame, str, Optional[list]]]) -> None:
+        """Append several DataFrames to their tables in a single transaction.
+        
+        All frames go through one pooled connection and are committed once,
+        so either every table is written or none are.
+        
+        Args:
+            frames: List of (df, table_name, conflict_columns) tuples. Empty
+                frames are skipped; with conflict_columns, conflicting rows
+                are updated as in insert_df.
+        """
+        import psycopg2.extras
+        
+        frames = [frame for frame in frames if not frame[0].empty]
+        if not frames:
+            return
+        
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cursor:
+                for df, table_name, conflict_columns in frames:
+                    sql = f"INSERT INTO {table_name} ({', '.join(df.columns)}) VALUES %s"
+                    if conflict_columns:
+                        update_cols = [c for c in df.columns if c not in conflict_columns]
+                        sql += f" ON CONFLICT ({', '.join(conflict_columns)}) "
+                        sql += (
+                            "DO UPDATE SET " + ', '.join(f"{c} = EXCLUDED.{c}" for c in update_cols)
+                            if update_cols else "DO NOTHING"
+                        )
+                    # Native Python values, with missing values sent as NULL
+                    values = df.astype(object).where(df.notna(), None)
+                    psycopg2.extras.execute_values(
+                        cursor, sql, list(values.itertuples(index=False, name=None)), page_size=1000
+                    )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise e
+        finally:
+            self._return_connection(conn)
+    
     def table_exists(self, table_name: str) -> bool:
         """Check if a table exists."""
         result = self.query(
@@ -383,11 +671,27 @@ class DatabaseConnection:
         """Execute a non-SELECT query."""
         return self._backend.execute(sql, params)
     
+    def execute_many(self, sql: str, params_seq: List[tuple]) -> None:
+        """Execute a non-SELECT query once per parameter tuple, in one transaction."""
+        return self._backend.execute_many(sql, params_seq)
+    
+    def execute_prepared(self, name: str, sql: str, params_seq: List[tuple]) -> None:
+        """Like execute_many, reusing a statement prepared once under ``name``."""
+        return self._backend.execute_prepared(name, sql, params_seq)
+    
+    def copy_rows(self, table_name: str, columns: List[str], rows: List[tuple]) -> None:
+        """Bulk-append plain rows to a table, in one transaction."""
+        return self._backend.copy_rows(table_name, columns, rows)
+    
     def insert_df(self, df: pd.DataFrame, table_name: str, if_exists: str = 'append',
                   conflict_columns: Optional[list] = None) -> None:
         """Insert a pandas DataFrame into a table."""
         return self._backend.insert_df(df, table_name, if_exists, conflict_columns=conflict_columns)
     
+    def insert_dfs(self, frames: List[Tuple[pd.DataFrame, str, Optional[list]]]) -> None:
+        """Append several DataFrames, atomically where the backend supports it."""
+        return self._backend.insert_dfs(frames)
+    
     def table_exists(self, table_name: str) -> bool:
         """Check if a table exists."""
         return self._backend.table_exists(table_name)
@@ -5,7 +5,7 @@ Enables Alembic autogenerate and provides type-safe query interfaces.
 """
 
 from sqlalchemy import (
-    Column, String, Integer, BigInteger, Float, Boolean, Date, DateTime, JSON, Text,
+    Column, String, Integer, BigInteger, Float, REAL, Boolean, Date, DateTime, JSON, Text,
     PrimaryKeyConstraint, Index, ForeignKey, func, create_engine
 )
 from sqlalchemy.orm import declarative_base, relationship
@@ -93,8 +93,8 @@ class ICIETFWeeklyFlows(Base):
 
     week_ending = Column(Date, nullable=False)
     fund_type = Column(String, nullable=False)
-    estimated_flows = Column(Float)
-    total_net_assets = Column(Float)
+    estimated_flows = Column(REAL)
+    total_net_assets = Column(REAL)
     created_at = Column(DateTime, default=func.now())
 
     __table_args__ = (
@@ -110,11 +110,11 @@ class ICIETFFlows(Base):
 
     date = Column(Date, nullable=False)
     fund_category = Column(String, nullable=False)
-    net_new_cash_flow = Column(Float)
-    net_issuance = Column(Float)
-    redemptions = Column(Float)
-    reinvested_dividends = Column(Float)
-    total_net_assets = Column(Float)
+    net_new_cash_flow = Column(REAL)
+    net_issuance = Column(REAL)
+    redemptions = Column(REAL)
+    reinvested_dividends = Column(REAL)
+    total_net_assets = Column(REAL)
     created_at = Column(DateTime, default=func.now())
 
     __table_args__ = (
@@ -53,6 +53,7 @@ def _sqlalchemy_type_to_duckdb(column):
         'INTEGER': 'INTEGER',
         'BIGINTEGER': 'BIGINT',
         'FLOAT': 'DOUBLE',
+        'REAL': 'FLOAT',
         'DOUBLE': 'DOUBLE',
         'BOOLEAN': 'BOOLEAN',
         'DATE': 'DATE',
@@ -77,6 +78,7 @@ def _sqlalchemy_type_to_postgres(column):
         'INTEGER': 'INTEGER',
         'BIGINTEGER': 'BIGINT',
         'FLOAT': 'DOUBLE PRECISION',
+        'REAL': 'REAL',
         'DOUBLE': 'DOUBLE PRECISION',
         'BOOLEAN': 'BOOLEAN',
         'DATE': 'DATE',
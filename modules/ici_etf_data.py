@@ -12,11 +12,20 @@ ICI provides weekly and monthly ETF flow statistics including:
 
 import pandas as pd
 import requests
+import logging
 from datetime import datetime
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 import io
 import time
 
+logger = logging.getLogger(__name__)
+
+# Flow and asset figures are stored as 4-byte floats (see models.ICIETF*)
+WEEKLY_FLOW_COLUMNS = ['estimated_flows', 'total_net_assets']
+MONTHLY_FLOW_COLUMNS = ['net_new_cash_flow', 'net_issuance', 'redemptions',
+                        'reinvested_dividends', 'total_net_assets']
+
 
 # ICI ETF flows data URLs
 ICI_WEEKLY_FLOWS_URL = "https://www.ici.org/system/files/stats/weekly_combined_efdata.csv"
@@ -32,6 +41,14 @@ ICI_HEADERS = {
 }
 
 
+def _downcast_flows(df: pd.DataFrame, numeric_cols: list, category_col: str) -> pd.DataFrame:
+    """Downcast flow columns to float32 and the fund label column to category."""
+    converted = {col: pd.to_numeric(df[col], errors='coerce').astype('float32')
+                 for col in numeric_cols}
+    converted[category_col] = df[category_col].astype('category')
+    return df.assign(**converted)
+
+
 def fetch_ici_weekly_etf_flows() -> pd.DataFrame:
     """
     Fetch weekly ETF flows data from ICI.
@@ -43,7 +60,7 @@ def fetch_ici_weekly_etf_flows() -> pd.DataFrame:
         - estimated_flows: Estimated weekly flows in millions
         - total_net_assets: Total net assets in millions
     """
-    print("Fetching ICI weekly ETF flows data...")
+    logger.info("Fetching ICI weekly ETF flows data")
     
     try:
         response = requests.get(
@@ -87,15 +104,16 @@ def fetch_ici_weekly_etf_flows() -> pd.DataFrame:
         
         # Select and order columns
         df = df[required_cols].dropna(subset=['week_ending'])
+        df = _downcast_flows(df, WEEKLY_FLOW_COLUMNS, 'fund_type')
         
-        print(f"Successfully fetched {len(df)} weekly ETF flow records")
+        logger.info(f"Fetched {len(df)} weekly ETF flow records")
         return df
         
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching ICI weekly data: {e}")
+        logger.error(f"Error fetching ICI weekly data: {e}")
         return pd.DataFrame()
     except Exception as e:
-        print(f"Error processing ICI weekly data: {e}")
+        logger.error(f"Error processing ICI weekly data: {e}")
         return pd.DataFrame()
 
 
@@ -113,7 +131,7 @@ def fetch_ici_monthly_etf_flows() -> pd.DataFrame:
         - reinvested_dividends: Reinvested dividends
         - total_net_assets: Total net assets
     """
-    print("Fetching ICI monthly ETF flows data...")
+    logger.info("Fetching ICI monthly ETF flows data")
     
     try:
         response = requests.get(
@@ -160,15 +178,16 @@ def fetch_ici_monthly_etf_flows() -> pd.DataFrame:
         
         # Select and order columns
         df = df[required_cols].dropna(subset=['date'])
+        df = _downcast_flows(df, MONTHLY_FLOW_COLUMNS, 'fund_category')
         
-        print(f"Successfully fetched {len(df)} monthly ETF flow records")
+        logger.info(f"Fetched {len(df)} monthly ETF flow records")
         return df
         
     except requests.exceptions.RequestException as e:
-        print(f"Error fetching ICI monthly data: {e}")
+        logger.error(f"Error fetching ICI monthly data: {e}")
         return pd.DataFrame()
     except Exception as e:
-        print(f"Error processing ICI monthly data: {e}")
+        logger.error(f"Error processing ICI monthly data: {e}")
         return pd.DataFrame()
 
 
@@ -189,43 +208,44 @@ def save_ici_etf_flows_to_duckdb(weekly_df: Optional[pd.DataFrame] = None,
     
     results = {'weekly_records': 0, 'monthly_records': 0}
     
-    # Fetch data if not provided
-    if weekly_df is None:
+    # Fetch data if not provided. The two downloads are independent, so run
+    # them concurrently; the database write below stays on this thread.
+    if weekly_df is None and monthly_df is None:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            weekly_future = executor.submit(fetch_ici_weekly_etf_flows)
+            monthly_future = executor.submit(fetch_ici_monthly_etf_flows)
+            weekly_df, monthly_df = weekly_future.result(), monthly_future.result()
+    elif weekly_df is None:
         weekly_df = fetch_ici_weekly_etf_flows()
-    if monthly_df is None:
+    elif monthly_df is None:
         monthly_df = fetch_ici_monthly_etf_flows()
     
     db = get_db_connection()
     
-    # Save weekly flows
-    if not weekly_df.empty:
-        try:
-            # Clean data for insertion
-            weekly_clean = weekly_df.copy()
-            weekly_clean['week_ending'] = pd.to_datetime(weekly_clean['week_ending'])
-            
-            db.insert_df(weekly_clean, 'ici_etf_weekly_flows', if_exists='append',
-                         conflict_columns=['week_ending', 'fund_type'])
-            results['weekly_records'] = len(weekly_clean)
-            print(f"Saved {len(weekly_clean)} weekly ETF flow records to DuckDB")
-        except Exception as e:
-            print(f"Error saving weekly flows to DuckDB: {e}")
-            log_data_refresh('ici_etf_weekly_flows', 0, 'failed', str(e))
+    # Clean data for insertion
+    weekly_clean = weekly_df.copy()
+    if not weekly_clean.empty:
+        weekly_clean['week_ending'] = pd.to_datetime(weekly_clean['week_ending'])
+    monthly_clean = monthly_df.copy()
+    if not monthly_clean.empty:
+        monthly_clean['date'] = pd.to_datetime(monthly_clean['date'])
     
-    # Save monthly flows
-    if not monthly_df.empty:
-        try:
-            # Clean data for insertion
-            monthly_clean = monthly_df.copy()
-            monthly_clean['date'] = pd.to_datetime(monthly_clean['date'])
-            
-            db.insert_df(monthly_clean, 'ici_etf_flows', if_exists='append',
-                         conflict_columns=['date', 'fund_category'])
-            results['monthly_records'] = len(monthly_clean)
-            print(f"Saved {len(monthly_clean)} monthly ETF flow records to DuckDB")
-        except Exception as e:
-            print(f"Error saving monthly flows to DuckDB: {e}")
-            log_data_refresh('ici_etf_flows', 0, 'failed', str(e))
+    # Write both tables in one transaction so a failed refresh never leaves
+    # weekly and monthly flows out of step with each other
+    try:
+        db.insert_dfs([
+            (weekly_clean, 'ici_etf_weekly_flows', ['week_ending', 'fund_type']),
+            (monthly_clean, 'ici_etf_flows', ['date', 'fund_category']),
+        ])
+        results['weekly_records'] = len(weekly_clean)
+        results['monthly_records'] = len(monthly_clean)
+        logger.info(
+            f"Saved {len(weekly_clean)} weekly and {len(monthly_clean)} monthly "
+            f"ETF flow records to DuckDB"
+        )
+    except Exception as e:
+        logger.error(f"Error saving ICI ETF flows to DuckDB: {e}")
+        log_data_refresh('ici_etf_data', 0, 'failed', str(e))
     
     # Log successful refresh
     total_records = results['weekly_records'] + results['monthly_records']
@@ -283,22 +303,21 @@ def refresh_ici_etf_data() -> dict:
     Returns:
         Dictionary with refresh statistics
     """
-    print("=" * 60)
-    print("ICI ETF Data Refresh")
-    print(f"Started at: {datetime.now()}")
-    print("=" * 60)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"ICI ETF data refresh started at {datetime.now()}")
     
     results = save_ici_etf_flows_to_duckdb()
     
-    print("\n" + "=" * 60)
-    print("ICI ETF Data Refresh Summary")
-    print("=" * 60)
-    print(f"Weekly records: {results['weekly_records']}")
-    print(f"Monthly records: {results['monthly_records']}")
-    print(f"Completed at: {datetime.now()}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            f"ICI ETF data refresh completed at {datetime.now()}: "
+            f"{results['weekly_records']} weekly records, "
+            f"{results['monthly_records']} monthly records"
+        )
     
     return results
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     refresh_ici_etf_data()
@@ -12,6 +12,7 @@ IMF provides:
 - Government Finance Statistics
 """
 
+import numpy as np
 import pandas as pd
 import logging
 from typing import Optional, List, Dict, Any
@@ -32,6 +33,50 @@ IMF_DATASETS = {
 }
 
 
+def _flatten_imf_values(
+    values: Dict[str, Dict[str, Any]],
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Flatten an IMF ``values`` payload into country_code/year/value columns.
+    
+    The nested dict is walked once into flat lists and the values are coerced
+    with ``pd.to_numeric`` in a single vectorized pass; empty or non-numeric
+    cells become NaN and are dropped.
+    
+    Args:
+        values: IMF response ``values`` mapping of country -> {year: value}
+        start_year: Optional inclusive lower bound on year
+        end_year: Optional inclusive upper bound on year
+        
+    Returns:
+        DataFrame with country_code, year and value columns
+    """
+    countries = []
+    years = []
+    raw_values = []
+    for country_code, data in values.items():
+        countries.extend([country_code] * len(data))
+        years.extend(data.keys())
+        raw_values.extend(data.values())
+    
+    numeric = pd.to_numeric(pd.Series(raw_values, dtype=object), errors='coerce').to_numpy()
+    year_arr = np.asarray(years, dtype=np.int32)
+    
+    mask = ~np.isnan(numeric)
+    if start_year:
+        mask &= year_arr >= start_year
+    if end_year:
+        mask &= year_arr <= end_year
+    
+    return pd.DataFrame({
+        'country_code': np.asarray(countries, dtype=object)[mask],
+        'year': year_arr[mask],
+        'value': numeric[mask],
+    })
+
+
 def fetch_imf_exchange_rates(countries: Optional[List[str]] = None) -> pd.DataFrame:
     """
     Fetch exchange rates from IMF.
@@ -62,19 +107,10 @@ def fetch_imf_exchange_rates(countries: Optional[List[str]] = None) -> pd.DataFr
             logger.warning("No exchange rate data returned from IMF")
             return pd.DataFrame()
         
-        records = []
-        for country_code, data in response['values'].items():
-            for year, value in data.items():
-                if value and value != '':
-                    records.append({
-                        'country_code': country_code,
-                        'year': int(year),
-                        'exchange_rate': float(value),
-                        'indicator': 'ENDA_XDC_USD_RATE',
-                        'indicator_name': 'Exchange Rate to USD',
-                    })
-        
-        df = pd.DataFrame(records)
+        df = _flatten_imf_values(response['values'])
+        df = df.rename(columns={'value': 'exchange_rate'})
+        df['indicator'] = 'ENDA_XDC_USD_RATE'
+        df['indicator_name'] = 'Exchange Rate to USD'
         
         if not df.empty:
             df['date'] = pd.to_datetime(df['year'].astype(str) + '-12-31')
@@ -124,26 +160,8 @@ def fetch_imf_indicator(
             logger.warning(f"No data returned for indicator {indicator}")
             return pd.DataFrame()
         
-        records = []
-        for country_code, data in response['values'].items():
-            for year, value in data.items():
-                year_int = int(year)
-                
-                # Filter by date range
-                if start_year and year_int < start_year:
-                    continue
-                if end_year and year_int > end_year:
-                    continue
-                
-                if value and value != '':
-                    records.append({
-                        'country_code': country_code,
-                        'year': year_int,
-                        'value': float(value),
-                        'indicator': indicator,
-                    })
-        
-        df = pd.DataFrame(records)
+        df = _flatten_imf_values(response['values'], start_year, end_year)
+        df['indicator'] = indicator
         
         if not df.empty:
             df['date'] = pd.to_datetime(df['year'].astype(str) + '-12-31')
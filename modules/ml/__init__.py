@@ -9,40 +9,55 @@ Comprehensive machine learning toolkit including:
 - Feature Engineering: 100+ technical, fundamental, and alternative features
 - Hyperparameter Optimization: Bayesian optimization with Optuna
 - Recession Modeling: Economic indicator-based probability models
+
+This is the single canonical package init. Submodules are imported lazily
+(PEP 562) on first attribute access, so ``import modules.ml`` does not pull
+in xgboost, lightgbm, sklearn or optuna until a name is actually used.
 """
 
-from .models import XGBoostModel, LightGBMModel, EnsembleModel
-from .training import ModelTrainer
-from .prediction import PredictionEngine
-from .evaluation import ModelEvaluator
-from .recession_model import RecessionProbabilityModel
-from .feature_engineering import FeatureEngineer, FeatureConfig
-from .hyperparameter_tuning import HyperparameterOptimizer, OptimizationConfig, optimize_model_hyperparameters
+import importlib
+from typing import Any
 
-__all__ = [
+# Public name -> submodule that defines it
+_LAZY_EXPORTS = {
     # Core Models
-    'XGBoostModel',
-    'LightGBMModel',
-    'EnsembleModel',
-    
+    'XGBoostModel': 'models',
+    'LightGBMModel': 'models',
+    'EnsembleModel': 'models',
+
     # Training & Prediction
-    'ModelTrainer',
-    'PredictionEngine',
-    
+    'ModelTrainer': 'training',
+    'PredictionEngine': 'prediction',
+
     # Evaluation
-    'ModelEvaluator',
-    
+    'ModelEvaluator': 'evaluation',
+
     # Feature Engineering
-    'FeatureEngineer',
-    'FeatureConfig',
-    
+    'FeatureEngineer': 'feature_engineering',
+    'FeatureConfig': 'feature_engineering',
+
     # Hyperparameter Optimization
-    'HyperparameterOptimizer',
-    'OptimizationConfig',
-    'optimize_model_hyperparameters',
-    
+    'HyperparameterOptimizer': 'hyperparameter_tuning',
+    'OptimizationConfig': 'hyperparameter_tuning',
+    'optimize_model_hyperparameters': 'hyperparameter_tuning',
+
     # Specialized Models
-    'RecessionProbabilityModel',
-]
+    'RecessionProbabilityModel': 'recession_model',
+}
+
+__all__ = list(_LAZY_EXPORTS)
 
 __version__ = '2.0.0'
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value  # cache so __getattr__ is only hit once per name
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
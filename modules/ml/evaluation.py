@@ -8,27 +8,425 @@ Includes financial metrics and prediction quality assessment.
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, NamedTuple, Optional, Tuple, Any
+import importlib.util
 import logging
 import os
-from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score,
-    roc_auc_score, roc_curve, confusion_matrix, classification_report,
-    log_loss
-)
+from collections import OrderedDict
+from sklearn.metrics import confusion_matrix, classification_report
+
+# Plotting libraries are imported inside the plot methods; only check that
+# they are installed so importing this module stays cheap.
+PLOTTING_AVAILABLE = importlib.util.find_spec('matplotlib') is not None
+
+# Set once the non-interactive Agg backend has been selected
+_AGG_BACKEND_SET = False
 
 try:
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    PLOTTING_AVAILABLE = True
+    from numba import njit
+    NUMBA_AVAILABLE = True
 except ImportError:
-    PLOTTING_AVAILABLE = False
+    NUMBA_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
 from modules.database.factory import get_db_connection
 
+# Maximum number of evaluate_model_predictions results kept per evaluator
+_EVALUATION_CACHE_SIZE = 64
+
+# Cheap probe for the evaluation cache: the latest prediction and price dates
+# identify the version of the data an evaluation was computed from.
+# Parameters: ticker, prediction_type, ticker.
+_DATA_VERSION_QUERY = """
+    SELECT
+        (SELECT MAX(date) FROM ml_predictions WHERE ticker = ? AND prediction_type = ?) as last_prediction,
+        (SELECT MAX(date) FROM yfinance_ohlcv WHERE ticker = ?) as last_price
+"""
+
+# Open-ended bounds used when no evaluation date range is given
+_MIN_EVALUATION_DATE = '1900-01-01'
+_MAX_EVALUATION_DATE = '2999-12-31'
+
+# Joins predictions to the realised 5-day forward outcome. Parameters:
+# ticker, [prediction_type, ...], start_date, end_date, ticker, start_date.
+# The SQL text is fixed and every value is bound, so each call is a single
+# prepare-and-execute on the connection. DuckDB's Python API has no
+# reusable prepared-statement handle, and SQL-level PREPARE/EXECUTE can't
+# take bound parameters, so there is no plan to keep between calls.
+# The date range is pushed into both CTEs so the LEAD window only scans the
+# needed slice of price history; outcomes are bounded below only, because
+# the window has to see the 5 rows after end_date.
+_EVALUATION_CTE = """
+    WITH predictions AS (
+        SELECT
+            p.ticker,
+            p.date as prediction_date,
+            p.prediction_type,
+            p.prediction,
+            p.probability_up,
+            p.probability_down,
+            p.confidence
+        FROM ml_predictions p
+        WHERE p.ticker = ?
+        AND list_contains(?, p.prediction_type)
+        AND p.date BETWEEN ? AND ?
+    ),
+    outcomes AS (
+        SELECT
+            ticker,
+            date,
+            close,
+            LEAD(close, 5) OVER (PARTITION BY ticker ORDER BY date) as future_close
+        FROM yfinance_ohlcv
+        WHERE ticker = ?
+        AND date >= ?
+    ),
+    combined AS (
+        SELECT
+            p.*,
+            o.close as price_at_prediction,
+            o.future_close,
+            CASE
+                WHEN o.future_close > o.close THEN 1
+                ELSE 0
+            END as actual_outcome,
+            (o.future_close - o.close) / o.close as actual_return
+        FROM predictions p
+        JOIN outcomes o ON p.ticker = o.ticker AND p.prediction_date = o.date
+        WHERE o.future_close IS NOT NULL
+    )
+"""
+
+_EVALUATION_QUERY = _EVALUATION_CTE + """
+    SELECT * FROM combined
+    ORDER BY prediction_date
+"""
+
+# Same metrics as evaluate_model_predictions, reduced inside DuckDB to one
+# row per prediction_type. Tied probabilities get the average of their
+# ascending and descending ranks for the Mann-Whitney AUC. Takes the
+# _EVALUATION_QUERY parameters.
+_SUMMARY_QUERY = _EVALUATION_CTE + """,
+    ranked AS (
+        SELECT
+            *,
+            RANK() OVER (PARTITION BY prediction_type ORDER BY probability_up) as rank_asc,
+            RANK() OVER (PARTITION BY prediction_type ORDER BY probability_up DESC) as rank_desc,
+            COUNT(*) OVER (PARTITION BY prediction_type) as n_rows,
+            GREATEST(LEAST(probability_up, 1 - 2.220446049250313e-16), 2.220446049250313e-16) as p_clipped,
+            actual_return * prediction as strategy_return
+        FROM combined
+    )
+    SELECT
+        prediction_type,
+        COUNT(*) as num_predictions,
+        MIN(prediction_date) as start_date,
+        MAX(prediction_date) as end_date,
+        COUNT(*) FILTER (WHERE prediction = 0 AND actual_outcome = 0) as tn,
+        COUNT(*) FILTER (WHERE prediction = 1 AND actual_outcome = 0) as fp,
+        COUNT(*) FILTER (WHERE prediction = 0 AND actual_outcome = 1) as fn,
+        COUNT(*) FILTER (WHERE prediction = 1 AND actual_outcome = 1) as tp,
+        SUM((rank_asc + n_rows + 1 - rank_desc) / 2.0) FILTER (WHERE actual_outcome = 1) as positive_rank_sum,
+        AVG(CASE WHEN actual_outcome = 1 THEN -LN(p_clipped) ELSE -LN(1 - p_clipped) END) as log_loss,
+        COUNT(actual_return) as num_trades,
+        COUNT(*) FILTER (
+            WHERE (prediction = 1 AND actual_return > 0) OR (prediction = 0 AND actual_return <= 0)
+        ) as num_correct,
+        AVG(strategy_return) as avg_return,
+        STDDEV_SAMP(strategy_return) as returns_std,
+        PRODUCT(1 + strategy_return) - 1 as total_return
+    FROM ranked
+    GROUP BY prediction_type
+"""
+
+
+def _import_pyplot():
+    """
+    Import pyplot on the non-interactive Agg backend.
+    
+    Plots are only ever written to files, so no GUI toolkit is loaded.
+    
+    Returns:
+        The matplotlib.pyplot module, or None if matplotlib is not installed
+    """
+    global _AGG_BACKEND_SET
+    try:
+        import matplotlib
+        if not _AGG_BACKEND_SET:
+            matplotlib.use('Agg')
+            _AGG_BACKEND_SET = True
+        import matplotlib.pyplot as plt
+    except ImportError:
+        logger.warning("Matplotlib not available. Skipping plot.")
+        return None
+    return plt
+
+
+def _classification_report_from_cm(
+    cm: np.ndarray,
+    target_names: List[str],
+    digits: int = 2
+) -> str:
+    """
+    Format sklearn's classification_report text from a confusion matrix.
+    
+    Per-class precision/recall/F1/support come straight from the matrix
+    (rows actual, columns predicted) with zero_division=0, so the labels
+    are never scanned again.
+    """
+    cm = np.asarray(cm, dtype=np.int64)
+    tp = np.diag(cm).astype(np.float64)
+    predicted = cm.sum(axis=0)
+    support = cm.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(predicted > 0, tp / predicted, 0.0)
+        recall = np.where(support > 0, tp / support, 0.0)
+        f1 = np.where(predicted + support > 0, 2 * tp / (predicted + support), 0.0)
+    total = int(support.sum())
+    
+    headers = ["precision", "recall", "f1-score", "support"]
+    width = max(max(len(name) for name in target_names), len("weighted avg"), digits)
+    head_fmt = "{:>{width}s} " + " {:>9}" * len(headers)
+    row_fmt = "{:>{width}s} " + " {:>9.{digits}f}" * 3 + " {:>9}\n"
+    
+    report = head_fmt.format("", *headers, width=width) + "\n\n"
+    for name, p, r, f, n in zip(target_names, precision, recall, f1, support):
+        report += row_fmt.format(name, p, r, f, int(n), width=width, digits=digits)
+    report += "\n"
+    
+    accuracy = tp.sum() / total if total else 0.0
+    report += ("{:>{width}s} " + " {:>9.{digits}}" * 2 + " {:>9.{digits}f}" + " {:>9}\n").format(
+        "accuracy", "", "", accuracy, total, width=width, digits=digits
+    )
+    report += row_fmt.format(
+        "macro avg", precision.mean(), recall.mean(), f1.mean(), total,
+        width=width, digits=digits
+    )
+    weights = support if total else None
+    report += row_fmt.format(
+        "weighted avg",
+        np.average(precision, weights=weights),
+        np.average(recall, weights=weights),
+        np.average(f1, weights=weights),
+        total, width=width, digits=digits
+    )
+    return report
+
+
+def _isoformat(value: Any) -> str:
+    """Render a date/timestamp from a query result for evaluation_period."""
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def _evaluation_params(
+    ticker: str,
+    prediction_types: List[str],
+    start_date: Optional[str],
+    end_date: Optional[str]
+) -> tuple:
+    """Bind parameters shared by _EVALUATION_QUERY and _SUMMARY_QUERY."""
+    return (
+        ticker, list(prediction_types),
+        start_date or _MIN_EVALUATION_DATE, end_date or _MAX_EVALUATION_DATE,
+        ticker, start_date or _MIN_EVALUATION_DATE,
+    )
+
+
+class RocBundle(NamedTuple):
+    """Everything derived from one sort of the positive-class scores."""
+    order: np.ndarray        # argsort of the scores, ascending
+    ranks: np.ndarray        # 1-based ranks, ties averaged
+    fpr: np.ndarray          # ROC false positive rates, one point per distinct threshold
+    tpr: np.ndarray          # ROC true positive rates
+    thresholds: np.ndarray   # decreasing score thresholds (first is +inf)
+    auc: float
+    log_loss: float
+
+
+def _sorted_average_ranks(sorted_scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (average rank, tie-group id) for each position of an ascending array."""
+    n = len(sorted_scores)
+    group_start = np.empty(n, dtype=bool)
+    group_start[:1] = True
+    np.not_equal(sorted_scores[1:], sorted_scores[:-1], out=group_start[1:])
+    starts = np.flatnonzero(group_start)
+    ends = np.append(starts[1:], n)
+    group_id = np.cumsum(group_start) - 1
+    # Positions starts..ends-1 hold ranks starts+1..ends; their mean is the tie rank
+    return ((starts + ends + 1) / 2.0)[group_id], group_id
+
+
+def _fast_binary_auc(y_true: np.ndarray, y_score: np.ndarray) -> float:
+    """
+    Binary ROC-AUC via the Mann-Whitney U rank formulation.
+    
+    Equivalent to ``roc_auc_score`` for {0, 1} labels without building the
+    ROC curve. Tied scores receive average ranks.
+    
+    Args:
+        y_true: True labels (1 = positive class)
+        y_score: Scores or probabilities for the positive class
+        
+    Returns:
+        ROC-AUC, or NaN when only one class is present
+    """
+    y_true = np.asarray(y_true)
+    y_score = np.asarray(y_score)
+    n = len(y_true)
+    n_pos = int((y_true == 1).sum())
+    n_neg = n - n_pos
+    if n == 0 or n_pos == 0 or n_neg == 0:
+        return float('nan')
+    
+    order = np.argsort(y_score, kind='mergesort')
+    sorted_ranks, _ = _sorted_average_ranks(y_score[order])
+    return float(
+        (sorted_ranks[y_true[order] == 1].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+    )
+
+
+def _compute_roc_bundle(y_true: np.ndarray, y_score: np.ndarray) -> RocBundle:
+    """
+    Sort the positive-class scores once and derive ranks, the ROC curve,
+    ROC-AUC and log loss from that single ordering.
+    
+    Requires both classes to be present. Log loss uses the positive-class
+    probability with sklearn's eps clipping. Scores may be float32; the
+    ordering, and therefore the AUC, is unchanged by the narrower dtype.
+    
+    Args:
+        y_true: True labels (1 = positive class)
+        y_score: Probabilities for the positive class
+        
+    Returns:
+        RocBundle shared by the metrics, the ROC plot and the report
+    """
+    y_true = np.asarray(y_true)
+    y_score = np.asarray(y_score)
+    n = len(y_true)
+    
+    order = np.argsort(y_score, kind='mergesort')
+    sorted_scores = y_score[order]
+    sorted_positive = y_true[order] == 1
+    n_pos = int(sorted_positive.sum())
+    n_neg = n - n_pos
+    
+    sorted_ranks, group_id = _sorted_average_ranks(sorted_scores)
+    ranks = np.empty(n, dtype=np.float64)
+    ranks[order] = sorted_ranks
+    auc = (sorted_ranks[sorted_positive].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+    
+    # Walk from the highest score down, keeping the last row of each tie group
+    tps = np.cumsum(sorted_positive[::-1])
+    fps = np.arange(1, n + 1) - tps
+    group_end = np.append(group_id[::-1][1:] != group_id[::-1][:-1], True)
+    fpr = np.concatenate(([0.0], fps[group_end] / n_neg))
+    tpr = np.concatenate(([0.0], tps[group_end] / n_pos))
+    thresholds = np.concatenate(([np.inf], sorted_scores[::-1][group_end]))
+    
+    # Log loss is accumulated in float64 even when the scores are float32
+    eps = np.finfo(np.float64).eps
+    clipped = np.clip(sorted_scores.astype(np.float64), eps, 1 - eps)
+    log_loss = -np.where(sorted_positive, np.log(clipped), np.log1p(-clipped)).mean()
+    
+    return RocBundle(order, ranks, fpr, tpr, thresholds, float(auc), float(log_loss))
+
+
+def _rolling_mean(values: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """
+    Trailing rolling mean via a cumulative-sum difference.
+    
+    Matches ``pd.Series(values).rolling(window, min_periods=min_periods).mean()``
+    for integer indicators, where the cumulative sum is exact.
+    """
+    cumsum = np.concatenate(([0], np.cumsum(values)))
+    end = np.arange(1, len(values) + 1)
+    start = np.maximum(end - window, 0)
+    counts = end - start
+    out = (cumsum[end] - cumsum[start]) / counts
+    out[counts < min_periods] = np.nan
+    return out
+
+
+def _metrics_from_counts(tn: int, fp: int, fn: int, tp: int) -> Dict[str, float]:
+    """Derive accuracy/precision/recall/F1 from binary confusion counts (zero_division=0)."""
+    n = tn + fp + fn + tp
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    return {
+        'accuracy': (tp + tn) / n if n else 0.0,
+        'precision': precision,
+        'recall': recall,
+        'f1': 2 * tp / (2 * tp + fp + fn) if tp else 0.0,
+        'support': n
+    }
+
+
+def _fused_metrics_kernel(y_true, y_pred, returns):
+    """
+    Single pass over the predictions accumulating confusion counts and
+    strategy-return statistics (Welford mean/M2 and summed log1p growth).
+    
+    Rows with a NaN return still count towards the confusion matrix but are
+    excluded from the financial statistics.
+    """
+    tp = 0
+    fp = 0
+    fn = 0
+    tn = 0
+    n_trades = 0
+    n_correct = 0
+    mean = 0.0
+    m2 = 0.0
+    log_growth = 0.0
+    for i in range(y_true.shape[0]):
+        actual = y_true[i]
+        predicted = y_pred[i]
+        if predicted == 1:
+            if actual == 1:
+                tp += 1
+            else:
+                fp += 1
+        else:
+            if actual == 1:
+                fn += 1
+            else:
+                tn += 1
+        
+        ret = returns[i]
+        if np.isnan(ret):
+            continue
+        n_trades += 1
+        if (predicted == 1 and ret > 0) or (predicted == 0 and ret <= 0):
+            n_correct += 1
+        strategy_return = ret * predicted
+        delta = strategy_return - mean
+        mean += delta / n_trades
+        m2 += delta * (strategy_return - mean)
+        log_growth += np.log1p(strategy_return)
+    return tp, fp, fn, tn, n_trades, n_correct, mean, m2, log_growth
+
+
+def _welford_kernel(values):
+    """One pass over ``values`` returning (mean, M2, sum of log1p)."""
+    mean = 0.0
+    m2 = 0.0
+    log_growth = 0.0
+    for i in range(values.shape[0]):
+        value = values[i]
+        delta = value - mean
+        mean += delta / (i + 1)
+        m2 += delta * (value - mean)
+        log_growth += np.log1p(value)
+    return mean, m2, log_growth
+
+
+if NUMBA_AVAILABLE:
+    _fused_metrics_kernel = njit(cache=True)(_fused_metrics_kernel)
+    _welford_kernel = njit(cache=True)(_welford_kernel)
+
 
 class ModelEvaluator:
     """
@@ -54,11 +452,25 @@ class ModelEvaluator:
         if os.getenv('DATABASE_BACKEND', 'duckdb').lower() == 'duckdb' and not os.getenv('DUCKDB_PATH'):
             os.environ['DUCKDB_PATH'] = db_path
         
+        # LRU cache of evaluation results keyed on query arguments + data version
+        self._cache: OrderedDict = OrderedDict()
+        
+        # Database connection, looked up on first use
+        self._db = None
+    
+    @property
+    def db(self):
+        """Database connection shared by every query this evaluator runs."""
+        if self._db is None:
+            self._db = get_db_connection()
+        return self._db
+    
     def evaluate_predictions(
         self,
         y_true: np.ndarray,
         y_pred: np.ndarray,
-        y_proba: Optional[np.ndarray] = None
+        y_proba: Optional[np.ndarray] = None,
+        roc_bundle: Optional[RocBundle] = None
     ) -> Dict[str, float]:
         """
         Calculate comprehensive evaluation metrics.
@@ -67,17 +479,20 @@ class ModelEvaluator:
             y_true: True labels
             y_pred: Predicted labels
             y_proba: Predicted probabilities (for ROC-AUC, log loss)
+            roc_bundle: Precomputed ROC bundle for y_proba, if available
             
         Returns:
             Dictionary of evaluation metrics
         """
-        metrics = {
-            'accuracy': accuracy_score(y_true, y_pred),
-            'precision': precision_score(y_true, y_pred, zero_division=0),
-            'recall': recall_score(y_true, y_pred, zero_division=0),
-            'f1': f1_score(y_true, y_pred, zero_division=0),
-            'support': len(y_true)
-        }
+        # One bincount pass gives the confusion counts; every threshold
+        # metric is derived from them
+        _, cm_dict = self.get_confusion_matrix(y_true, y_pred)
+        if not cm_dict:
+            raise ValueError("evaluate_predictions expects binary {0, 1} labels")
+        metrics = _metrics_from_counts(
+            cm_dict['true_negatives'], cm_dict['false_positives'],
+            cm_dict['false_negatives'], cm_dict['true_positives']
+        )
         
         # Add probabilistic metrics if probabilities provided
         if y_proba is not None and len(np.unique(y_true)) > 1:
@@ -88,8 +503,10 @@ class ModelEvaluator:
                 else:
                     y_proba_positive = y_proba
                 
-                metrics['roc_auc'] = roc_auc_score(y_true, y_proba_positive)
-                metrics['log_loss'] = log_loss(y_true, y_proba)
+                if roc_bundle is None:
+                    roc_bundle = _compute_roc_bundle(y_true, y_proba_positive)
+                metrics['roc_auc'] = roc_bundle.auc
+                metrics['log_loss'] = roc_bundle.log_loss
             except Exception as e:
                 logger.warning(f"Could not calculate probabilistic metrics: {e}")
                 metrics['roc_auc'] = 0.0
@@ -112,7 +529,17 @@ class ModelEvaluator:
         Returns:
             Tuple of (confusion matrix, dictionary of TN/FP/FN/TP)
         """
-        cm = confusion_matrix(y_true, y_pred)
+        y_true = np.asarray(y_true, dtype=np.int64)
+        y_pred = np.asarray(y_pred, dtype=np.int64)
+        
+        if y_true.size and (
+            y_true.min() < 0 or y_true.max() > 1 or y_pred.min() < 0 or y_pred.max() > 1
+        ):
+            # Not a {0, 1} problem; let sklearn work out the label set
+            cm = confusion_matrix(y_true, y_pred)
+        else:
+            # Rows are actual, columns predicted: index 2*actual + predicted
+            cm = np.bincount(2 * y_true + y_pred, minlength=4).reshape(2, 2)
         
         # Extract values (assuming binary classification)
         if cm.shape == (2, 2):
@@ -137,7 +564,8 @@ class ModelEvaluator:
         Calculate financial performance metrics.
         
         Assumes predictions_df has 'prediction' column (1=up, 0=down)
-        and actual_returns are the realized returns.
+        and actual_returns are the realized returns. Only the 'prediction'
+        column is read, so a wider frame can be passed without slicing it.
         
         Args:
             predictions_df: DataFrame with predictions
@@ -146,12 +574,16 @@ class ModelEvaluator:
         Returns:
             Dictionary of financial metrics
         """
-        # Align predictions with returns
-        aligned_df = predictions_df.copy()
-        aligned_df['actual_return'] = actual_returns
-        aligned_df = aligned_df.dropna()
+        # Align predictions with returns as plain arrays; no DataFrame copy
+        if not actual_returns.index.equals(predictions_df.index):
+            actual_returns = actual_returns.reindex(predictions_df.index)
+        pred = predictions_df['prediction'].to_numpy(dtype=np.float64)
+        ret = actual_returns.to_numpy(dtype=np.float64)
+        valid = ~(np.isnan(pred) | np.isnan(ret))
+        pred = pred[valid]
+        ret = ret[valid]
         
-        if len(aligned_df) == 0:
+        if len(pred) == 0:
             return {
                 'win_rate': 0.0,
                 'avg_return': 0.0,
@@ -161,35 +593,100 @@ class ModelEvaluator:
             }
         
         # Calculate strategy returns (go long if prediction=1, cash if prediction=0)
-        aligned_df['strategy_return'] = aligned_df['actual_return'] * aligned_df['prediction']
+        strategy_return = ret * pred
         
         # Win rate: proportion of correct directional predictions
-        aligned_df['correct'] = (
-            ((aligned_df['prediction'] == 1) & (aligned_df['actual_return'] > 0)) |
-            ((aligned_df['prediction'] == 0) & (aligned_df['actual_return'] <= 0))
-        )
-        win_rate = aligned_df['correct'].mean()
+        correct = ((pred == 1) & (ret > 0)) | ((pred == 0) & (ret <= 0))
+        win_rate = correct.mean()
         
-        # Average return per trade
-        avg_return = aligned_df['strategy_return'].mean()
+        # Average return per trade, sample std and cumulative growth; with numba
+        # these come from a single Welford pass over the strategy returns
+        n_trades = len(strategy_return)
+        if NUMBA_AVAILABLE:
+            avg_return, m2, log_growth = _welford_kernel(strategy_return)
+            returns_std = np.sqrt(m2 / (n_trades - 1)) if n_trades > 1 else 0.0
+        else:
+            avg_return = strategy_return.mean()
+            returns_std = strategy_return.std(ddof=1) if n_trades > 1 else 0.0
+            log_growth = np.log1p(strategy_return).sum()
+        # Compounding in log space stays accurate over long return series
+        total_return = np.expm1(log_growth)
         
         # Sharpe ratio (assuming 252 trading days, 0% risk-free rate)
-        returns_std = aligned_df['strategy_return'].std()
         sharpe_ratio = (avg_return / returns_std * np.sqrt(252)) if returns_std > 0 else 0.0
         
-        # Total cumulative return
-        total_return = (1 + aligned_df['strategy_return']).prod() - 1
-        
         metrics = {
             'win_rate': float(win_rate),
             'avg_return': float(avg_return),
             'sharpe_ratio': float(sharpe_ratio),
             'total_return': float(total_return),
-            'num_trades': len(aligned_df)
+            'num_trades': int(n_trades)
         }
         
         return metrics
     
+    def _fused_evaluation(
+        self,
+        y_true: np.ndarray,
+        y_pred: np.ndarray,
+        returns: np.ndarray,
+        roc_bundle: Optional[RocBundle] = None
+    ) -> Tuple[Dict[str, float], Dict[str, int], Dict[str, float]]:
+        """
+        Compute classification, confusion matrix and financial metrics in one
+        compiled pass over the joined predictions (requires numba).
+        
+        Args:
+            y_true: Actual outcomes (int8)
+            y_pred: Predicted labels (int8)
+            returns: Realised returns (float32, NaN where unknown)
+            roc_bundle: ROC bundle for probability_up; None when only one
+                class is present or it could not be computed
+            
+        Returns:
+            Tuple of (classification metrics, confusion matrix dict, financial metrics)
+        """
+        tp, fp, fn, tn, n_trades, n_correct, mean, m2, log_growth = _fused_metrics_kernel(
+            y_true, y_pred, returns
+        )
+        
+        classification_metrics = _metrics_from_counts(tn, fp, fn, tp)
+        if roc_bundle is not None:
+            classification_metrics['roc_auc'] = roc_bundle.auc
+            classification_metrics['log_loss'] = roc_bundle.log_loss
+        elif tp + fn > 0 and tn + fp > 0:
+            # Both classes present but the bundle failed: same fallback as
+            # evaluate_predictions, so the keys don't depend on numba
+            classification_metrics['roc_auc'] = 0.0
+            classification_metrics['log_loss'] = 0.0
+        
+        cm_dict = {
+            'true_negatives': int(tn),
+            'false_positives': int(fp),
+            'false_negatives': int(fn),
+            'true_positives': int(tp)
+        }
+        
+        if n_trades == 0:
+            financial_metrics = {
+                'win_rate': 0.0,
+                'avg_return': 0.0,
+                'sharpe_ratio': 0.0,
+                'total_return': 0.0,
+                'num_trades': 0
+            }
+        else:
+            returns_std = np.sqrt(m2 / (n_trades - 1)) if n_trades > 1 else 0.0
+            financial_metrics = {
+                'win_rate': n_correct / n_trades,
+                'avg_return': float(mean),
+                'sharpe_ratio': float(mean / returns_std * np.sqrt(252)) if returns_std > 0 else 0.0,
+                'total_return': float(np.expm1(log_growth)),
+                'num_trades': int(n_trades)
+            }
+        
+        return classification_metrics, cm_dict, financial_metrics
+    
     def evaluate_model_predictions(
         self,
         ticker: str,
@@ -209,108 +706,189 @@ class ModelEvaluator:
         Returns:
             Dictionary with comprehensive evaluation results
         """
-        db = get_db_connection()
+        db = self.db
 
-        # Get predictions and actual outcomes
-        query = f"""
-            WITH predictions AS (
-                SELECT
-                    p.ticker,
-                    p.date as prediction_date,
-                    p.prediction,
-                    p.probability_up,
-                    p.probability_down,
-                    p.confidence
-                FROM ml_predictions p
-                WHERE p.ticker = '{ticker}'
-                AND p.prediction_type = '{prediction_type}'
-            ),
-            outcomes AS (
-                SELECT
-                    ticker,
-                    date,
-                    close,
-                    LEAD(close, 5) OVER (PARTITION BY ticker ORDER BY date) as future_close
-                FROM yfinance_ohlcv
-                WHERE ticker = '{ticker}'
-            ),
-            combined AS (
-                SELECT
-                    p.*,
-                    o.close as price_at_prediction,
-                    o.future_close,
-                    CASE
-                        WHEN o.future_close > o.close THEN 1
-                        ELSE 0
-                    END as actual_outcome,
-                    (o.future_close - o.close) / o.close as actual_return
-                FROM predictions p
-                JOIN outcomes o ON p.ticker = o.ticker AND p.prediction_date = o.date
-                WHERE o.future_close IS NOT NULL
-            )
-            SELECT * FROM combined
-            """
-
-        if start_date:
-            query += f" WHERE prediction_date >= '{start_date}'"
-        if end_date:
-            conjunction = "AND" if start_date else "WHERE"
-            query += f" {conjunction} prediction_date <= '{end_date}'"
-
-        query += " ORDER BY prediction_date"
+        # Reuse a previous evaluation if neither predictions nor prices changed
+        version = db.query(_DATA_VERSION_QUERY, (ticker, prediction_type, ticker))
+        cache_key = (
+            ticker, prediction_type, start_date, end_date,
+            tuple(str(v) for v in version.iloc[0])
+        )
+        if cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
+            return self._copy_results(self._cache[cache_key])
 
-        df = db.query(query)
+        # Get predictions and actual outcomes
+        params = _evaluation_params(ticker, [prediction_type], start_date, end_date)
+        df = db.query(_EVALUATION_QUERY, params)
         if df.empty:
             raise ValueError(f"No predictions found for {ticker} ({prediction_type})")
 
-        # Calculate classification metrics
-        y_true = df['actual_outcome'].values
-        y_pred = df['prediction'].values
-        y_proba = df[['probability_down', 'probability_up']].values
-
-        classification_metrics = self.evaluate_predictions(y_true, y_pred, y_proba)
+        # Pull each column out once as a typed array; every metric below
+        # works on these rather than on DataFrame slices. Labels are {0, 1}
+        # and probabilities/returns don't need double precision, so the
+        # narrow dtypes cut the bytes each pass has to move.
+        y_true = df['actual_outcome'].to_numpy(dtype=np.int8)
+        y_pred = df['prediction'].to_numpy(dtype=np.int8)
+        y_proba = df[['probability_down', 'probability_up']].to_numpy(dtype=np.float32)
+        returns = df['actual_return'].to_numpy(dtype=np.float32)
 
-        # Get confusion matrix
-        _, cm_dict = self.get_confusion_matrix(y_true, y_pred)
+        # Sort the probabilities once for AUC, log loss and the ROC plot
+        roc_bundle = None
+        if y_true.min() != y_true.max():
+            try:
+                roc_bundle = _compute_roc_bundle(y_true, y_proba[:, 1])
+            except Exception as e:
+                logger.warning(f"Could not calculate probabilistic metrics: {e}")
 
-        # Calculate financial metrics
-        financial_metrics = self.calculate_financial_metrics(
-            df[['prediction']],
-            df['actual_return']
-        )
+        # Calculate classification, confusion matrix and financial metrics
+        if NUMBA_AVAILABLE:
+            classification_metrics, cm_dict, financial_metrics = self._fused_evaluation(
+                y_true, y_pred, returns, roc_bundle
+            )
+        else:
+            classification_metrics = self.evaluate_predictions(
+                y_true, y_pred, y_proba, roc_bundle
+            )
+            _, cm_dict = self.get_confusion_matrix(y_true, y_pred)
+            financial_metrics = self.calculate_financial_metrics(df, df['actual_return'])
 
         # Prediction quality over time
-        df['correct'] = (df['prediction'] == df['actual_outcome']).astype(int)
+        correct = (y_pred == y_true).astype(int)
+        df['correct'] = correct
 
         # Rolling accuracy (30-day window)
         if len(df) >= 30:
-            df['rolling_accuracy'] = df['correct'].rolling(window=30, min_periods=10).mean()
+            df['rolling_accuracy'] = _rolling_mean(correct, window=30, min_periods=10)
 
         results = {
             'ticker': ticker,
             'prediction_type': prediction_type,
             'evaluation_period': {
-                'start': df['prediction_date'].min().isoformat() if hasattr(df['prediction_date'].min(), 'isoformat') else str(df['prediction_date'].min()),
-                'end': df['prediction_date'].max().isoformat() if hasattr(df['prediction_date'].max(), 'isoformat') else str(df['prediction_date'].max()),
+                'start': _isoformat(df['prediction_date'].min()),
+                'end': _isoformat(df['prediction_date'].max()),
                 'num_predictions': len(df)
             },
             'classification_metrics': classification_metrics,
             'confusion_matrix': cm_dict,
             'financial_metrics': financial_metrics,
-            'predictions_df': df
+            'predictions_df': df,
+            '_roc_bundle': roc_bundle
         }
 
         logger.info(f"Evaluation for {ticker}: Accuracy={classification_metrics['accuracy']:.2%}, "
                    f"Win Rate={financial_metrics['win_rate']:.2%}, "
                    f"Sharpe={financial_metrics['sharpe_ratio']:.2f}")
 
-        return results
+        self._cache[cache_key] = results
+        if len(self._cache) > _EVALUATION_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+        return self._copy_results(results)
+    
+    def summarize_model_predictions(
+        self,
+        ticker: str,
+        prediction_type: str = 'ensemble',
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate historical predictions without fetching them.
+        
+        Computes the classification, confusion matrix and financial metrics of
+        evaluate_model_predictions as a single SQL aggregate, so only one row
+        leaves the database. Use evaluate_model_predictions when the
+        per-prediction frame or plots are needed.
+        
+        Args:
+            ticker: Stock ticker symbol
+            prediction_type: Type of predictions to evaluate
+            start_date: Start date for evaluation period
+            end_date: End date for evaluation period
+            
+        Returns:
+            Dictionary with evaluation_period, classification_metrics,
+            confusion_matrix and financial_metrics
+        """
+        db = self.db
+        summary = db.query(
+            _SUMMARY_QUERY, _evaluation_params(ticker, [prediction_type], start_date, end_date)
+        )
+        if summary.empty:
+            raise ValueError(f"No predictions found for {ticker} ({prediction_type})")
+        
+        return {
+            'ticker': ticker,
+            'prediction_type': prediction_type,
+            **self._summary_from_row(summary.iloc[0])
+        }
+    
+    @staticmethod
+    def _summary_from_row(row: pd.Series) -> Dict[str, Any]:
+        """Turn one _SUMMARY_QUERY row into the evaluation result sections."""
+        tn, fp, fn, tp = (int(row[k]) for k in ('tn', 'fp', 'fn', 'tp'))
+        classification_metrics = _metrics_from_counts(tn, fp, fn, tp)
+        n_pos = tp + fn
+        n_neg = tn + fp
+        if n_pos and n_neg:
+            classification_metrics['roc_auc'] = float(
+                (row['positive_rank_sum'] - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+            )
+            classification_metrics['log_loss'] = float(row['log_loss'])
+        
+        n_trades = int(row['num_trades'])
+        if n_trades == 0:
+            financial_metrics = {
+                'win_rate': 0.0,
+                'avg_return': 0.0,
+                'sharpe_ratio': 0.0,
+                'total_return': 0.0,
+                'num_trades': 0
+            }
+        else:
+            avg_return = float(row['avg_return'])
+            returns_std = float(row['returns_std']) if n_trades > 1 else 0.0
+            financial_metrics = {
+                'win_rate': int(row['num_correct']) / n_trades,
+                'avg_return': avg_return,
+                'sharpe_ratio': avg_return / returns_std * np.sqrt(252) if returns_std > 0 else 0.0,
+                'total_return': float(row['total_return']),
+                'num_trades': n_trades
+            }
+        
+        return {
+            'evaluation_period': {
+                'start': _isoformat(row['start_date']),
+                'end': _isoformat(row['end_date']),
+                'num_predictions': int(row['num_predictions'])
+            },
+            'classification_metrics': classification_metrics,
+            'confusion_matrix': {
+                'true_negatives': tn,
+                'false_positives': fp,
+                'false_negatives': fn,
+                'true_positives': tp
+            },
+            'financial_metrics': financial_metrics
+        }
+    
+    @staticmethod
+    def _copy_results(results: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a cached evaluation so callers can annotate it freely."""
+        copied = {
+            key: dict(value) if isinstance(value, dict) else value
+            for key, value in results.items()
+        }
+        copied['predictions_df'] = results['predictions_df'].copy()
+        return copied
     
     def generate_classification_report(
         self,
         y_true: np.ndarray,
         y_pred: np.ndarray,
-        target_names: List[str] = ['DOWN', 'UP']
+        target_names: List[str] = ['DOWN', 'UP'],
+        cm: Optional[np.ndarray] = None
     ) -> str:
         """
         Generate detailed classification report.
@@ -319,10 +897,14 @@ class ModelEvaluator:
             y_true: True labels
             y_pred: Predicted labels
             target_names: Names for classes
+            cm: Confusion matrix already computed for y_true/y_pred; when
+                given the report is formatted from it without rescanning
             
         Returns:
             Formatted classification report string
         """
+        if cm is not None:
+            return _classification_report_from_cm(cm, target_names)
         return classification_report(
             y_true,
             y_pred,
@@ -335,7 +917,8 @@ class ModelEvaluator:
         y_true: np.ndarray,
         y_proba: np.ndarray,
         title: str = "ROC Curve",
-        save_path: Optional[str] = None
+        save_path: Optional[str] = None,
+        roc_bundle: Optional[RocBundle] = None
     ) -> None:
         """
         Plot ROC curve.
@@ -345,13 +928,15 @@ class ModelEvaluator:
             y_proba: Predicted probabilities for positive class
             title: Plot title
             save_path: Optional path to save plot
+            roc_bundle: Precomputed ROC bundle, to skip re-sorting y_proba
         """
-        if not PLOTTING_AVAILABLE:
-            logger.warning("Matplotlib/Seaborn not available. Skipping plot.")
+        plt = _import_pyplot()
+        if plt is None:
             return
 
-        fpr, tpr, thresholds = roc_curve(y_true, y_proba)
-        roc_auc = roc_auc_score(y_true, y_proba)
+        if roc_bundle is None:
+            roc_bundle = _compute_roc_bundle(y_true, y_proba)
+        fpr, tpr, roc_auc = roc_bundle.fpr, roc_bundle.tpr, roc_bundle.auc
         
         plt.figure(figsize=(8, 6))
         plt.plot(fpr, tpr, color='darkorange', lw=2, label=f'ROC curve (AUC = {roc_auc:.2f})')
@@ -386,20 +971,21 @@ class ModelEvaluator:
             title: Plot title
             save_path: Optional path to save plot
         """
-        if not PLOTTING_AVAILABLE:
-            logger.warning("Matplotlib/Seaborn not available. Skipping plot.")
+        plt = _import_pyplot()
+        if plt is None:
             return
 
         plt.figure(figsize=(8, 6))
-        sns.heatmap(
-            cm,
-            annot=True,
-            fmt='d',
-            cmap='Blues',
-            xticklabels=labels,
-            yticklabels=labels,
-            cbar_kws={'label': 'Count'}
-        )
+        im = plt.imshow(cm, cmap='Blues')
+        plt.colorbar(im, label='Count')
+        # Annotate each cell, switching to white text on the dark cells
+        threshold = cm.max() / 2 if cm.size else 0
+        for i in range(cm.shape[0]):
+            for j in range(cm.shape[1]):
+                plt.text(j, i, f"{cm[i, j]:d}", ha='center', va='center',
+                         color='white' if cm[i, j] > threshold else 'black')
+        plt.xticks(range(len(labels)), labels)
+        plt.yticks(range(len(labels)), labels)
         plt.ylabel('Actual')
         plt.xlabel('Predicted')
         plt.title(title)
@@ -424,8 +1010,8 @@ class ModelEvaluator:
             title: Plot title
             save_path: Optional path to save plot
         """
-        if not PLOTTING_AVAILABLE:
-            logger.warning("Matplotlib/Seaborn not available. Skipping plot.")
+        plt = _import_pyplot()
+        if plt is None:
             return
 
         if 'rolling_accuracy' not in predictions_df.columns:
@@ -475,23 +1061,29 @@ class ModelEvaluator:
         """
         results = []
         
+        # One grouped aggregate covers every model instead of a query per model
+        try:
+            db = self.db
+            summaries = db.query(
+                _SUMMARY_QUERY, _evaluation_params(ticker, model_types, start_date, end_date)
+            )
+        except Exception as e:
+            logger.error(f"Error evaluating models for {ticker}: {e}")
+            summaries = pd.DataFrame(columns=['prediction_type'])
+        
+        evaluated = set(summaries['prediction_type'])
         for model_type in model_types:
-            try:
-                eval_results = self.evaluate_model_predictions(
-                    ticker, model_type, start_date, end_date
-                )
-                
-                row = {
-                    'model_type': model_type,
-                    'num_predictions': eval_results['evaluation_period']['num_predictions'],
-                    **eval_results['classification_metrics'],
-                    **eval_results['financial_metrics']
-                }
-                
-                results.append(row)
-                
-            except Exception as e:
-                logger.error(f"Error evaluating {model_type}: {e}")
+            if model_type not in evaluated:
+                logger.warning(f"No predictions found for {ticker} ({model_type})")
+        
+        for _, summary in summaries.iterrows():
+            eval_results = self._summary_from_row(summary)
+            results.append({
+                'model_type': summary['prediction_type'],
+                'num_predictions': eval_results['evaluation_period']['num_predictions'],
+                **eval_results['classification_metrics'],
+                **eval_results['financial_metrics']
+            })
         
         comparison_df = pd.DataFrame(results)
         
@@ -527,7 +1119,15 @@ class ModelEvaluator:
         y_true = df['actual_outcome'].values
         y_pred = df['prediction'].values
         
-        results['classification_report'] = self.generate_classification_report(y_true, y_pred)
+        # The confusion counts were computed during evaluation; reuse them
+        cm_dict = results['confusion_matrix']
+        cm = np.array([
+            [cm_dict['true_negatives'], cm_dict['false_positives']],
+            [cm_dict['false_negatives'], cm_dict['true_positives']]
+        ])
+        results['classification_report'] = self.generate_classification_report(
+            y_true, y_pred, cm=cm
+        )
         
         # Generate plots if output directory provided
         if output_dir:
@@ -537,11 +1137,13 @@ class ModelEvaluator:
             # ROC curve
             y_proba = df['probability_up'].values
             roc_path = os.path.join(output_dir, f'{ticker}_{prediction_type}_roc.png')
-            self.plot_roc_curve(y_true, y_proba, f"ROC Curve - {ticker}", roc_path)
+            self.plot_roc_curve(
+                y_true, y_proba, f"ROC Curve - {ticker}", roc_path,
+                roc_bundle=results['_roc_bundle']
+            )
             results['roc_plot'] = roc_path
             
             # Confusion matrix
-            cm, _ = self.get_confusion_matrix(y_true, y_pred)
             cm_path = os.path.join(output_dir, f'{ticker}_{prediction_type}_cm.png')
             self.plot_confusion_matrix(cm, title=f"Confusion Matrix - {ticker}", save_path=cm_path)
             results['cm_plot'] = cm_path
@@ -15,11 +15,353 @@ import pandas as pd
 from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import cached_property, partial
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
+def _hurst_exponent(x):
+    """
+    Hurst exponent of a raw float64 window.
+    
+    For each lag in 2..min(20, n // 2) - 1 the population std of
+    x[lag:] - x[:-lag] is taken in one Welford pass, and the exponent is the
+    closed-form least-squares slope of log(std) against log(lag). Returns
+    NaN for windows shorter than 20 or with a zero/NaN std.
+    """
+    n = x.shape[0]
+    if n < 20:
+        return np.nan
+    max_lag = min(20, n // 2)
+    n_lags = max_lag - 2
+    sum_x = 0.0
+    sum_y = 0.0
+    sum_xx = 0.0
+    sum_xy = 0.0
+    for lag in range(2, max_lag):
+        mean = 0.0
+        m2 = 0.0
+        count = 0
+        for i in range(lag, n):
+            diff = x[i] - x[i - lag]
+            count += 1
+            delta = diff - mean
+            mean += delta / count
+            m2 += delta * (diff - mean)
+        tau = np.sqrt(m2 / count)
+        if not tau > 0:
+            return np.nan
+        log_lag = np.log(lag)
+        log_tau = np.log(tau)
+        sum_x += log_lag
+        sum_y += log_tau
+        sum_xx += log_lag * log_lag
+        sum_xy += log_lag * log_tau
+    return (n_lags * sum_xy - sum_x * sum_y) / (n_lags * sum_xx - sum_x * sum_x)
+
+
+def _ewma_step(weighted, old_wt, value, alpha):
+    """
+    Advance one adjusted EWMA by ``value``.
+    
+    Mirrors pandas' ewm(span=...).mean() (adjust=True, ignore_na=False):
+    weights decay on every row, NaN inputs leave the average unchanged, and
+    the average starts at the first observation.
+    """
+    if weighted == weighted:
+        old_wt *= 1.0 - alpha
+        if value == value:
+            if weighted != value:
+                weighted = (old_wt * weighted + value) / (old_wt + 1.0)
+            old_wt += 1.0
+    elif value == value:
+        weighted = value
+    return weighted, old_wt
+
+
+def _macd_kernel(prices, alpha_fast, alpha_slow, alpha_signal):
+    """
+    Fast/slow EMAs, MACD, signal line and histogram in one pass over prices.
+    
+    Returns (macd, signal, histogram) arrays.
+    """
+    n = prices.shape[0]
+    macd = np.empty(n)
+    signal = np.empty(n)
+    histogram = np.empty(n)
+    fast = np.nan
+    slow = np.nan
+    sig = np.nan
+    wt_fast = 1.0
+    wt_slow = 1.0
+    wt_sig = 1.0
+    for i in range(n):
+        fast, wt_fast = _ewma_step(fast, wt_fast, prices[i], alpha_fast)
+        slow, wt_slow = _ewma_step(slow, wt_slow, prices[i], alpha_slow)
+        macd[i] = fast - slow
+        sig, wt_sig = _ewma_step(sig, wt_sig, macd[i], alpha_signal)
+        signal[i] = sig
+        histogram[i] = macd[i] - sig
+    return macd, signal, histogram
+
+
+def _run_length_kernel(flags):
+    """Length of the current run of True values at each row (0 where False)."""
+    out = np.empty(flags.shape[0], dtype=np.int64)
+    count = 0
+    for i in range(flags.shape[0]):
+        if flags[i]:
+            count += 1
+        else:
+            count = 0
+        out[i] = count
+    return out
+
+
+def _volume_flow_kernel(close, volume):
+    """
+    On-Balance Volume and Volume-Price Trend in one pass over close/volume.
+    
+    Rows whose contribution is NaN (missing close or volume) add nothing,
+    matching fillna(0).cumsum(). Returns (obv, vpt) arrays.
+    """
+    n = close.shape[0]
+    obv = np.empty(n)
+    vpt = np.empty(n)
+    obv_acc = 0.0
+    vpt_acc = 0.0
+    if n > 0:
+        obv[0] = 0.0
+        vpt[0] = 0.0
+    for i in range(1, n):
+        prev = close[i - 1]
+        cur = close[i]
+        signed = ((cur > prev) - (cur < prev)) * volume[i]
+        if signed == signed:
+            obv_acc += signed
+        flow = volume[i] * (cur / prev - 1)
+        if flow == flow:
+            vpt_acc += flow
+        obv[i] = obv_acc
+        vpt[i] = vpt_acc
+    return obv, vpt
+
+
+def _rolling_skew_kurt_kernel(values, window):
+    """
+    Rolling bias-corrected skewness and excess kurtosis, as rolling().skew()
+    and rolling().kurt() compute them with min_periods=window.
+    
+    Power sums of the (globally centred) values are updated as each row
+    enters and leaves the window, so every step is O(1). Windows with a
+    variance below 1e-14 are NaN, and constant windows give 0 / -3, matching
+    pandas. Returns (skew, kurt) arrays.
+    """
+    n = values.shape[0]
+    skew = np.full(n, np.nan)
+    kurt = np.full(n, np.nan)
+    
+    # Centre on the series mean to keep the power sums well conditioned
+    total = 0.0
+    count = 0
+    for i in range(n):
+        if values[i] == values[i]:
+            total += values[i]
+            count += 1
+    shift = total / count if count > 0 else 0.0
+    
+    nobs = 0
+    same_run = 0
+    prev_value = np.nan
+    s1 = 0.0
+    s2 = 0.0
+    s3 = 0.0
+    s4 = 0.0
+    for i in range(n):
+        value = values[i]
+        if value == value:
+            if value == prev_value:
+                same_run += 1
+            else:
+                same_run = 1
+            prev_value = value
+            x = value - shift
+            x2 = x * x
+            nobs += 1
+            s1 += x
+            s2 += x2
+            s3 += x2 * x
+            s4 += x2 * x2
+        if i >= window:
+            x = values[i - window] - shift
+            if x == x:
+                x2 = x * x
+                nobs -= 1
+                s1 -= x
+                s2 -= x2
+                s3 -= x2 * x
+                s4 -= x2 * x2
+        if i < window - 1 or nobs < window or nobs < 3:
+            continue
+        if same_run >= nobs:
+            skew[i] = 0.0
+            if nobs >= 4:
+                kurt[i] = -3.0
+            continue
+        
+        dn = float(nobs)
+        mean = s1 / dn
+        var = s2 / dn - mean * mean
+        if var <= 1e-14:
+            continue
+        m3 = s3 / dn - mean * mean * mean - 3 * mean * var
+        m4 = s4 / dn - mean * mean * mean * mean - 6 * var * mean * mean - 4 * m3 * mean
+        std = np.sqrt(var)
+        skew[i] = np.sqrt(dn * (dn - 1)) * m3 / ((dn - 2) * std * std * std)
+        if nobs >= 4:
+            kurt[i] = ((dn * dn - 1) * m4 / (var * var) - 3 * (dn - 1) ** 2) / ((dn - 2) * (dn - 3))
+    return skew, kurt
+
+
+if NUMBA_AVAILABLE:
+    _hurst_exponent = njit(cache=True, nogil=True)(_hurst_exponent)
+    _run_length_kernel = njit(cache=True, nogil=True)(_run_length_kernel)
+    _rolling_skew_kurt_kernel = njit(cache=True, nogil=True)(_rolling_skew_kurt_kernel)
+    # error_model='numpy' so a zero close gives inf like the array code
+    _volume_flow_kernel = njit(cache=True, nogil=True, error_model='numpy')(_volume_flow_kernel)
+    _ewma_step = njit(cache=True, nogil=True)(_ewma_step)
+    _macd_kernel = njit(cache=True, nogil=True)(_macd_kernel)
+
+
+# sin/cos of each calendar position, indexed by the integer field value
+# (dayofweek 0-6, day 1-31, month 1-12, quarter 1-4)
+def _cyclical_table(period: int, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    angle = 2 * np.pi * np.arange(size) / period
+    return np.sin(angle), np.cos(angle)
+
+
+_DOW_SIN, _DOW_COS = _cyclical_table(7, 7)
+_DOM_SIN, _DOM_COS = _cyclical_table(31, 32)
+_MONTH_SIN, _MONTH_COS = _cyclical_table(12, 13)
+_QUARTER_SIN, _QUARTER_COS = _cyclical_table(4, 5)
+
+
+def _shift(values: np.ndarray, lag: int) -> np.ndarray:
+    """values[t - lag], NaN for the first ``lag`` rows (Series.shift on an array)."""
+    out = np.full(len(values), np.nan)
+    if lag < len(values):
+        out[lag:] = values[:-lag]
+    return out
+
+
+def _pct_change(values: np.ndarray, lag: int = 1) -> np.ndarray:
+    """values[t] / values[t - lag] - 1, NaN for the first ``lag`` rows."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return values / _shift(values, lag) - 1
+
+
+# Trailing-window reductions on 1-D float64 arrays. Bottleneck's move_*
+# functions are single-pass C loops; pandas is the fallback (and handles
+# windows longer than the array, which bottleneck rejects).
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over ``window`` rows, NaN until the window is full."""
+    if BOTTLENECK_AVAILABLE and window <= len(values):
+        return bn.move_mean(values, window, min_count=window)
+    return pd.Series(values).rolling(window).mean().to_numpy()
+
+
+def _rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sample standard deviation over ``window`` rows."""
+    if BOTTLENECK_AVAILABLE and window <= len(values):
+        return bn.move_std(values, window, min_count=window, ddof=1)
+    return pd.Series(values).rolling(window).std().to_numpy()
+
+
+def _rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing minimum over ``window`` rows."""
+    if BOTTLENECK_AVAILABLE and window <= len(values):
+        return bn.move_min(values, window, min_count=window)
+    return pd.Series(values).rolling(window).min().to_numpy()
+
+
+def _rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing maximum over ``window`` rows."""
+    if BOTTLENECK_AVAILABLE and window <= len(values):
+        return bn.move_max(values, window, min_count=window)
+    return pd.Series(values).rolling(window).max().to_numpy()
+
+
+def _lagged_diff(values: np.ndarray, lag: int) -> np.ndarray:
+    """values[t] - values[t - lag], NaN for the first ``lag`` rows."""
+    out = np.full(len(values), np.nan)
+    if lag < len(values):
+        out[lag:] = values[lag:] - values[:-lag]
+    return out
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """numerator / denominator, NaN where the denominator is zero."""
+    out = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    return np.divide(numerator, denominator, out=out, where=denominator != 0)
+
+
+def _rolling_mean_abs_dev(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Mean absolute deviation from each trailing window's own mean.
+    
+    Works on a strided (N - window + 1, window) view, so every window is
+    reduced in one vectorized pass; the first window - 1 rows are NaN, as
+    are windows containing NaN.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        windows = sliding_window_view(values, window)
+        out[window - 1:] = np.abs(windows - windows.mean(axis=1, keepdims=True)).mean(axis=1)
+    return out
+
+
+def _rolling_slope(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Least-squares slope of each trailing window against 0..window-1.
+    
+    The x values are the same for every window, so the slope is the
+    centred-y dot product with a fixed centred x divided by a constant,
+    which matches np.polyfit(range(window), y, 1)[0]. ``values`` may be 2-D
+    (rows x columns); every column is handled in the same batched product.
+    """
+    out = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        x_centred = np.arange(window) - (window - 1) / 2
+        windows = sliding_window_view(values, window, axis=0)
+        y_centred = windows - windows.mean(axis=-1, keepdims=True)
+        out[window - 1:] = (y_centred @ x_centred) / (x_centred @ x_centred)
+    return out
+
+
+# Categories reported by FeatureEngineer.get_feature_importance_groups
+FEATURE_GROUPS = (
+    'price', 'volume', 'technical', 'timeseries', 'cyclical',
+    'interaction', 'regime', 'fundamental', 'alternative'
+)
+
+
 @dataclass
 class FeatureConfig:
     """Configuration for feature generation."""
@@ -48,6 +390,13 @@ class FeatureConfig:
     include_autocorr: bool = False
     include_hurst: bool = False
     
+    # Storage dtype of the float feature columns (float32 halves the matrix
+    # for ML training; use np.float64 to keep full precision)
+    dtype: type = np.float32
+    
+    # Threads for the independent OHLCV blocks (None = up to 6 cores, 1 = serial)
+    max_workers: Optional[int] = None
+    
     def __post_init__(self):
         """Set defaults for None values."""
         if self.price_lags is None:
@@ -64,6 +413,57 @@ class FeatureConfig:
             self.macd_config = {'fast': 12, 'slow': 26, 'signal': 9}
 
 
+@dataclass
+class OHLCVArrays:
+    """
+    OHLCV columns as contiguous float64 arrays (structure of arrays).
+    
+    Built once per generate_all_features call so the feature helpers work
+    on plain NumPy arrays instead of re-indexing DataFrame columns.
+    """
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    index: pd.Index
+    
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'OHLCVArrays':
+        """Extract the OHLCV columns of ``df`` as float64 arrays."""
+        return cls(
+            open=df['open'].to_numpy(dtype=np.float64),
+            high=df['high'].to_numpy(dtype=np.float64),
+            low=df['low'].to_numpy(dtype=np.float64),
+            close=df['close'].to_numpy(dtype=np.float64),
+            volume=df['volume'].to_numpy(dtype=np.float64),
+            index=df.index
+        )
+    
+    # Intermediates used by several feature blocks, computed on first use
+    
+    @cached_property
+    def prev_close(self) -> np.ndarray:
+        """Previous row's close (NaN on the first row)."""
+        return _shift(self.close, 1)
+    
+    @cached_property
+    def close_diff(self) -> np.ndarray:
+        """Close-to-close change."""
+        return self.close - self.prev_close
+    
+    @cached_property
+    def returns(self) -> np.ndarray:
+        """Close-to-close simple return."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.close / self.prev_close - 1
+    
+    @cached_property
+    def typical_price(self) -> np.ndarray:
+        """(high + low + close) / 3."""
+        return (self.high + self.low + self.close) / 3
+
+
 class FeatureEngineer:
     """
     Advanced feature engineering for time-series financial data.
@@ -80,6 +480,7 @@ class FeatureEngineer:
         """
         self.config = config or FeatureConfig()
         self.feature_names: List[str] = []
+        self._feature_groups: Dict[str, List[str]] = {group: [] for group in FEATURE_GROUPS}
         
     def generate_all_features(
         self,
@@ -100,123 +501,232 @@ class FeatureEngineer:
         Returns:
             DataFrame with all generated features
         """
-        features = pd.DataFrame(index=ohlcv_data.index)
-        
-        # Price-based features
-        features = pd.concat([features, self._price_features(ohlcv_data)], axis=1)
+        # Pull the OHLCV columns out once; every helper works on these arrays
+        ohlcv = OHLCVArrays.from_frame(ohlcv_data)
         
-        # Volume-based features
-        features = pd.concat([features, self._volume_features(ohlcv_data)], axis=1)
+        # ADX feeds both the technical and the regime block; compute it once
+        adx = self._calculate_adx(ohlcv, 14)
         
-        # Technical indicators
-        features = pd.concat([features, self._technical_indicators(ohlcv_data)], axis=1)
-        
-        # Time-series patterns
-        features = pd.concat([features, self._timeseries_features(ohlcv_data)], axis=1)
+        # The OHLCV blocks only read the arrays, so they run side by side
+        block_builders = [
+            self._price_features,                        # Price-based features
+            self._volume_features,                       # Volume-based features
+            partial(self._technical_indicators, adx=adx), # Technical indicators
+            self._timeseries_features,                   # Time-series patterns
+        ]
+        block_groups = ['price', 'volume', 'technical', 'timeseries']
         
         # Cyclical features (day of week, month, etc.)
         if self.config.include_cyclical:
-            features = pd.concat([features, self._cyclical_features(ohlcv_data)], axis=1)
-        
-        # Interaction features
-        if self.config.include_interaction:
-            features = pd.concat([features, self._interaction_features(features)], axis=1)
+            block_builders.append(self._cyclical_features)
+            block_groups.append('cyclical')
         
         # Market regime features
         if self.config.include_regime:
-            features = pd.concat([features, self._regime_features(ohlcv_data)], axis=1)
+            block_builders.append(partial(self._regime_features, adx=adx))
+            block_groups.append('regime')
+        
+        # Collect each block and concatenate once, rather than re-allocating
+        # the growing frame after every block. Each block's columns are
+        # tagged with its group as it comes back.
+        blocks = self._build_blocks(block_builders, ohlcv)
+        feature_groups = {group: [] for group in FEATURE_GROUPS}
+        for group, block in zip(block_groups, blocks):
+            feature_groups[group].extend(block.columns)
+        regime = blocks.pop() if self.config.include_regime else None
+        
+        # Interaction features need the blocks above side by side
+        if self.config.include_interaction:
+            base = pd.concat(blocks, axis=1)
+            interactions = self._interaction_features(base)
+            feature_groups['interaction'].extend(interactions.columns)
+            blocks = [base, interactions]
+        
+        if regime is not None:
+            blocks.append(regime)
         
         # Add pre-computed technical data if available
         if technical_data is not None:
-            features = pd.concat([features, technical_data], axis=1)
+            blocks.append(technical_data)
+            feature_groups['technical'].extend(technical_data.columns)
         
         # Add fundamental features if available
         if fundamental_data is not None:
-            features = pd.concat([features, self._fundamental_features(fundamental_data)], axis=1)
+            fundamental = self._fundamental_features(fundamental_data)
+            blocks.append(fundamental)
+            feature_groups['fundamental'].extend(fundamental.columns)
         
         # Add alternative data features if available
         if alternative_data is not None:
-            features = pd.concat([features, alternative_data], axis=1)
+            blocks.append(alternative_data)
+            feature_groups['alternative'].extend(alternative_data.columns)
+        
+        # Store the float columns in the configured dtype and build the
+        # combined frame in one shot
+        features = self._assemble_features(blocks, ohlcv.index)
         
         self.feature_names = features.columns.tolist()
+        self._feature_groups = feature_groups
         logger.info(f"Generated {len(self.feature_names)} features")
         
         return features
     
-    def _price_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _assemble_features(self, blocks: List[pd.DataFrame], index: pd.Index) -> pd.DataFrame:
+        """
+        Combine feature blocks into one frame, float columns in ``config.dtype``.
+        
+        Blocks on the OHLCV index with distinct column names are gathered
+        column by column into a single DataFrame constructor call; casting
+        each block and concatenating costs several times more in pandas
+        bookkeeping than the features themselves. Blocks on another index
+        (or with clashing names) go through pd.concat so rows are aligned
+        exactly as before.
+        
+        Args:
+            blocks: Feature blocks in output column order
+            index: OHLCV index
+            
+        Returns:
+            Combined feature DataFrame
+        """
+        columns = [column for block in blocks for column in block.columns]
+        aligned = all(block.index.equals(index) for block in blocks)
+        if not aligned or len(set(columns)) != len(columns):
+            return pd.concat([self._cast_block(block) for block in blocks], axis=1)
+        
+        data = {}
+        for block in blocks:
+            for column, values in block.items():
+                if self._is_float(values.dtype):
+                    data[column] = values.to_numpy(dtype=self.config.dtype)
+                else:
+                    data[column] = values.array
+        return pd.DataFrame(data, index=index)
+    
+    def _cast_block(self, block: pd.DataFrame) -> pd.DataFrame:
+        """Cast a block's float columns to ``config.dtype`` (computation stays float64)."""
+        float_columns = {
+            column: self.config.dtype
+            for column, dtype in block.dtypes.items()
+            if self._is_float(dtype) and dtype != self.config.dtype
+        }
+        return block.astype(float_columns) if float_columns else block
+    
+    @staticmethod
+    def _is_float(dtype) -> bool:
+        """True for numpy float dtypes (nullable extension floats are left as-is)."""
+        return isinstance(dtype, np.dtype) and dtype.kind == 'f'
+    
+    def _build_blocks(self, builders: List, ohlcv: OHLCVArrays) -> List[pd.DataFrame]:
+        """
+        Run independent feature block builders, on a thread pool if configured.
+        
+        The builders spend their time in numpy, bottleneck and numba code that
+        releases the GIL, so threads overlap without copying the arrays.
+        
+        Args:
+            builders: Methods taking OHLCVArrays and returning a DataFrame
+            ohlcv: Shared OHLCV arrays
+            
+        Returns:
+            Blocks in the same order as ``builders``
+        """
+        max_workers = self.config.max_workers or min(6, os.cpu_count() or 1)
+        max_workers = min(max_workers, len(builders))
+        if max_workers <= 1:
+            return [build(ohlcv) for build in builders]
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(build, ohlcv) for build in builders]
+            return [future.result() for future in futures]
+    
+    def _price_features(self, ohlcv: OHLCVArrays) -> pd.DataFrame:
         """Generate price-based features."""
-        features = pd.DataFrame(index=df.index)
+        close, high, low = ohlcv.close, ohlcv.high, ohlcv.low
+        features = {}
         
-        # Returns at different horizons
+        # Returns at different horizons, all derived from one log-price array:
+        # the log return is a difference and the simple return its expm1
+        log_close = np.log(close)
         for lag in self.config.price_lags:
-            features[f'return_{lag}d'] = df['close'].pct_change(lag)
-            features[f'log_return_{lag}d'] = np.log(df['close'] / df['close'].shift(lag))
+            log_return = _lagged_diff(log_close, lag)
+            features[f'return_{lag}d'] = np.expm1(log_return)
+            features[f'log_return_{lag}d'] = log_return
         
         # Intraday range
-        features['intraday_range'] = (df['high'] - df['low']) / df['close']
-        features['high_low_ratio'] = df['high'] / df['low']
+        features['intraday_range'] = (high - low) / close
+        features['high_low_ratio'] = high / low
         
         # Gap features
-        gap = (df['open'] - df['close'].shift(1)) / df['close'].shift(1)
+        prev_close = ohlcv.prev_close
+        gap = (ohlcv.open - prev_close) / prev_close
         features['gap'] = gap
-        features['gap_filled'] = ((df['low'] <= df['close'].shift(1)) & (gap > 0)).astype(int)
+        features['gap_filled'] = ((low <= prev_close) & (gap > 0)).astype(np.int8)
         
         # Price position within range
-        features['close_position'] = (df['close'] - df['low']) / (df['high'] - df['low'] + 1e-10)
+        features['close_position'] = _safe_divide(close - low, high - low)
         
         # Distance from moving averages
         for window in self.config.ma_windows:
-            ma = df['close'].rolling(window).mean()
-            features[f'dist_from_ma{window}'] = (df['close'] - ma) / ma
-            features[f'above_ma{window}'] = (df['close'] > ma).astype(int)
+            ma = _rolling_mean(close, window)
+            features[f'dist_from_ma{window}'] = (close - ma) / ma
+            features[f'above_ma{window}'] = (close > ma).astype(np.int8)
         
         # Price momentum (Rate of Change)
         for period in [5, 10, 20]:
-            features[f'roc_{period}d'] = ((df['close'] - df['close'].shift(period)) / 
-                                          df['close'].shift(period) * 100)
+            features[f'roc_{period}d'] = np.expm1(_lagged_diff(log_close, period)) * 100
         
-        return features
+        return pd.DataFrame(features, index=ohlcv.index)
     
-    def _volume_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _volume_features(self, ohlcv: OHLCVArrays) -> pd.DataFrame:
         """Generate volume-based features."""
-        features = pd.DataFrame(index=df.index)
+        close, volume = ohlcv.close, ohlcv.volume
+        features = {}
         
         # Volume changes
         for lag in self.config.volume_lags:
-            features[f'volume_change_{lag}d'] = df['volume'].pct_change(lag)
+            features[f'volume_change_{lag}d'] = _pct_change(volume, lag)
         
         # Volume moving averages
         for window in [5, 10, 20]:
-            features[f'volume_ma{window}'] = df['volume'].rolling(window).mean()
-            features[f'volume_ratio_ma{window}'] = df['volume'] / features[f'volume_ma{window}']
-        
-        # On-Balance Volume (OBV)
-        obv = (np.sign(df['close'].diff()) * df['volume']).fillna(0).cumsum()
+            volume_ma = _rolling_mean(volume, window)
+            features[f'volume_ma{window}'] = volume_ma
+            features[f'volume_ratio_ma{window}'] = volume / volume_ma
+        
+        # On-Balance Volume (OBV) and Volume-Price Trend (VPT)
+        if NUMBA_AVAILABLE:
+            obv, vpt = _volume_flow_kernel(close, volume)
+        else:
+            signed_volume = np.sign(ohlcv.close_diff) * volume
+            obv = np.where(np.isnan(signed_volume), 0.0, signed_volume).cumsum()
+            volume_price = volume * ohlcv.returns
+            vpt = np.where(np.isnan(volume_price), 0.0, volume_price).cumsum()
         features['obv'] = obv
-        features['obv_slope_5d'] = obv.diff(5)
-        
-        # Volume-Price Trend (VPT)
-        vpt = (df['volume'] * df['close'].pct_change()).fillna(0).cumsum()
+        features['obv_slope_5d'] = _lagged_diff(obv, 5)
         features['vpt'] = vpt
         
         # Money Flow Index components
-        typical_price = (df['high'] + df['low'] + df['close']) / 3
-        money_flow = typical_price * df['volume']
-        features['money_flow_ratio_5d'] = money_flow.rolling(5).mean() / money_flow.rolling(20).mean()
+        money_flow = ohlcv.typical_price * volume
+        features['money_flow_ratio_5d'] = _rolling_mean(money_flow, 5) / _rolling_mean(money_flow, 20)
         
-        return features
+        return pd.DataFrame(features, index=ohlcv.index)
     
-    def _technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Generate technical indicator features."""
-        features = pd.DataFrame(index=df.index)
+    def _technical_indicators(
+        self,
+        ohlcv: OHLCVArrays,
+        adx: Optional[np.ndarray] = None
+    ) -> pd.DataFrame:
+        """Generate technical indicator features (``adx``: precomputed 14-period ADX)."""
+        close = ohlcv.close
+        features = {}
         
         # RSI for multiple periods
         for period in self.config.rsi_periods:
-            features[f'rsi_{period}'] = self._calculate_rsi(df['close'], period)
+            features[f'rsi_{period}'] = self._calculate_rsi(close, period)
         
         # MACD
         macd_data = self._calculate_macd(
-            df['close'],
+            close,
             self.config.macd_config['fast'],
             self.config.macd_config['slow'],
             self.config.macd_config['signal']
@@ -227,7 +737,7 @@ class FeatureEngineer:
         
         # Bollinger Bands
         bb_data = self._calculate_bollinger_bands(
-            df['close'],
+            close,
             self.config.bb_period,
             self.config.bb_std
         )
@@ -235,92 +745,108 @@ class FeatureEngineer:
         features['bb_middle'] = bb_data['middle']
         features['bb_lower'] = bb_data['lower']
         features['bb_width'] = (bb_data['upper'] - bb_data['lower']) / bb_data['middle']
-        features['bb_position'] = (df['close'] - bb_data['lower']) / (bb_data['upper'] - bb_data['lower'] + 1e-10)
+        features['bb_position'] = _safe_divide(
+            close - bb_data['lower'], bb_data['upper'] - bb_data['lower']
+        )
         
         # ATR (Average True Range)
-        features['atr'] = self._calculate_atr(df, self.config.atr_period)
-        features['atr_pct'] = features['atr'] / df['close'] * 100
+        features['atr'] = self._calculate_atr(ohlcv, self.config.atr_period)
+        features['atr_pct'] = features['atr'] / close * 100
         
         # Stochastic Oscillator
-        stoch_data = self._calculate_stochastic(df, 14, 3)
+        stoch_data = self._calculate_stochastic(ohlcv, 14, 3)
         features['stoch_k'] = stoch_data['k']
         features['stoch_d'] = stoch_data['d']
         
         # Average Directional Index (ADX)
-        features['adx'] = self._calculate_adx(df, 14)
+        features['adx'] = adx if adx is not None else self._calculate_adx(ohlcv, 14)
         
         # Commodity Channel Index (CCI)
-        features['cci'] = self._calculate_cci(df, 20)
+        features['cci'] = self._calculate_cci(ohlcv, 20)
         
-        return features
+        return pd.DataFrame(features, index=ohlcv.index)
     
-    def _timeseries_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _timeseries_features(self, ohlcv: OHLCVArrays) -> pd.DataFrame:
         """Generate time-series statistical features."""
-        features = pd.DataFrame(index=df.index)
+        close = ohlcv.close
+        features = {}
         
-        returns = df['close'].pct_change()
+        returns = ohlcv.returns
+        returns_series = pd.Series(returns)
         
         # Rolling volatility
         for window in self.config.volatility_windows:
-            features[f'volatility_{window}d'] = returns.rolling(window).std() * np.sqrt(252)
+            volatility = _rolling_std(returns, window) * np.sqrt(252)
+            features[f'volatility_{window}d'] = volatility
             features[f'volatility_rank_{window}d'] = (
-                features[f'volatility_{window}d'].rank(pct=True)
+                pd.Series(volatility).rank(pct=True).to_numpy()
             )
         
         # Rolling skewness and kurtosis
         for window in [20, 60]:
-            features[f'skew_{window}d'] = returns.rolling(window).skew()
-            features[f'kurtosis_{window}d'] = returns.rolling(window).kurt()
-        
-        # Autocorrelation (expensive)
+            if NUMBA_AVAILABLE:
+                skew, kurt = _rolling_skew_kurt_kernel(returns, window)
+            else:
+                skew = returns_series.rolling(window).skew().to_numpy()
+                kurt = returns_series.rolling(window).kurt().to_numpy()
+            features[f'skew_{window}d'] = skew
+            features[f'kurtosis_{window}d'] = kurt
+        
+        # Autocorrelation over a 60-day window. Series.autocorr(lag) on a
+        # window correlates the 60 - lag pairs (x[t], x[t - lag]) inside it,
+        # which is a rolling correlation of that length against the lagged
+        # series - no per-window Python callback.
         if self.config.include_autocorr:
             for lag in [1, 5, 10]:
-                features[f'autocorr_lag{lag}'] = returns.rolling(60).apply(
-                    lambda x: x.autocorr(lag=lag) if len(x) > lag else np.nan
-                )
+                features[f'autocorr_lag{lag}'] = returns_series.rolling(60 - lag).corr(
+                    returns_series.shift(lag)
+                ).to_numpy()
 
         # Hurst exponent (trend strength, expensive)
         if self.config.include_hurst:
-            features['hurst_60d'] = returns.rolling(60).apply(self._calculate_hurst)
+            features['hurst_60d'] = returns_series.rolling(60).apply(
+                _hurst_exponent, raw=True, engine='numba' if NUMBA_AVAILABLE else 'cython'
+            ).to_numpy()
         
         # Drawdown features
-        cummax = df['close'].cummax()
-        features['drawdown'] = (df['close'] - cummax) / cummax
-        features['drawdown_duration'] = self._calculate_drawdown_duration(df['close'])
+        cummax = np.fmax.accumulate(close)
+        features['drawdown'] = (close - cummax) / cummax
+        features['drawdown_duration'] = self._calculate_drawdown_duration(close)
         
-        return features
+        return pd.DataFrame(features, index=ohlcv.index)
     
-    def _cyclical_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _cyclical_features(self, ohlcv: OHLCVArrays) -> pd.DataFrame:
         """Generate cyclical time features."""
-        features = pd.DataFrame(index=df.index)
+        index = ohlcv.index
+        features = {}
         
         # Day of week (sin/cos encoding to capture cyclicality)
-        day_of_week = df.index.dayofweek
-        features['dow_sin'] = np.sin(2 * np.pi * day_of_week / 7)
-        features['dow_cos'] = np.cos(2 * np.pi * day_of_week / 7)
+        day_of_week = np.asarray(index.dayofweek)
+        features['dow_sin'] = _DOW_SIN[day_of_week]
+        features['dow_cos'] = _DOW_COS[day_of_week]
         
         # Day of month
-        day_of_month = df.index.day
-        features['dom_sin'] = np.sin(2 * np.pi * day_of_month / 31)
-        features['dom_cos'] = np.cos(2 * np.pi * day_of_month / 31)
+        day_of_month = np.asarray(index.day)
+        features['dom_sin'] = _DOM_SIN[day_of_month]
+        features['dom_cos'] = _DOM_COS[day_of_month]
         
         # Month of year
-        month = df.index.month
-        features['month_sin'] = np.sin(2 * np.pi * month / 12)
-        features['month_cos'] = np.cos(2 * np.pi * month / 12)
+        month = np.asarray(index.month)
+        features['month_sin'] = _MONTH_SIN[month]
+        features['month_cos'] = _MONTH_COS[month]
         
         # Quarter
-        quarter = df.index.quarter
-        features['quarter_sin'] = np.sin(2 * np.pi * quarter / 4)
-        features['quarter_cos'] = np.cos(2 * np.pi * quarter / 4)
+        quarter = np.asarray(index.quarter)
+        features['quarter_sin'] = _QUARTER_SIN[quarter]
+        features['quarter_cos'] = _QUARTER_COS[quarter]
         
         # Binary features for special days
-        features['is_month_start'] = df.index.is_month_start.astype(int)
-        features['is_month_end'] = df.index.is_month_end.astype(int)
-        features['is_quarter_start'] = df.index.is_quarter_start.astype(int)
-        features['is_quarter_end'] = df.index.is_quarter_end.astype(int)
+        features['is_month_start'] = np.asarray(index.is_month_start, dtype=np.int8)
+        features['is_month_end'] = np.asarray(index.is_month_end, dtype=np.int8)
+        features['is_quarter_start'] = np.asarray(index.is_quarter_start, dtype=np.int8)
+        features['is_quarter_end'] = np.asarray(index.is_quarter_end, dtype=np.int8)
         
-        return features
+        return pd.DataFrame(features, index=index)
     
     def _interaction_features(self, features: pd.DataFrame) -> pd.DataFrame:
         """Generate interaction features between key indicators."""
@@ -346,63 +872,69 @@ class FeatureEngineer:
         
         return interactions
     
-    def _regime_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Generate market regime indicator features."""
-        features = pd.DataFrame(index=df.index)
+    def _regime_features(
+        self,
+        ohlcv: OHLCVArrays,
+        adx: Optional[np.ndarray] = None
+    ) -> pd.DataFrame:
+        """Generate market regime indicator features (``adx``: precomputed 14-period ADX)."""
+        close = ohlcv.close
+        features = {}
         
-        returns = df['close'].pct_change()
+        returns = ohlcv.returns
         
         # Trend regime (based on MA slopes and positions)
-        ma_50 = df['close'].rolling(50).mean()
-        ma_200 = df['close'].rolling(200).mean()
+        ma_50 = _rolling_mean(close, 50)
+        ma_200 = _rolling_mean(close, 200)
         
-        features['bullish_regime'] = ((df['close'] > ma_50) & (ma_50 > ma_200)).astype(int)
-        features['bearish_regime'] = ((df['close'] < ma_50) & (ma_50 < ma_200)).astype(int)
-        features['ma_golden_cross'] = (ma_50 > ma_200).astype(int)
+        features['bullish_regime'] = ((close > ma_50) & (ma_50 > ma_200)).astype(np.int8)
+        features['bearish_regime'] = ((close < ma_50) & (ma_50 < ma_200)).astype(np.int8)
+        features['ma_golden_cross'] = (ma_50 > ma_200).astype(np.int8)
         
         # Volatility regime
-        vol_20 = returns.rolling(20).std()
-        vol_percentile = vol_20.rolling(252).rank(pct=True)
-        features['high_vol_regime'] = (vol_percentile > 0.8).astype(int)
-        features['low_vol_regime'] = (vol_percentile < 0.2).astype(int)
+        vol_20 = pd.Series(_rolling_std(returns, 20))
+        vol_percentile = vol_20.rolling(252).rank(pct=True).to_numpy()
+        features['high_vol_regime'] = (vol_percentile > 0.8).astype(np.int8)
+        features['low_vol_regime'] = (vol_percentile < 0.2).astype(np.int8)
         
         # Trend strength
+        if adx is None:
+            adx = self._calculate_adx(ohlcv, 14)
         adx_threshold = 25
-        if 'adx' not in features.columns:
-            features['adx_temp'] = self._calculate_adx(df, 14)
-            features['trending_regime'] = (features['adx_temp'] > adx_threshold).astype(int)
-            features = features.drop('adx_temp', axis=1)
+        features['trending_regime'] = (adx > adx_threshold).astype(np.int8)
         
-        return features
+        return pd.DataFrame(features, index=ohlcv.index)
     
     def _fundamental_features(self, fundamental_data: pd.DataFrame) -> pd.DataFrame:
         """Process and generate features from fundamental data."""
         features = pd.DataFrame(index=fundamental_data.index)
         
+        value_columns = [col for col in fundamental_data.columns if col not in ['date', 'ticker']]
+        
+        # Trend (linear regression slope over last 8 quarters) for every
+        # column at once
+        trends = _rolling_slope(fundamental_data[value_columns].to_numpy(dtype=np.float64), 8)
+        
         # Calculate growth rates
-        for col in fundamental_data.columns:
-            if col not in ['date', 'ticker']:
-                # YoY growth
-                features[f'{col}_yoy_growth'] = fundamental_data[col].pct_change(4)  # Quarterly
-                
-                # QoQ growth
-                features[f'{col}_qoq_growth'] = fundamental_data[col].pct_change()
-                
-                # Trend (linear regression slope over last 8 quarters)
-                features[f'{col}_trend_8q'] = fundamental_data[col].rolling(8).apply(
-                    lambda x: np.polyfit(range(len(x)), x, 1)[0] if len(x) == 8 else np.nan
-                )
+        for i, col in enumerate(value_columns):
+            # YoY growth
+            features[f'{col}_yoy_growth'] = fundamental_data[col].pct_change(4)  # Quarterly
+            
+            # QoQ growth
+            features[f'{col}_qoq_growth'] = fundamental_data[col].pct_change()
+            
+            features[f'{col}_trend_8q'] = trends[:, i]
         
         return features
     
     # Helper methods for technical indicators
     
     @staticmethod
-    def _calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
+    def _calculate_rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
         """Calculate Relative Strength Index."""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+        delta = _lagged_diff(prices, 1)
+        gain = _rolling_mean(np.where(delta > 0, delta, 0.0), period)
+        loss = _rolling_mean(np.where(delta < 0, -delta, 0.0), period)
         
         rs = gain / (loss + 1e-10)
         rsi = 100 - (100 / (1 + rs))
@@ -411,12 +943,20 @@ class FeatureEngineer:
     
     @staticmethod
     def _calculate_macd(
-        prices: pd.Series,
+        prices: np.ndarray,
         fast: int = 12,
         slow: int = 26,
         signal: int = 9
-    ) -> Dict[str, pd.Series]:
+    ) -> Dict[str, np.ndarray]:
         """Calculate MACD indicator."""
+        if NUMBA_AVAILABLE:
+            # All three EMAs in a single compiled pass
+            macd, signal_line, histogram = _macd_kernel(
+                prices, 2.0 / (fast + 1), 2.0 / (slow + 1), 2.0 / (signal + 1)
+            )
+            return {'macd': macd, 'signal': signal_line, 'histogram': histogram}
+        
+        prices = pd.Series(prices)
         ema_fast = prices.ewm(span=fast).mean()
         ema_slow = prices.ewm(span=slow).mean()
         
@@ -425,20 +965,20 @@ class FeatureEngineer:
         histogram = macd - signal_line
         
         return {
-            'macd': macd,
-            'signal': signal_line,
-            'histogram': histogram
+            'macd': macd.to_numpy(),
+            'signal': signal_line.to_numpy(),
+            'histogram': histogram.to_numpy()
         }
     
     @staticmethod
     def _calculate_bollinger_bands(
-        prices: pd.Series,
+        prices: np.ndarray,
         period: int = 20,
         num_std: float = 2.0
-    ) -> Dict[str, pd.Series]:
+    ) -> Dict[str, np.ndarray]:
         """Calculate Bollinger Bands."""
-        middle = prices.rolling(window=period).mean()
-        std = prices.rolling(window=period).std()
+        middle = _rolling_mean(prices, period)
+        std = _rolling_std(prices, period)
         
         upper = middle + (std * num_std)
         lower = middle - (std * num_std)
@@ -450,131 +990,98 @@ class FeatureEngineer:
         }
     
     @staticmethod
-    def _calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
+    def _calculate_atr(ohlcv: OHLCVArrays, period: int = 14) -> np.ndarray:
         """Calculate Average True Range."""
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
+        prev_close = ohlcv.prev_close
+        high_low = ohlcv.high - ohlcv.low
+        high_close = np.abs(ohlcv.high - prev_close)
+        low_close = np.abs(ohlcv.low - prev_close)
         
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = ranges.max(axis=1)
+        # fmax skips NaN like DataFrame.max(axis=1): the first row, with no
+        # previous close, keeps high - low as its true range
+        true_range = np.fmax(np.fmax(high_low, high_close), low_close)
         
-        atr = true_range.rolling(period).mean()
+        atr = _rolling_mean(true_range, period)
         
         return atr
     
     @staticmethod
     def _calculate_stochastic(
-        df: pd.DataFrame,
+        ohlcv: OHLCVArrays,
         k_period: int = 14,
         d_period: int = 3
-    ) -> Dict[str, pd.Series]:
+    ) -> Dict[str, np.ndarray]:
         """Calculate Stochastic Oscillator."""
-        low_min = df['low'].rolling(window=k_period).min()
-        high_max = df['high'].rolling(window=k_period).max()
+        low_min = _rolling_min(ohlcv.low, k_period)
+        high_max = _rolling_max(ohlcv.high, k_period)
         
-        k = 100 * (df['close'] - low_min) / (high_max - low_min + 1e-10)
-        d = k.rolling(window=d_period).mean()
+        k = 100 * _safe_divide(ohlcv.close - low_min, high_max - low_min)
+        d = _rolling_mean(k, d_period)
         
         return {'k': k, 'd': d}
     
     @staticmethod
-    def _calculate_adx(df: pd.DataFrame, period: int = 14) -> pd.Series:
+    def _calculate_adx(ohlcv: OHLCVArrays, period: int = 14) -> np.ndarray:
         """Calculate Average Directional Index."""
         # Plus and Minus Directional Movement
-        up_move = df['high'].diff()
-        down_move = -df['low'].diff()
+        up_move = _lagged_diff(ohlcv.high, 1)
+        down_move = -_lagged_diff(ohlcv.low, 1)
         
-        plus_dm = up_move.where((up_move > down_move) & (up_move > 0), 0)
-        minus_dm = down_move.where((down_move > up_move) & (down_move > 0), 0)
+        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
         
         # True Range
-        tr = FeatureEngineer._calculate_atr(df, 1)
+        tr = FeatureEngineer._calculate_atr(ohlcv, 1)
         
         # Smoothed Plus/Minus DI
-        plus_di = 100 * (plus_dm.rolling(period).mean() / tr.rolling(period).mean())
-        minus_di = 100 * (minus_dm.rolling(period).mean() / tr.rolling(period).mean())
+        plus_di = 100 * (_rolling_mean(plus_dm, period) / _rolling_mean(tr, period))
+        minus_di = 100 * (_rolling_mean(minus_dm, period) / _rolling_mean(tr, period))
         
         # Directional Index
-        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di + 1e-10)
+        dx = 100 * _safe_divide(np.abs(plus_di - minus_di), plus_di + minus_di)
         
         # ADX is smoothed DX
-        adx = dx.rolling(period).mean()
+        adx = _rolling_mean(dx, period)
         
         return adx
     
     @staticmethod
-    def _calculate_cci(df: pd.DataFrame, period: int = 20) -> pd.Series:
+    def _calculate_cci(ohlcv: OHLCVArrays, period: int = 20) -> np.ndarray:
         """Calculate Commodity Channel Index."""
-        typical_price = (df['high'] + df['low'] + df['close']) / 3
-        sma = typical_price.rolling(period).mean()
-        mad = typical_price.rolling(period).apply(lambda x: np.abs(x - x.mean()).mean())
+        typical_price = ohlcv.typical_price
+        sma = _rolling_mean(typical_price, period)
+        mad = _rolling_mean_abs_dev(typical_price, period)
         
-        cci = (typical_price - sma) / (0.015 * mad + 1e-10)
+        cci = _safe_divide(typical_price - sma, 0.015 * mad)
         
         return cci
     
     @staticmethod
     def _calculate_hurst(prices: np.ndarray) -> float:
         """Calculate Hurst exponent for trend detection."""
-        if len(prices) < 20:
-            return np.nan
-        
-        try:
-            lags = range(2, min(20, len(prices) // 2))
-            tau = [np.std(np.subtract(prices[lag:], prices[:-lag])) for lag in lags]
-            
-            poly = np.polyfit(np.log(lags), np.log(tau), 1)
-            return poly[0]
-        except:
-            return np.nan
+        return float(_hurst_exponent(np.asarray(prices, dtype=np.float64)))
     
     @staticmethod
-    def _calculate_drawdown_duration(prices: pd.Series) -> pd.Series:
+    def _calculate_drawdown_duration(prices: np.ndarray) -> np.ndarray:
         """Calculate number of periods in drawdown."""
-        cummax = prices.cummax()
-        is_drawdown = prices < cummax
+        is_drawdown = prices < np.fmax.accumulate(prices)
         
         # Count consecutive drawdown periods
-        drawdown_groups = (is_drawdown != is_drawdown.shift()).cumsum()
-        duration = is_drawdown.groupby(drawdown_groups).cumsum()
+        if NUMBA_AVAILABLE:
+            return _run_length_kernel(is_drawdown)
         
-        return duration
+        is_drawdown = pd.Series(is_drawdown)
+        drawdown_groups = (is_drawdown != is_drawdown.shift()).cumsum()
+        return is_drawdown.groupby(drawdown_groups).cumsum().to_numpy()
     
     def get_feature_importance_groups(self) -> Dict[str, List[str]]:
         """
         Group features by category for importance analysis.
         
+        Groups are recorded by generate_all_features from the block that
+        produced each column, so no name matching is involved.
+        
         Returns:
             Dictionary mapping category names to lists of feature names
         """
-        groups = {
-            'price': [],
-            'volume': [],
-            'technical': [],
-            'timeseries': [],
-            'cyclical': [],
-            'interaction': [],
-            'regime': [],
-            'fundamental': []
-        }
-        
-        for feature in self.feature_names:
-            if any(x in feature for x in ['return', 'gap', 'range', 'ma', 'roc']):
-                groups['price'].append(feature)
-            elif 'volume' in feature or 'obv' in feature or 'vpt' in feature:
-                groups['volume'].append(feature)
-            elif any(x in feature for x in ['rsi', 'macd', 'bb_', 'atr', 'stoch', 'adx', 'cci']):
-                groups['technical'].append(feature)
-            elif any(x in feature for x in ['volatility', 'skew', 'kurtosis', 'autocorr', 'hurst', 'drawdown']):
-                groups['timeseries'].append(feature)
-            elif any(x in feature for x in ['dow_', 'dom_', 'month_', 'quarter_', 'is_']):
-                groups['cyclical'].append(feature)
-            elif 'interaction' in feature or 'ratio' in feature:
-                groups['interaction'].append(feature)
-            elif 'regime' in feature or 'cross' in feature:
-                groups['regime'].append(feature)
-            elif any(x in feature for x in ['growth', 'trend', 'yoy', 'qoq']):
-                groups['fundamental'].append(feature)
-        
-        return groups
+        return {group: list(names) for group, names in self._feature_groups.items()}
@@ -7,9 +7,13 @@ from __future__ import annotations
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple, Any, Callable
+from typing import Dict, List, Optional, Tuple, Any, Callable, Union
 from dataclasses import dataclass
+from collections import Counter, OrderedDict, deque
+from functools import lru_cache, partial
 import logging
+import threading
+import warnings
 from datetime import datetime
 from pathlib import Path
 import json
@@ -19,17 +23,300 @@ logger = logging.getLogger(__name__)
 # Lazy imports for optional dependencies
 try:
     import optuna
-    from optuna.pruners import MedianPruner
+    from optuna.pruners import (
+        BasePruner, HyperbandPruner, MedianPruner, NopPruner, PatientPruner
+    )
     from optuna.samplers import TPESampler
+    try:
+        from optuna.storages.journal import JournalFileBackend
+    except ImportError:
+        # Optuna 3.x names it JournalFileStorage; releases before 3.1 have
+        # no journal storage and studies fall back to SQLite
+        try:
+            from optuna.storages import JournalFileStorage as JournalFileBackend
+        except ImportError:
+            JournalFileBackend = None
     OPTUNA_AVAILABLE = True
 except ImportError:
     OPTUNA_AVAILABLE = False
+    BasePruner = object  # Keeps _ScoreGatePruner importable
     logger.warning("Optuna not available. Install with: pip install optuna")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from joblib import Parallel, delayed
 from sklearn.model_selection import TimeSeriesSplit
 from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
 
 
+@lru_cache(maxsize=None)
+def _gpu_available(model_type: str) -> bool:
+    """
+    Whether ``model_type`` can train on a GPU here.
+    
+    Probed once per process with a one-tree fit. XGBoost silently falls back
+    to the CPU when no GPU is visible, so its booster config is checked for
+    the device it actually used.
+    """
+    X = np.random.default_rng(0).random((32, 2))
+    y = np.arange(32) % 2
+    
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            if model_type == 'xgboost':
+                import xgboost as xgb
+                model = xgb.XGBClassifier(n_estimators=1, tree_method='hist', device='cuda')
+                model.fit(X, y)
+                config = json.loads(model.get_booster().save_config())
+                return config['learner']['generic_param']['device'].startswith('cuda')
+            if model_type == 'lightgbm':
+                import lightgbm as lgb
+                lgb.LGBMClassifier(n_estimators=1, device_type='gpu', verbose=-1).fit(X, y)
+                return True
+    except Exception:
+        return False
+    
+    return False
+
+
+# Feature sets whose fold DMatrices are kept between trials
+_DMATRIX_CACHE_SIZE = 8
+
+# Completed trials kept in memory; also the Parquet row-group size
+_HISTORY_BUFFER_SIZE = 100
+
+# One row per completed trial; params are stored as a JSON object string
+_HISTORY_SCHEMA = pa.schema([
+    ('trial', pa.int64()),
+    ('value', pa.float64()),
+    ('params', pa.string()),
+    ('datetime', pa.string()),
+]) if PYARROW_AVAILABLE else None
+
+
+def _as_feature_matrix(X: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+    """C-contiguous float32 copy of ``X`` (returned as-is if already one)."""
+    return np.ascontiguousarray(X, dtype=np.float32)
+
+
+# Fold metric per optimize_for, and whether it ranks continuous class-1
+# scores rather than predicted labels ('multi' scores each fold by F1)
+_SCORERS: Dict[str, Tuple[Callable, bool]] = {
+    'accuracy': (accuracy_score, False),
+    'f1': (partial(f1_score, zero_division=0), False),
+    'multi': (partial(f1_score, zero_division=0), False),
+    'roc_auc': (roc_auc_score, True),
+}
+
+
+def _get_scorer(optimize_for: str) -> Tuple[Callable, bool]:
+    """
+    Resolve the fold metric for ``optimize_for``.
+    
+    Returns:
+        (metric(y_true, y_score), needs_scores)
+    """
+    try:
+        return _SCORERS[optimize_for]
+    except KeyError:
+        raise ValueError(f"Unknown optimize_for: {optimize_for}") from None
+
+
+def _ranking_scores(model, X: np.ndarray) -> np.ndarray:
+    """
+    Class-1 scores for rank metrics such as ROC-AUC.
+    
+    The sigmoid is monotonic, so boosters' raw margins rank rows exactly as
+    their probabilities do; reading them directly skips the link function
+    and the two-column predict_proba output.
+    """
+    module = type(model).__module__
+    if module.startswith('xgboost'):
+        return model.predict(X, output_margin=True)
+    if module.startswith('lightgbm'):
+        return model.predict(X, raw_score=True)
+    return model.predict_proba(X)[:, 1]
+
+
+def _run_fold(
+    model,
+    X: np.ndarray,
+    y: np.ndarray,
+    train_idx: np.ndarray,
+    val_idx: np.ndarray,
+    scorer: Tuple[Callable, bool]
+) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Fit ``model`` on one CV fold and score it on the validation rows.
+    
+    Module-level so joblib workers can run it.
+    
+    Args:
+        scorer: (metric, needs_scores) from _get_scorer
+    
+    Returns:
+        (score, None) on success, (None, error message) if the fold failed
+    """
+    metric, needs_scores = scorer
+    X_train, X_val = X[train_idx], X[val_idx]
+    y_train, y_val = y[train_idx], y[val_idx]
+    
+    try:
+        model.fit(X_train, y_train)
+        if needs_scores:
+            score = metric(y_val, _ranking_scores(model, X_val))
+        else:
+            score = metric(y_val, model.predict(X_val))
+    except Exception as e:
+        return None, str(e)
+    
+    return score, None
+
+
+def _suggest_xgboost(trial: optuna.Trial) -> Dict[str, Any]:
+    """XGBoost search space."""
+    return {
+        'n_estimators': trial.suggest_int('n_estimators', 100, 1000, step=50),
+        'max_depth': trial.suggest_int('max_depth', 3, 10),
+        'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3, log=True),
+        'subsample': trial.suggest_float('subsample', 0.5, 1.0),
+        'colsample_bytree': trial.suggest_float('colsample_bytree', 0.5, 1.0),
+        'min_child_weight': trial.suggest_int('min_child_weight', 1, 10),
+        'gamma': trial.suggest_float('gamma', 0.0, 1.0),
+        'reg_alpha': trial.suggest_float('reg_alpha', 0.0, 1.0),
+        'reg_lambda': trial.suggest_float('reg_lambda', 0.0, 1.0),
+    }
+
+
+def _suggest_lightgbm(trial: optuna.Trial) -> Dict[str, Any]:
+    """LightGBM search space."""
+    return {
+        'n_estimators': trial.suggest_int('n_estimators', 100, 1000, step=50),
+        'max_depth': trial.suggest_int('max_depth', 3, 10),
+        'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3, log=True),
+        'num_leaves': trial.suggest_int('num_leaves', 20, 150),
+        'feature_fraction': trial.suggest_float('feature_fraction', 0.5, 1.0),
+        'bagging_fraction': trial.suggest_float('bagging_fraction', 0.5, 1.0),
+        'bagging_freq': trial.suggest_int('bagging_freq', 1, 7),
+        'min_child_samples': trial.suggest_int('min_child_samples', 5, 100),
+        'reg_alpha': trial.suggest_float('reg_alpha', 0.0, 1.0),
+        'reg_lambda': trial.suggest_float('reg_lambda', 0.0, 1.0),
+    }
+
+
+def _xgboost_builder(device: str) -> Callable[..., Any]:
+    """XGBClassifier factory with the fixed training settings bound."""
+    import xgboost as xgb
+    return partial(
+        xgb.XGBClassifier,
+        tree_method='hist',
+        device=device,
+        objective='binary:logistic',
+        eval_metric='logloss',
+        random_state=42,
+        n_jobs=1  # Don't nest parallelism
+    )
+
+
+def _lightgbm_builder(device: str) -> Callable[..., Any]:
+    """LGBMClassifier factory with the fixed training settings bound."""
+    import lightgbm as lgb
+    return partial(
+        lgb.LGBMClassifier,
+        device_type='gpu' if device == 'cuda' else 'cpu',
+        objective='binary',
+        metric='binary_logloss',
+        random_state=42,
+        n_jobs=1,
+        verbose=-1
+    )
+
+
+# model_type -> (search space, model factory builder)
+_MODEL_TYPES: Dict[str, Tuple[Callable, Callable]] = {
+    'xgboost': (_suggest_xgboost, _xgboost_builder),
+    'lightgbm': (_suggest_lightgbm, _lightgbm_builder),
+}
+
+
+class _ScoreGatePruner(BasePruner):
+    """
+    Prune trials that clearly cannot beat the best trial, else defer.
+    
+    A cheap first layer in front of the rung-based pruner: a first-fold score
+    more than ``margin`` below the best trial's first-fold score stops the
+    trial immediately. With ``extrapolate``, later folds project the remaining
+    fold scores along the slope of the last two and prune when the projected
+    CV mean falls more than ``margin`` below the best trial's fold mean.
+    
+    Fold scores are compared with the best trial's own fold scores, not its
+    objective, which for 'multi' is on another scale and for the first fold
+    covers more training data. The objective is the fallback when the best
+    trial reported no fold scores (e.g. an enqueued or parallel-fold trial).
+    """
+    
+    def __init__(
+        self,
+        wrapped_pruner: BasePruner,
+        n_steps: int,
+        margin: float,
+        extrapolate: bool = True
+    ):
+        self._wrapped_pruner = wrapped_pruner
+        self._n_steps = n_steps
+        self._margin = margin
+        self._extrapolate = extrapolate
+    
+    def prune(self, study: optuna.Study, trial: optuna.trial.FrozenTrial) -> bool:
+        step = trial.last_step
+        if step is not None and self._below_threshold(study, trial, step):
+            return True
+        return self._wrapped_pruner.prune(study, trial)
+    
+    def _below_threshold(
+        self,
+        study: optuna.Study,
+        trial: optuna.trial.FrozenTrial,
+        step: int
+    ) -> bool:
+        try:
+            best_trial = study.best_trial
+        except ValueError:  # No completed trial yet
+            return False
+        best_values = best_trial.intermediate_values
+        
+        values = trial.intermediate_values
+        if step == 0:
+            return values[0] < best_values.get(0, best_trial.value) - self._margin
+        if not self._extrapolate or step - 1 not in values:
+            return False
+        
+        if all(fold in best_values for fold in range(self._n_steps)):
+            best_mean = np.mean([best_values[fold] for fold in range(self._n_steps)])
+        else:
+            best_mean = best_trial.value
+        threshold = best_mean - self._margin
+        
+        # Project the folds still to run along the last observed slope
+        slope = values[step] - values[step - 1]
+        remaining = np.arange(1, self._n_steps - step) * slope + values[step]
+        observed = list(values.values())
+        projected_mean = (sum(observed) + remaining.sum()) / (len(observed) + len(remaining))
+        return projected_mean < threshold
+
+
 @dataclass
 class OptimizationConfig:
     """Configuration for hyperparameter optimization."""
@@ -38,6 +325,7 @@ class OptimizationConfig:
     n_trials: int = 100
     timeout_seconds: Optional[int] = 3600  # 1 hour
     n_jobs: int = -1  # Parallel trials
+    n_jobs_per_trial: int = 1  # Parallel CV folds within a trial (disables pruning)
     
     # Validation settings
     n_cv_splits: int = 5
@@ -50,6 +338,11 @@ class OptimizationConfig:
     # Early stopping
     early_stopping_patience: int = 20
     pruning_enabled: bool = True
+    pruner_type: str = 'hyperband'  # 'hyperband' (ASHA-style), 'median'
+    pruner_patience: Optional[int] = 2  # Non-improving folds tolerated before pruning (None = off)
+    pruner_min_delta: float = 1e-4
+    pruner_gate_margin: Optional[float] = 0.1  # Prune below best - margin (None = off)
+    pruner_extrapolate: bool = True  # Gate on the linearly extrapolated CV mean
     
     # Feature selection
     feature_selection_enabled: bool = True
@@ -57,6 +350,7 @@ class OptimizationConfig:
     
     # Model specific
     model_type: str = 'xgboost'  # 'xgboost', 'lightgbm', 'ensemble'
+    device: str = 'auto'  # 'auto' (GPU if usable), 'cuda', 'cpu'
 
 
 class HyperparameterOptimizer:
@@ -87,19 +381,47 @@ class HyperparameterOptimizer:
             raise ImportError("Optuna is required for hyperparameter optimization")
         
         self.config = config or OptimizationConfig()
+        if self.config.model_type not in _MODEL_TYPES:
+            raise ValueError(f"Unknown model type: {self.config.model_type}")
+        
         self.results_dir = Path(results_dir)
         self.results_dir.mkdir(parents=True, exist_ok=True)
         
+        # Training device, resolved once: 'cuda' or 'cpu'
+        if self.config.device == 'auto':
+            self.device = 'cuda' if _gpu_available(self.config.model_type) else 'cpu'
+        else:
+            self.device = self.config.device
+        
+        # Model-type specific search space and model factory, resolved once
+        # rather than branched on for every trial and fold
+        suggest_fn, builder = _MODEL_TYPES[self.config.model_type]
+        self._suggest_fn = suggest_fn
+        self._build_model = builder(self.device)
+        self._native_xgboost = self.config.model_type == 'xgboost'
+        
+        # XGBoost fold DMatrices reused across trials (see _fold_dmatrices)
+        self._dmatrix_cache: OrderedDict = OrderedDict()
+        self._dmatrix_lock = threading.Lock()
+        
         self.study: Optional[optuna.Study] = None
         self.best_params: Optional[Dict] = None
-        self.optimization_history: List[Dict] = []
+        self._importance_cache: Optional[Tuple[int, Dict[str, float]]] = None
+        
+        # Most recent completed trials; the full history is streamed to the
+        # {study_name}_history/ Parquet dataset while optimize() runs
+        self.optimization_history: deque = deque(maxlen=_HISTORY_BUFFER_SIZE)
+        self._history_writer = None
+        self._history_pending: List[Dict] = []
+        self._history_lock = threading.Lock()
         
     def optimize(
         self,
         X: pd.DataFrame,
         y: pd.Series,
         study_name: Optional[str] = None,
-        load_if_exists: bool = False
+        load_if_exists: bool = False,
+        warm_start_params: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
         Run hyperparameter optimization.
@@ -109,6 +431,8 @@ class HyperparameterOptimizer:
             y: Target vector
             study_name: Name for the study (for persistence)
             load_if_exists: Whether to load existing study
+            warm_start_params: Known-good parameter sets (e.g. best params of
+                an earlier study) evaluated first; missing keys are sampled
             
         Returns:
             Dictionary with best parameters and optimization results
@@ -119,13 +443,20 @@ class HyperparameterOptimizer:
         # Create study
         study_name = study_name or f"{self.config.model_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        # Setup storage (SQLite for persistence)
-        storage_path = self.results_dir / "optuna_studies.db"
-        storage = f"sqlite:///{storage_path}"
+        # Setup storage (append-only journal file for persistence)
+        storage = self._create_storage()
+        
+        # Trials run at once; with folds already spread over the cores, run
+        # trials one at a time to avoid oversubscription, and on a GPU keep
+        # at most two trials in flight so they are not serialized on the device
+        n_jobs = self.config.n_jobs if self.config.n_jobs_per_trial == 1 else 1
+        if self.device == 'cuda':
+            n_jobs = 2 if n_jobs < 0 else min(n_jobs, 2)
         
         # Create or load study
-        sampler = TPESampler(seed=42)
-        pruner = MedianPruner() if self.config.pruning_enabled else None
+        warm_start_params = warm_start_params or []
+        sampler = self._create_sampler(n_jobs, n_warm_start=len(warm_start_params))
+        pruner = self._create_pruner()
         
         self.study = optuna.create_study(
             study_name=study_name,
@@ -136,18 +467,27 @@ class HyperparameterOptimizer:
             load_if_exists=load_if_exists
         )
         
+        # Seed the study with the warm-start points; a resumed study that
+        # already holds them doesn't queue them again
+        for params in warm_start_params:
+            self.study.enqueue_trial(params, skip_if_exists=True)
+        
         # Define objective function
         objective = self._create_objective_function(X, y)
         
         # Run optimization
-        self.study.optimize(
-            objective,
-            n_trials=self.config.n_trials,
-            timeout=self.config.timeout_seconds,
-            n_jobs=self.config.n_jobs,
-            show_progress_bar=True,
-            callbacks=[self._optimization_callback]
-        )
+        self._open_history(study_name)
+        try:
+            self.study.optimize(
+                objective,
+                n_trials=self.config.n_trials,
+                timeout=self.config.timeout_seconds,
+                n_jobs=n_jobs,
+                show_progress_bar=True,
+                callbacks=[self._optimization_callback]
+            )
+        finally:
+            self._close_history()
         
         # Get best parameters
         self.best_params = self.study.best_params
@@ -162,12 +502,108 @@ class HyperparameterOptimizer:
         
         return results
     
+    def _create_storage(self) -> Union[optuna.storages.BaseStorage, str]:
+        """
+        Create the persistent study storage.
+        
+        Trials are appended to a journal file instead of written to SQLite,
+        so parallel trials don't queue on SQLite's database-wide write lock.
+        Optuna releases without journal storage use the SQLite file instead.
+        """
+        if JournalFileBackend is None:
+            logger.warning(
+                "Optuna journal storage not available, using SQLite. "
+                "Upgrade with: pip install -U optuna"
+            )
+            return f"sqlite:///{self.results_dir / 'optuna_studies.db'}"
+        journal_path = self.results_dir / "optuna_journal.log"
+        return optuna.storages.JournalStorage(JournalFileBackend(str(journal_path)))
+    
+    @staticmethod
+    def _create_sampler(n_jobs: int, n_warm_start: int = 0) -> TPESampler:
+        """
+        Create the TPE sampler.
+        
+        Multivariate TPE models the hyperparameters jointly instead of one
+        independent density per parameter. When trials run in parallel, the
+        constant liar treats running trials as already scored so workers do
+        not sample the same region. Warm-start trials count towards the random
+        startup trials TPE needs, so fewer random ones are drawn.
+        """
+        return TPESampler(
+            seed=42,
+            multivariate=True,
+            constant_liar=n_jobs != 1,
+            n_startup_trials=max(5, 10 - n_warm_start)
+        )
+    
+    def _create_pruner(self) -> optuna.pruners.BasePruner:
+        """
+        Create the trial pruner from the configuration.
+        
+        Hyperband treats each CV fold as one unit of resource, so a trial is
+        compared against others at the same fold and unpromising ones stop
+        after the first rungs instead of training all folds. Fold scores are
+        noisy (later folds are not necessarily easier), so the pruner is
+        wrapped in a PatientPruner that only lets it fire after
+        ``pruner_patience`` folds without improvement. In front of both, a
+        _ScoreGatePruner stops trials far below the best objective so far.
+        """
+        if not self.config.pruning_enabled:
+            return NopPruner()
+        
+        if self.config.pruner_type == 'hyperband':
+            pruner = HyperbandPruner(
+                min_resource=1,
+                max_resource=self.config.n_cv_splits,
+                reduction_factor=3
+            )
+        elif self.config.pruner_type == 'median':
+            # Require 5 trials reporting at the same fold before comparing
+            pruner = MedianPruner(n_startup_trials=10, n_warmup_steps=1, n_min_trials=5)
+        else:
+            raise ValueError(f"Unknown pruner type: {self.config.pruner_type}")
+        
+        if self.config.pruner_patience is not None:
+            pruner = PatientPruner(
+                pruner,
+                patience=self.config.pruner_patience,
+                min_delta=self.config.pruner_min_delta
+            )
+        
+        if self.config.pruner_gate_margin is not None:
+            pruner = _ScoreGatePruner(
+                pruner,
+                n_steps=self.config.n_cv_splits,
+                margin=self.config.pruner_gate_margin,
+                extrapolate=self.config.pruner_extrapolate
+            )
+        
+        return pruner
+    
     def _create_objective_function(
         self,
         X: pd.DataFrame,
         y: pd.Series
     ) -> Callable:
         """Create objective function for Optuna."""
+        # Convert once to a contiguous float32 matrix; trials and folds then
+        # slice it with integer indices instead of building new DataFrames
+        X_np = _as_feature_matrix(X)
+        y_np = np.asarray(y)
+        column_index = {col: i for i, col in enumerate(X.columns)}
+        all_columns = tuple(range(X_np.shape[1]))
+        self._dmatrix_cache.clear()
+        
+        # Folds depend only on the row count, so every trial shares them
+        folds = self._split_folds(len(X_np))
+        
+        # Configuration is fixed for the study: resolve it once here rather
+        # than on every trial
+        feature_selection = self.config.feature_selection_enabled
+        multi_objective = self.config.optimize_for == 'multi'
+        stability_weight = self.config.stability_weight
+        scorer = _get_scorer(self.config.optimize_for)
         
         def objective(trial: optuna.Trial) -> float:
             """
@@ -183,28 +619,33 @@ class HyperparameterOptimizer:
             params = self._suggest_parameters(trial)
             
             # Feature selection
-            if self.config.feature_selection_enabled:
+            X_trial = X_np
+            feature_key = all_columns
+            if feature_selection:
                 selected_features = self._suggest_features(trial, X)
-                X_trial = X[selected_features]
-            else:
-                X_trial = X
+                if len(selected_features) < X_np.shape[1]:
+                    feature_key = tuple(column_index[col] for col in selected_features)
+                    # take() keeps the row-major layout ([:, idx] would not)
+                    X_trial = X_np.take(feature_key, axis=1)
             
             # Time-series cross-validation
-            scores = self._evaluate_with_cv(X_trial, y, params, trial)
+            scores = self._evaluate_with_cv(
+                X_trial, y_np, params, trial, feature_key, scorer, folds
+            )
             
             if not scores:
                 return 0.0
             
             # Calculate objective based on configuration
-            if self.config.optimize_for == 'multi':
+            if multi_objective:
                 # Multi-objective: balance mean and stability
                 mean_score = np.mean(scores)
                 std_score = np.std(scores)
                 
                 # Higher mean, lower std is better
                 objective_value = (
-                    mean_score * (1 - self.config.stability_weight) -
-                    std_score * self.config.stability_weight
+                    mean_score * (1 - stability_weight) -
+                    std_score * stability_weight
                 )
             else:
                 # Single objective: maximize mean score
@@ -221,36 +662,7 @@ class HyperparameterOptimizer:
     
     def _suggest_parameters(self, trial: optuna.Trial) -> Dict[str, Any]:
         """Suggest hyperparameters based on model type."""
-        
-        if self.config.model_type == 'xgboost':
-            return {
-                'n_estimators': trial.suggest_int('n_estimators', 100, 1000, step=50),
-                'max_depth': trial.suggest_int('max_depth', 3, 10),
-                'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3, log=True),
-                'subsample': trial.suggest_float('subsample', 0.5, 1.0),
-                'colsample_bytree': trial.suggest_float('colsample_bytree', 0.5, 1.0),
-                'min_child_weight': trial.suggest_int('min_child_weight', 1, 10),
-                'gamma': trial.suggest_float('gamma', 0.0, 1.0),
-                'reg_alpha': trial.suggest_float('reg_alpha', 0.0, 1.0),
-                'reg_lambda': trial.suggest_float('reg_lambda', 0.0, 1.0),
-            }
-        
-        elif self.config.model_type == 'lightgbm':
-            return {
-                'n_estimators': trial.suggest_int('n_estimators', 100, 1000, step=50),
-                'max_depth': trial.suggest_int('max_depth', 3, 10),
-                'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3, log=True),
-                'num_leaves': trial.suggest_int('num_leaves', 20, 150),
-                'feature_fraction': trial.suggest_float('feature_fraction', 0.5, 1.0),
-                'bagging_fraction': trial.suggest_float('bagging_fraction', 0.5, 1.0),
-                'bagging_freq': trial.suggest_int('bagging_freq', 1, 7),
-                'min_child_samples': trial.suggest_int('min_child_samples', 5, 100),
-                'reg_alpha': trial.suggest_float('reg_alpha', 0.0, 1.0),
-                'reg_lambda': trial.suggest_float('reg_lambda', 0.0, 1.0),
-            }
-        
-        else:
-            raise ValueError(f"Unknown model type: {self.config.model_type}")
+        return self._suggest_fn(trial)
     
     def _suggest_features(
         self,
@@ -271,107 +683,188 @@ class HyperparameterOptimizer:
         n_features = len(feature_cols)
         min_features = max(int(n_features * self.config.min_features_pct), 5)
         
-        # Suggest number of features
-        n_selected = trial.suggest_int('n_features', min_features, n_features)
+        # One independent include/exclude flag per feature: O(n) per trial,
+        # and a 2^n space of independent parameters that TPE models
+        # directly, unlike a sequence of categorical picks over the
+        # remaining features
+        mask = [trial.suggest_int(f'use_{col}', 0, 1) for col in feature_cols]
+        selected = [col for col, use in zip(feature_cols, mask) if use]
         
-        # Suggest which features (using categorical selection)
-        # Note: For large feature sets, use importance-based pre-filtering
-        selected = []
-        for i in range(n_selected):
-            if len(feature_cols) > 0:
-                feat = trial.suggest_categorical(f'feature_{i}', feature_cols)
-                selected.append(feat)
-                feature_cols.remove(feat)  # Prevent duplicates
+        # Too few features selected: fall back to the full set
+        if len(selected) < min_features:
+            return feature_cols
         
         return selected
     
     def _evaluate_with_cv(
         self,
-        X: pd.DataFrame,
-        y: pd.Series,
+        X: Union[pd.DataFrame, np.ndarray],
+        y: Union[pd.Series, np.ndarray],
         params: Dict[str, Any],
-        trial: Optional[optuna.Trial] = None
+        trial: Optional[optuna.Trial] = None,
+        feature_key: Optional[Tuple[int, ...]] = None,
+        scorer: Optional[Tuple[Callable, bool]] = None,
+        folds: Optional[List[Tuple[np.ndarray, np.ndarray]]] = None
     ) -> List[float]:
         """
         Evaluate model with time-series cross-validation.
         
         Args:
-            X: Feature matrix
+            X: Feature matrix (DataFrames are converted with _as_feature_matrix)
             y: Target vector
             params: Model hyperparameters
             trial: Optuna trial for pruning
+            feature_key: Column indices X was taken from, used to reuse
+                cached XGBoost DMatrices across trials (None = no caching)
+            scorer: Fold metric from _get_scorer (None = resolve from config)
+            folds: (train_idx, val_idx) pairs from _split_folds (None = split X)
             
         Returns:
             List of CV fold scores
         """
-        tscv = TimeSeriesSplit(n_splits=self.config.n_cv_splits)
+        if scorer is None:
+            scorer = _get_scorer(self.config.optimize_for)
+        X = _as_feature_matrix(X)
+        y = np.asarray(y)
+        if folds is None:
+            folds = self._split_folds(len(X))
         scores = []
         
-        for fold, (train_idx, val_idx) in enumerate(tscv.split(X)):
-            X_train, X_val = X.iloc[train_idx], X.iloc[val_idx]
-            y_train, y_val = y.iloc[train_idx], y.iloc[val_idx]
+        # Folds in parallel: one trial uses all cores, but nothing can be
+        # pruned since no fold score is known before all of them finish
+        if self.config.n_jobs_per_trial != 1:
+            results = Parallel(n_jobs=self.config.n_jobs_per_trial, backend='loky')(
+                delayed(_run_fold)(
+                    self._create_model(params), X, y, train_idx, val_idx, scorer
+                )
+                for train_idx, val_idx in folds
+            )
+            for fold, (score, error) in enumerate(results):
+                if error is not None:
+                    logger.warning(f"Fold {fold} failed: {error}")
+                else:
+                    scores.append(score)
+            return scores
+        
+        # XGBoost trains through the native API on DMatrices that are built
+        # once per fold (and feature set) and reused by later trials
+        dmatrices = None
+        if self._native_xgboost:
+            dmatrices = self._fold_dmatrices(X, y, folds, feature_key)
+        
+        for fold, (train_idx, val_idx) in enumerate(folds):
+            if dmatrices is not None:
+                dtrain, dval = dmatrices[fold]
+                score, error = self._run_xgboost_fold(params, dtrain, dval, y[val_idx], scorer)
+            else:
+                score, error = _run_fold(
+                    self._create_model(params), X, y, train_idx, val_idx, scorer
+                )
+            if error is not None:
+                logger.warning(f"Fold {fold} failed: {error}")
+                continue
             
-            # Train model
-            model = self._create_model(params)
+            scores.append(score)
             
-            try:
-                model.fit(X_train, y_train)
+            # Pruning: report this fold's score. The raw score, not the
+            # running mean, so trials are compared fold for fold rather than
+            # early high-variance means against late ones.
+            if trial is not None and self.config.pruning_enabled:
+                trial.report(score, fold)
                 
-                # Predict
-                y_pred = model.predict(X_val)
-                
-                # Calculate score
-                if self.config.optimize_for == 'accuracy':
-                    score = accuracy_score(y_val, y_pred)
-                elif self.config.optimize_for == 'f1':
-                    score = f1_score(y_val, y_pred, zero_division=0)
-                elif self.config.optimize_for == 'roc_auc':
-                    y_proba = model.predict_proba(X_val)[:, 1]
-                    score = roc_auc_score(y_val, y_proba)
-                else:  # multi
-                    score = f1_score(y_val, y_pred, zero_division=0)
-                
-                scores.append(score)
-                
-                # Pruning: report intermediate value
-                if trial is not None and self.config.pruning_enabled:
-                    trial.report(np.mean(scores), fold)
-                    
-                    # Check if trial should be pruned
-                    if trial.should_prune():
-                        raise optuna.TrialPruned()
-                
-            except Exception as e:
-                logger.warning(f"Fold {fold} failed: {e}")
-                continue
+                # Check if trial should be pruned
+                if trial.should_prune():
+                    raise optuna.TrialPruned()
         
         return scores
     
-    def _create_model(self, params: Dict[str, Any]):
-        """Create model instance with given parameters."""
-        if self.config.model_type == 'xgboost':
-            import xgboost as xgb
-            return xgb.XGBClassifier(
-                **params,
-                objective='binary:logistic',
-                eval_metric='logloss',
-                random_state=42,
-                n_jobs=1  # Don't nest parallelism
-            )
+    def _split_folds(self, n_samples: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Time-series CV (train_idx, val_idx) pairs for ``n_samples`` rows."""
+        tscv = TimeSeriesSplit(n_splits=self.config.n_cv_splits)
+        return list(tscv.split(np.empty((n_samples, 1))))
+    
+    def _fold_dmatrices(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        folds: List[Tuple[np.ndarray, np.ndarray]],
+        feature_key: Optional[Tuple[int, ...]] = None
+    ) -> List[Tuple[Any, Any]]:
+        """
+        Train/validation DMatrices for each fold.
+        
+        A DMatrix keeps its quantised histogram index, so reusing one across
+        trials skips the copy and quantile sketch that each fit otherwise
+        repeats. Entries are keyed by the feature set and kept in a small
+        LRU cache.
+        """
+        import xgboost as xgb
         
-        elif self.config.model_type == 'lightgbm':
-            import lightgbm as lgb
-            return lgb.LGBMClassifier(
-                **params,
-                objective='binary',
-                metric='binary_logloss',
-                random_state=42,
-                n_jobs=1,
-                verbose=-1
+        if feature_key is not None:
+            with self._dmatrix_lock:
+                if feature_key in self._dmatrix_cache:
+                    self._dmatrix_cache.move_to_end(feature_key)
+                    return self._dmatrix_cache[feature_key]
+        
+        dmatrices = [
+            (xgb.DMatrix(X[train_idx], label=y[train_idx]),
+             xgb.DMatrix(X[val_idx], label=y[val_idx]))
+            for train_idx, val_idx in folds
+        ]
+        
+        if feature_key is not None:
+            with self._dmatrix_lock:
+                self._dmatrix_cache[feature_key] = dmatrices
+                while len(self._dmatrix_cache) > _DMATRIX_CACHE_SIZE:
+                    self._dmatrix_cache.popitem(last=False)
+        
+        return dmatrices
+    
+    def _run_xgboost_fold(
+        self,
+        params: Dict[str, Any],
+        dtrain,
+        dval,
+        y_val: np.ndarray,
+        scorer: Tuple[Callable, bool]
+    ) -> Tuple[Optional[float], Optional[str]]:
+        """
+        Train an XGBoost booster on a cached fold and score it.
+        
+        Same model as the XGBClassifier from _create_model, through
+        xgb.train. Only raw margins are predicted: they rank rows like the
+        probabilities, and margin > 0 is the classifier's probability > 0.5.
+        
+        Returns:
+            (score, None) on success, (None, error message) if the fold failed
+        """
+        import xgboost as xgb
+        
+        metric, needs_scores = scorer
+        train_params = {k: v for k, v in params.items() if k != 'n_estimators'}
+        train_params.update(
+            tree_method='hist',
+            device=self.device,
+            objective='binary:logistic',
+            eval_metric='logloss',
+            seed=42,
+            nthread=1  # Don't nest parallelism
+        )
+        
+        try:
+            booster = xgb.train(
+                train_params, dtrain, num_boost_round=params.get('n_estimators', 100)
             )
+            y_margin = booster.predict(dval, output_margin=True)
+            score = metric(y_val, y_margin if needs_scores else (y_margin > 0).astype(int))
+        except Exception as e:
+            return None, str(e)
         
-        else:
-            raise ValueError(f"Unknown model type: {self.config.model_type}")
+        return score, None
+    
+    def _create_model(self, params: Dict[str, Any]):
+        """Create model instance with given parameters."""
+        return self._build_model(**params)
     
     def _optimization_callback(
         self,
@@ -387,12 +880,62 @@ class HyperparameterOptimizer:
             )
             
             # Track history
-            self.optimization_history.append({
+            record = {
                 'trial': trial.number,
                 'value': trial.value,
                 'params': trial.params,
                 'datetime': trial.datetime_complete.isoformat() if trial.datetime_complete else None
-            })
+            }
+            with self._history_lock:
+                self.optimization_history.append(record)
+                if self._history_writer is not None:
+                    self._history_pending.append(record)
+                    if len(self._history_pending) >= _HISTORY_BUFFER_SIZE:
+                        self._flush_history()
+    
+    def history_path(self, study_name: str) -> Path:
+        """
+        Directory of the study's trial history, readable as one Parquet dataset.
+        
+        Each optimize() call appends its own part file, so resuming a study
+        with load_if_exists=True keeps the earlier runs' trials.
+        """
+        return self.results_dir / f"{study_name}_history"
+    
+    def _open_history(self, study_name: str) -> None:
+        """Start streaming completed trials to a new part of the study's history."""
+        self.optimization_history.clear()
+        if not PYARROW_AVAILABLE:
+            return
+        
+        history_dir = self.history_path(study_name)
+        history_dir.mkdir(parents=True, exist_ok=True)
+        part_path = history_dir / f"part-{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.parquet"
+        self._history_writer = pq.ParquetWriter(part_path, _HISTORY_SCHEMA)
+    
+    def _flush_history(self) -> None:
+        """Write pending history rows as one row group (caller holds the lock)."""
+        if not self._history_pending:
+            return
+        
+        batch = pa.RecordBatch.from_pylist(
+            [{**record, 'params': json.dumps(record['params'], default=str)}
+             for record in self._history_pending],
+            schema=_HISTORY_SCHEMA
+        )
+        self._history_writer.write_batch(batch)
+        self._history_pending.clear()
+    
+    def _close_history(self) -> None:
+        """Flush and close the history file."""
+        with self._history_lock:
+            if self._history_writer is None:
+                return
+            try:
+                self._flush_history()
+            finally:
+                self._history_writer.close()
+                self._history_writer = None
     
     def _compile_results(self, X: pd.DataFrame, y: pd.Series) -> Dict[str, Any]:
         """Compile optimization results."""
@@ -430,54 +973,103 @@ class HyperparameterOptimizer:
     
     def _summarize_trials(self) -> Dict[str, Any]:
         """Summarize all trials."""
-        completed_trials = [
-            t for t in self.study.trials
-            if t.state == optuna.trial.TrialState.COMPLETE
-        ]
+        TrialState = optuna.trial.TrialState
+        # deepcopy=False: study.trials copies every FrozenTrial on each access
+        trials = self.study.get_trials(deepcopy=False)
         
-        if not completed_trials:
+        states = np.fromiter((t.state.value for t in trials), dtype=np.int8, count=len(trials))
+        counts = np.bincount(states, minlength=len(TrialState))
+        
+        if not counts[TrialState.COMPLETE.value]:
             return {}
         
-        values = [t.value for t in completed_trials]
+        values = np.array(
+            [trials[i].value for i in np.flatnonzero(states == TrialState.COMPLETE.value)],
+            dtype=np.float64
+        )
+        value_min, value_median, value_max = np.percentile(values, [0, 50, 100])
         
         return {
-            'n_completed': len(completed_trials),
-            'n_pruned': len([
-                t for t in self.study.trials
-                if t.state == optuna.trial.TrialState.PRUNED
-            ]),
-            'n_failed': len([
-                t for t in self.study.trials
-                if t.state == optuna.trial.TrialState.FAIL
-            ]),
-            'value_mean': float(np.mean(values)),
-            'value_std': float(np.std(values)),
-            'value_min': float(np.min(values)),
-            'value_max': float(np.max(values)),
-            'value_median': float(np.median(values))
+            'n_completed': int(counts[TrialState.COMPLETE.value]),
+            'n_pruned': int(counts[TrialState.PRUNED.value]),
+            'n_failed': int(counts[TrialState.FAIL.value]),
+            'value_mean': float(values.mean()),
+            'value_std': float(values.std()),
+            'value_min': float(value_min),
+            'value_max': float(value_max),
+            'value_median': float(value_median)
         }
     
     def _save_results(self, results: Dict[str, Any], study_name: str) -> None:
-        """Save optimization results to disk."""
+        """
+        Save optimization results to disk.
+        
+        The file is written next to its destination and renamed into place,
+        so a killed process never leaves a half-written results file.
+        """
         results_path = self.results_dir / f"{study_name}_results.json"
         
-        with open(results_path, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(
+                results,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+                default=str
+            )
+        else:
+            data = json.dumps(results, indent=2, default=str).encode()
+        
+        tmp_path = results_path.with_suffix('.json.tmp')
+        tmp_path.write_bytes(data)
+        tmp_path.replace(results_path)
         
         logger.info(f"Results saved to {results_path}")
     
+    def _param_importances(self) -> Dict[str, float]:
+        """
+        Hyperparameter importances for the current study, most important first.
+        
+        fANOVA fits a random forest over every completed trial, so the result
+        is cached until more trials complete.
+        """
+        n_complete = len(self.study.get_trials(
+            deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,)
+        ))
+        if self._importance_cache is None or self._importance_cache[0] != n_complete:
+            importance = optuna.importance.get_param_importances(
+                self.study,
+                evaluator=optuna.importance.FanovaImportanceEvaluator(seed=42)
+            )
+            self._importance_cache = (n_complete, importance)
+        
+        return self._importance_cache[1]
+    
     def plot_optimization_history(
         self,
         save_path: Optional[str] = None
     ) -> None:
-        """Plot optimization history."""
+        """
+        Plot optimization history.
+        
+        A save_path ending in .html gets interactive Plotly figures; anything
+        else is rendered with matplotlib.
+        """
+        if self.study is None:
+            logger.warning("No study available to plot")
+            return
+        
+        try:
+            importance = self._param_importances()
+        except Exception as e:
+            logger.warning(f"Could not compute parameter importance: {e}")
+            importance = {}
+        
+        if save_path and str(save_path).endswith('.html'):
+            self._write_plotly_report(save_path, importance)
+            return
+        
         try:
             import matplotlib.pyplot as plt
             
-            if self.study is None:
-                logger.warning("No study available to plot")
-                return
-            
             fig, axes = plt.subplots(2, 2, figsize=(15, 10))
             
             # Plot 1: Optimization history
@@ -491,8 +1083,7 @@ class HyperparameterOptimizer:
             axes[0, 0].grid(True, alpha=0.3)
             
             # Plot 2: Parameter importance
-            try:
-                importance = optuna.importance.get_param_importances(self.study)
+            if importance:
                 params = list(importance.keys())[:10]  # Top 10
                 importances = [importance[p] for p in params]
                 
@@ -500,8 +1091,7 @@ class HyperparameterOptimizer:
                 axes[0, 1].set_xlabel('Importance')
                 axes[0, 1].set_title('Parameter Importance (Top 10)')
                 axes[0, 1].grid(True, alpha=0.3, axis='x')
-            except Exception as e:
-                logger.warning(f"Could not plot parameter importance: {e}")
+            else:
                 axes[0, 1].text(0.5, 0.5, 'Parameter importance\nnot available',
                               ha='center', va='center')
             
@@ -509,8 +1099,7 @@ class HyperparameterOptimizer:
             try:
                 from optuna.visualization.matplotlib import plot_parallel_coordinate
                 
-                # Get top parameters by importance
-                importance = optuna.importance.get_param_importances(self.study)
+                # Top parameters by importance
                 top_params = list(importance.keys())[:5]
                 
                 plot_parallel_coordinate(self.study, params=top_params, target_name='Objective')
@@ -545,6 +1134,54 @@ class HyperparameterOptimizer:
         except Exception as e:
             logger.error(f"Error creating plots: {e}")
     
+    def _write_plotly_report(self, save_path: str, importance: Dict[str, float]) -> None:
+        """Write the optimization plots as one interactive HTML page."""
+        try:
+            import plotly.graph_objects as go
+            from optuna.visualization import plot_optimization_history, plot_parallel_coordinate
+            
+            values = [
+                t.value for t in self.study.get_trials(
+                    deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,)
+                )
+            ]
+            
+            figures = [plot_optimization_history(self.study, target_name='Objective')]
+            if importance:
+                params = list(importance.keys())[:10]  # Top 10
+                figures.append(go.Figure(
+                    go.Bar(x=[importance[p] for p in params], y=params, orientation='h'),
+                    layout=dict(title='Parameter Importance (Top 10)',
+                                xaxis_title='Importance', yaxis=dict(autorange='reversed'))
+                ))
+                figures.append(plot_parallel_coordinate(
+                    self.study, params=params[:5], target_name='Objective'
+                ))
+            histogram = go.Figure(
+                go.Histogram(x=values, nbinsx=30),
+                layout=dict(title='Objective Value Distribution',
+                            xaxis_title='Objective Value', yaxis_title='Frequency')
+            )
+            histogram.add_vline(x=self.study.best_value, line_dash='dash', line_color='red',
+                                annotation_text=f'Best: {self.study.best_value:.4f}')
+            figures.append(histogram)
+            
+            # plotly.js is embedded once, with the first figure
+            body = ''.join(
+                fig.to_html(full_html=False, include_plotlyjs=(i == 0))
+                for i, fig in enumerate(figures)
+            )
+            Path(save_path).write_text(
+                f'<html><head><meta charset="utf-8"></head><body>{body}</body></html>',
+                encoding='utf-8'
+            )
+            logger.info(f"Optimization plots saved to {save_path}")
+            
+        except ImportError:
+            logger.warning("Plotly not available for plotting")
+        except Exception as e:
+            logger.error(f"Error creating plots: {e}")
+    
     def get_feature_importance_from_optimization(self) -> Optional[pd.DataFrame]:
         """
         Get feature importance from optimization if feature selection was used.
@@ -555,38 +1192,26 @@ class HyperparameterOptimizer:
         if not self.config.feature_selection_enabled or self.study is None:
             return None
         
-        # Count how often each feature was selected
-        feature_counts = {}
-        total_trials = 0
-        
-        for trial in self.study.trials:
-            if trial.state != optuna.trial.TrialState.COMPLETE:
-                continue
-            
-            total_trials += 1
-            
-            # Get selected features from params
-            selected_features = [
-                v for k, v in trial.params.items()
-                if k.startswith('feature_')
-            ]
-            
-            for feat in selected_features:
-                feature_counts[feat] = feature_counts.get(feat, 0) + 1
+        # Count how often each feature was selected (use_<feature> flag set)
+        completed = self.study.get_trials(
+            deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,)
+        )
+        feature_counts = Counter(
+            k[len('use_'):]
+            for trial in completed
+            for k, v in trial.params.items()
+            if v == 1 and k.startswith('use_')
+        )
         
         if not feature_counts:
             return None
         
-        # Create DataFrame
-        importance_df = pd.DataFrame([
-            {
-                'feature': feat,
-                'selection_count': count,
-                'selection_frequency': count / total_trials
-            }
-            for feat, count in feature_counts.items()
-        ])
-        
+        importance_df = (
+            pd.Series(feature_counts, name='selection_count')
+            .rename_axis('feature')
+            .reset_index()
+        )
+        importance_df['selection_frequency'] = importance_df['selection_count'] / len(completed)
         importance_df = importance_df.sort_values('selection_frequency', ascending=False)
         
         return importance_df
@@ -628,7 +1253,7 @@ def optimize_model_hyperparameters(
     results = optimizer.optimize(X, y)
     
     # Generate plots
-    plot_path = Path(results_dir) / f"{optimizer.study.study_name}_plots.png"
+    plot_path = Path(results_dir) / f"{optimizer.study.study_name}_plots.html"
     optimizer.plot_optimization_history(str(plot_path))
     
     return results
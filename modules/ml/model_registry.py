@@ -10,19 +10,197 @@ Centralized model management including:
 - Metadata and lineage tracking
 """
 
+import atexit
 import json
+import os
 import pickle
+import queue
 import shutil
+import sys
+import threading
+import uuid
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, fields
 from enum import Enum
 import logging
-import pandas as pd
+import numpy as np
+
+if TYPE_CHECKING:
+    # Imported where used, so importing the registry doesn't load pandas
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Frame header that starts every zstd stream
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# Change events appended to the WAL before it is folded into registry.json
+_WAL_COMPACT_EVENTS = 100
+
+# Removes deleted model directories off the caller's thread; pending
+# removals are waited for at interpreter exit
+_DELETE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-registry-delete")
+atexit.register(_DELETE_EXECUTOR.shutdown, wait=True)
+
+# Most queued persistence requests written in one database batch
+_DB_BATCH_SIZE = 100
+
+# Database writes from every ModelRegistry are queued here and applied by
+# one background worker, started on first use, so a slow database never
+# blocks callers; the queue is drained at interpreter exit
+_DB_QUEUE: "queue.Queue[Optional[List[ModelMetadata]]]" = queue.Queue()
+_DB_THREAD: Optional[threading.Thread] = None
+_DB_THREAD_LOCK = threading.Lock()
+
+# (model IDs, error) for queued writes that failed, reported by flush_to_db
+_DB_FAILURES: List[Tuple[List[str], Exception]] = []
+_DB_FAILURES_LOCK = threading.Lock()
+
+# model_registry columns in the order _db_row emits them
+_DB_COLUMNS = (
+    'model_id', 'model_name', 'model_version', 'model_type', 'ticker', 'artifact_path',
+    'feature_names', 'hyperparameters', 'training_metrics', 'validation_metrics',
+    'status', 'trained_at', 'promoted_at'
+)
+
+# Upsert understood by both PostgreSQL and DuckDB; DuckDB takes ? placeholders
+_UPSERT_SQL = f"""
+    INSERT INTO model_registry ({', '.join(_DB_COLUMNS)})
+    VALUES ({', '.join(['%s'] * len(_DB_COLUMNS))})
+    ON CONFLICT (model_id) DO UPDATE SET
+        status = EXCLUDED.status,
+        promoted_at = EXCLUDED.promoted_at,
+        validation_metrics = EXCLUDED.validation_metrics
+"""
+
+
+def _json_dumps(obj: Any, indent: bool = True) -> bytes:
+    """Encode ``obj`` as UTF-8 JSON, with orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option, default=str)
+    return json.dumps(obj, indent=2 if indent else None, default=str).encode()
+
+
+def _json_text(obj: Any) -> str:
+    """Compact JSON text for a database JSON column."""
+    return _json_dumps(obj, indent=False).decode()
+
+
+def _json_loads(data: bytes) -> Any:
+    """Decode JSON bytes, with orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dump_pickle(obj: Any, path: Path) -> Path:
+    """
+    Pickle ``obj`` to ``path`` with the highest protocol.
+    
+    With zstandard installed the stream is zstd-compressed and written to
+    ``path`` with a ``.zst`` suffix added.
+    
+    Returns:
+        Path actually written
+    """
+    if ZSTD_AVAILABLE:
+        path = path.with_name(path.name + '.zst')
+        with open(path, 'wb') as f:
+            with zstandard.ZstdCompressor(level=3).stream_writer(f) as writer:
+                pickle.dump(obj, writer, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        with open(path, 'wb') as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _load_pickle(path: str) -> Any:
+    """Load a pickle written by _dump_pickle, or a plain uncompressed one."""
+    with open(path, 'rb') as f:
+        if f.read(4) != _ZSTD_MAGIC:
+            f.seek(0)
+            return pickle.load(f)
+        
+        if not ZSTD_AVAILABLE:
+            raise ImportError(
+                f"{path} is zstd-compressed. Install with: pip install zstandard"
+            )
+        f.seek(0)
+        with zstandard.ZstdDecompressor().stream_reader(f) as reader:
+            return pickle.load(reader)
+
+
+def _dump_artifact(artifact: Any, artifacts_dir: Path, name: str) -> Path:
+    """
+    Save one artifact in the cheapest format that round-trips it.
+    
+    Numeric arrays go to .npy, DataFrames to Parquet and flat dicts of
+    numbers to JSON; anything else (or a DataFrame Parquet can't hold) is
+    pickled.
+    
+    Returns:
+        Path actually written
+    """
+    base = artifacts_dir / name
+    
+    if isinstance(artifact, np.ndarray) and artifact.dtype != object:
+        path = base.with_name(f"{name}.npy")
+        np.save(path, artifact, allow_pickle=False)
+        return path
+    
+    # A DataFrame can only exist once pandas is loaded; don't import it here
+    pd = sys.modules.get('pandas')
+    if pd is not None and isinstance(artifact, pd.DataFrame):
+        path = base.with_name(f"{name}.parquet")
+        try:
+            artifact.to_parquet(path)
+            return path
+        except Exception as e:
+            path.unlink(missing_ok=True)
+            logger.debug(f"Artifact {name} not stored as Parquet ({e}); pickling")
+    
+    elif isinstance(artifact, dict) and all(
+        isinstance(k, str) and isinstance(v, (int, float)) and not isinstance(v, bool)
+        for k, v in artifact.items()
+    ):
+        path = base.with_name(f"{name}.json")
+        path.write_bytes(_json_dumps(artifact))
+        return path
+    
+    return _dump_pickle(artifact, base.with_name(f"{name}.pkl"))
+
+
+def _load_artifact(path: Path) -> Any:
+    """Load an artifact written by _dump_artifact."""
+    if path.suffix == '.npy':
+        return np.load(path, allow_pickle=False)
+    if path.suffix == '.parquet':
+        import pandas as pd
+        return pd.read_parquet(path)
+    if path.suffix == '.json':
+        return _json_loads(path.read_bytes())
+    return _load_pickle(str(path))
+
 
 class ModelStatus(Enum):
     """Model deployment status."""
@@ -33,7 +211,7 @@ class ModelStatus(Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class ModelMetadata:
     """Metadata for a trained model."""
     
@@ -50,7 +228,6 @@ class ModelMetadata:
     # Training info
     trained_at: str
     training_duration_seconds: float
-    trained_by: str = "system"
     
     # Dataset info
     n_train_samples: int
@@ -68,6 +245,9 @@ class ModelMetadata:
     # Hyperparameters
     hyperparameters: Dict[str, Any]
     
+    # Training info (defaulted fields must follow the required ones)
+    trained_by: str = "system"
+    
     # Status
     status: str = ModelStatus.STAGING.value
     
@@ -89,8 +269,13 @@ class ModelMetadata:
             self.tags = []
     
     def to_dict(self) -> Dict:
-        """Convert to dictionary."""
-        return asdict(self)
+        """
+        Convert to dictionary.
+        
+        The copy is shallow: lists and dicts are shared with this instance,
+        so callers must not mutate them. Serializers only need to read them.
+        """
+        return {f.name: getattr(self, f.name) for f in fields(self)}
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'ModelMetadata':
@@ -98,6 +283,84 @@ class ModelMetadata:
         return cls(**data)
 
 
+def _start_db_worker() -> None:
+    """Start the shared database worker if it is not running."""
+    global _DB_THREAD
+    with _DB_THREAD_LOCK:
+        if _DB_THREAD is None:
+            _DB_THREAD = threading.Thread(
+                target=_db_worker, name="model-registry-db", daemon=True
+            )
+            _DB_THREAD.start()
+            atexit.register(_flush_and_stop)
+
+
+def _db_worker() -> None:
+    """Write queued metadata to the database until told to stop."""
+    while True:
+        batch = [_DB_QUEUE.get()]
+        while len(batch) < _DB_BATCH_SIZE:
+            try:
+                batch.append(_DB_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+        
+        # One row per model, in first-queued order, at its latest state
+        pending: Dict[str, ModelMetadata] = {}
+        for metadatas in batch:
+            for metadata in metadatas or []:
+                pending[metadata.model_id] = metadata
+        if pending:
+            try:
+                _write_to_database(list(pending.values()))
+            except Exception as e:
+                logger.warning(f"Failed to persist model metadata to database: {e}")
+                with _DB_FAILURES_LOCK:
+                    _DB_FAILURES.append((list(pending), e))
+        
+        for _ in batch:
+            _DB_QUEUE.task_done()
+        if None in batch:
+            return
+
+
+def _write_to_database(metadatas: List[ModelMetadata]) -> None:
+    """Upsert several models' metadata in one database round trip."""
+    from modules.database.factory import get_db_connection
+    db = get_db_connection()
+    
+    # Upsert parameterized rows using raw SQL
+    if os.getenv('DATABASE_BACKEND', 'duckdb').lower() == 'postgresql':
+        # psycopg2 adapts the objects to the JSON columns itself
+        from psycopg2.extras import Json
+        sql = _UPSERT_SQL
+        encode_json = partial(Json, dumps=_json_text)
+    else:
+        sql = _UPSERT_SQL.replace('%s', '?')
+        encode_json = _json_text
+    db.execute_prepared(
+        'upsert_model_registry', sql,
+        [ModelRegistry._db_row(metadata, encode_json) for metadata in metadatas]
+    )
+    
+    logger.info(
+        f"Persisted model metadata to database: "
+        f"{', '.join(metadata.model_id for metadata in metadatas)}"
+    )
+
+
+def _flush_and_stop() -> None:
+    """Drain the database queue and stop the worker (run at exit)."""
+    global _DB_THREAD
+    with _DB_THREAD_LOCK:
+        thread, _DB_THREAD = _DB_THREAD, None
+        if thread is None:
+            return
+        atexit.unregister(_flush_and_stop)
+        _DB_QUEUE.put(None)
+        thread.join()
+
+
 class ModelRegistry:
     """
     Centralized registry for managing trained models.
@@ -112,74 +375,149 @@ class ModelRegistry:
     - Postgres persistence for model metadata
     """
     
-    def __init__(self, registry_dir: str = "data/models/registry", persist_to_db: bool = True):
+    def __init__(
+        self,
+        registry_dir: str = "data/models/registry",
+        persist_to_db: bool = True,
+        cache_size: int = 4
+    ):
         """
         Initialize model registry.
         
         Args:
             registry_dir: Directory for registry storage
             persist_to_db: Whether to persist metadata to database (default True)
+            cache_size: Number of loaded models kept in memory (0 disables caching)
         """
         self.registry_dir = Path(registry_dir)
         self.registry_dir.mkdir(parents=True, exist_ok=True)
         self.persist_to_db = persist_to_db
         
+        # Least-recently-used cache of unpickled models, keyed by model ID
+        self.cache_size = cache_size
+        self._model_cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Deleted model directories wait here until removed in the background
+        self.trash_dir = self.registry_dir / ".trash"
+        if self.trash_dir.exists():
+            # Left over from a run that exited before removing them
+            for leftover in self.trash_dir.iterdir():
+                _DELETE_EXECUTOR.submit(shutil.rmtree, leftover, ignore_errors=True)
+        
         # Registry metadata file
         self.metadata_file = self.registry_dir / "registry.json"
         
+        # Write-ahead log of changes since the last snapshot; one JSON
+        # event per line, replayed over registry.json on load
+        self.wal_file = self.registry_dir / "registry.wal.jsonl"
+        self._wal_events = 0
+        
+        # Secondary indexes: filter value -> model IDs (dicts used as
+        # ordered sets). Kept in step with self.models by
+        # _index_model/_unindex_model so lookups don't scan every model.
+        self._by_ticker: Dict[str, Dict[str, None]] = {}
+        self._by_status: Dict[str, Dict[str, None]] = {}
+        self._by_model_type: Dict[str, Dict[str, None]] = {}
+        self._by_ticker_type: Dict[Tuple[str, str], Dict[str, None]] = {}
+        self._index_keys: Dict[str, Tuple[str, str, str]] = {}
+        # Registration position of each indexed model; moving a model between
+        # index entries appends it there, so lookups sort by this to keep
+        # the order of self.models
+        self._index_positions: Dict[str, int] = {}
+        self._next_position = 0
+        
         # Load or initialize registry
         self.models: Dict[str, ModelMetadata] = self._load_registry()
+        for metadata in self.models.values():
+            self._index_model(metadata)
         
+    @staticmethod
+    def _db_row(metadata: ModelMetadata, encode_json: Callable[[Any], Any] = _json_text) -> Tuple:
+        """
+        model_registry row for ``metadata``, in _DB_COLUMNS order.
+        
+        Args:
+            metadata: Model metadata
+            encode_json: Wraps the JSON column values; JSON text by default,
+                or the driver's JSON adapter for PostgreSQL
+        """
+        return (
+            metadata.model_id,
+            metadata.model_name,
+            metadata.version,
+            metadata.model_type,
+            metadata.ticker,
+            metadata.model_path,
+            encode_json(metadata.feature_names),
+            encode_json(metadata.hyperparameters),
+            encode_json(metadata.train_metrics),
+            encode_json(metadata.val_metrics),
+            metadata.status,
+            metadata.trained_at,
+            metadata.deployed_at,
+        )
+    
     def _persist_to_database(self, metadata: ModelMetadata) -> None:
         """Persist model metadata to the database model_registry table."""
-        if not self.persist_to_db:
+        self._persist_many([metadata])
+    
+    def _persist_many(self, metadatas: List[ModelMetadata]) -> None:
+        """Queue several models' metadata to be upserted together."""
+        if not self.persist_to_db or not metadatas:
             return
-        try:
-            from modules.database.factory import get_db_connection
-            db = get_db_connection()
-            
-            row = pd.DataFrame([{
-                'model_id': metadata.model_id,
-                'model_name': metadata.model_name,
-                'model_version': metadata.version,
-                'model_type': metadata.model_type,
-                'ticker': metadata.ticker,
-                'artifact_path': metadata.model_path,
-                'feature_names': json.dumps(metadata.feature_names),
-                'hyperparameters': json.dumps(metadata.hyperparameters),
-                'training_metrics': json.dumps(metadata.train_metrics),
-                'validation_metrics': json.dumps(metadata.val_metrics),
-                'status': metadata.status,
-                'trained_at': metadata.trained_at,
-                'promoted_at': metadata.deployed_at,
-            }])
-            
-            # Upsert using raw SQL for PostgreSQL
-            import os
-            if os.getenv('DATABASE_BACKEND', 'duckdb').lower() == 'postgresql':
-                for _, r in row.iterrows():
-                    db.execute("""
-                        INSERT INTO model_registry (model_id, model_name, model_version, model_type, ticker, artifact_path, feature_names, hyperparameters, training_metrics, validation_metrics, status, trained_at, promoted_at)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (model_id) DO UPDATE SET
-                            status = EXCLUDED.status,
-                            promoted_at = EXCLUDED.promoted_at,
-                            validation_metrics = EXCLUDED.validation_metrics
-                    """, (
-                        r['model_id'], r['model_name'], r['model_version'], r['model_type'],
-                        r['ticker'], r['artifact_path'], r['feature_names'], r['hyperparameters'],
-                        r['training_metrics'], r['validation_metrics'], r['status'],
-                        r['trained_at'], r['promoted_at']
-                    ))
-            else:
-                # DuckDB fallback (simple insert or replace)
-                db.insert_df(row, 'model_registry', if_exists='append',
-                             conflict_columns=['model_id'])
-            
-            logger.info(f"Persisted model metadata to database: {metadata.model_id}")
-        except Exception as e:
-            logger.warning(f"Failed to persist model metadata to database: {e}")
-
+        _start_db_worker()
+        _DB_QUEUE.put(list(metadatas))
+    
+    def flush_to_db(self) -> None:
+        """
+        Block until every queued database write has been applied.
+        
+        The queue is shared by all registries, so this also waits for
+        their writes.
+        
+        Raises:
+            RuntimeError: If any queued write failed since the last flush; the
+                models named were not written and are still in the registry
+                files (sync_to_db adds those missing from the table)
+        """
+        _DB_QUEUE.join()
+        with _DB_FAILURES_LOCK:
+            failures = _DB_FAILURES[:]
+            _DB_FAILURES.clear()
+        if failures:
+            model_ids = [model_id for ids, _ in failures for model_id in ids]
+            raise RuntimeError(
+                f"Failed to persist model metadata to database: {', '.join(model_ids)}"
+            ) from failures[-1][1]
+    
+    def sync_to_db(self) -> int:
+        """
+        Bulk-load registry models that are missing from the database.
+        
+        Populates a fresh (or restored) model_registry table from the on-disk
+        registry with one COPY on PostgreSQL, or one INSERT ... SELECT on DuckDB,
+        instead of an upsert per model. Rows already present are left as is.
+        
+        Returns:
+            Number of rows written
+        """
+        from modules.database.factory import get_db_connection
+        self.flush_to_db()
+        db = get_db_connection()
+        
+        existing = set(db.query("SELECT model_id FROM model_registry")['model_id'])
+        rows = [
+            self._db_row(metadata)
+            for model_id, metadata in self.models.items()
+            if model_id not in existing
+        ]
+        db.copy_rows('model_registry', list(_DB_COLUMNS), rows)
+        
+        logger.info(f"Synced {len(rows)} models to database")
+        
+        return len(rows)
+    
     def register_model(
         self,
         model: Any,
@@ -208,9 +546,7 @@ class ModelRegistry:
         model_dir.mkdir(parents=True, exist_ok=True)
         
         # Save model
-        model_path = model_dir / "model.pkl"
-        with open(model_path, 'wb') as f:
-            pickle.dump(model, f)
+        model_path = _dump_pickle(model, model_dir / "model.pkl")
         metadata.model_path = str(model_path)
         
         # Save artifacts
@@ -218,20 +554,24 @@ class ModelRegistry:
             artifacts_dir = model_dir / "artifacts"
             artifacts_dir.mkdir(exist_ok=True)
             
-            for name, artifact in artifacts.items():
-                artifact_path = artifacts_dir / f"{name}.pkl"
-                with open(artifact_path, 'wb') as f:
-                    pickle.dump(artifact, f)
+            # Sidecar index: artifact name -> file, so loading knows the format
+            index = {
+                name: _dump_artifact(artifact, artifacts_dir, name).name
+                for name, artifact in artifacts.items()
+            }
+            (artifacts_dir / "artifacts.index.json").write_bytes(_json_dumps(index))
             
             metadata.artifacts_path = str(artifacts_dir)
         
         # Save metadata
         metadata_path = model_dir / "metadata.json"
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata.to_dict(), f, indent=2, default=str)
+        metadata_path.write_bytes(_json_dumps(metadata.to_dict()))
         
         # Add to registry
         self.models[model_id] = metadata
+        self._index_model(metadata)
+        self._evict_model(model_id)
+        self._append_wal("upsert", metadata)
         
         # Persist to database
         self._persist_to_database(metadata)
@@ -240,9 +580,6 @@ class ModelRegistry:
         if promote_to_production:
             self.promote_to_production(model_id)
         
-        # Save registry
-        self._save_registry()
-        
         logger.info(f"Model registered successfully: {model_id}")
         logger.info(f"Status: {metadata.status}")
         
@@ -266,13 +603,60 @@ class ModelRegistry:
         if metadata.model_path is None:
             raise ValueError(f"Model path not set for {model_id}")
         
-        with open(metadata.model_path, 'rb') as f:
-            model = pickle.load(f)
+        with self._cache_lock:
+            if model_id in self._model_cache:
+                self._model_cache.move_to_end(model_id)
+                return self._model_cache[model_id], metadata
+        
+        model = _load_pickle(metadata.model_path)
+        
+        if self.cache_size > 0:
+            with self._cache_lock:
+                self._model_cache[model_id] = model
+                while len(self._model_cache) > self.cache_size:
+                    self._model_cache.popitem(last=False)
         
         logger.info(f"Loaded model: {model_id} (status: {metadata.status})")
         
         return model, metadata
     
+    def _evict_model(self, model_id: str) -> None:
+        """Drop ``model_id`` from the loaded-model cache."""
+        with self._cache_lock:
+            self._model_cache.pop(model_id, None)
+    
+    def load_artifact(self, model_id: str, name: str) -> Any:
+        """
+        Load one artifact saved with a model.
+        
+        Args:
+            model_id: Model identifier
+            name: Artifact name as passed to register_model
+            
+        Returns:
+            The artifact object
+        """
+        if model_id not in self.models:
+            raise ValueError(f"Model not found: {model_id}")
+        
+        artifacts_path = self.models[model_id].artifacts_path
+        if artifacts_path is None:
+            raise ValueError(f"No artifacts saved for {model_id}")
+        
+        artifacts_dir = Path(artifacts_path)
+        index_path = artifacts_dir / "artifacts.index.json"
+        if index_path.exists():
+            index = _json_loads(index_path.read_bytes())
+            if name not in index:
+                raise ValueError(f"Artifact not found for {model_id}: {name}")
+            return _load_artifact(artifacts_dir / index[name])
+        
+        # Registered before the index existed: every artifact is a pickle
+        legacy_path = artifacts_dir / f"{name}.pkl"
+        if not legacy_path.exists():
+            raise ValueError(f"Artifact not found for {model_id}: {name}")
+        return _load_artifact(legacy_path)
+    
     def get_production_model(self, ticker: str, model_type: Optional[str] = None) -> Tuple[Any, ModelMetadata]:
         """
         Get the current production model for a ticker.
@@ -286,10 +670,9 @@ class ModelRegistry:
         """
         # Find production models for ticker
         production_models = [
-            (mid, meta) for mid, meta in self.models.items()
-            if meta.status == ModelStatus.PRODUCTION.value
-            and meta.ticker == ticker
-            and (model_type is None or meta.model_type == model_type)
+            (mid, self.models[mid]) for mid in self._lookup(
+                ticker=ticker, status=ModelStatus.PRODUCTION.value, model_type=model_type
+            )
         ]
         
         if not production_models:
@@ -319,24 +702,32 @@ class ModelRegistry:
         metadata = self.models[model_id]
         ticker = metadata.ticker
         model_type = metadata.model_type
+        self._evict_model(model_id)
         
         # Demote current production models
+        demoted = []
         if demote_current:
-            for mid, meta in self.models.items():
-                if (meta.status == ModelStatus.PRODUCTION.value and
-                    meta.ticker == ticker and
-                    meta.model_type == model_type):
-                    meta.status = ModelStatus.ARCHIVED.value
-                    self._persist_to_database(meta)
-                    logger.info(f"Demoted model to archived: {mid}")
+            for mid in self._lookup(
+                ticker=ticker, status=ModelStatus.PRODUCTION.value, model_type=model_type
+            ):
+                if mid == model_id:
+                    continue
+                meta = self.models[mid]
+                meta.status = ModelStatus.ARCHIVED.value
+                self._index_model(meta)
+                demoted.append(meta)
+                logger.info(f"Demoted model to archived: {mid}")
         
         # Promote new model
         metadata.status = ModelStatus.PRODUCTION.value
         metadata.deployed_at = datetime.now().isoformat()
         metadata.deployment_environment = "production"
+        self._index_model(metadata)
         
-        self._persist_to_database(metadata)
-        self._save_registry()
+        # Demotions and the promotion are written together
+        self._persist_many(demoted + [metadata])
+        for meta in demoted + [metadata]:
+            self._append_wal("upsert", meta)
         
         logger.info(f"Promoted model to production: {model_id}")
     
@@ -353,8 +744,8 @@ class ModelRegistry:
         """
         # Find model with specified version
         candidates = [
-            (mid, meta) for mid, meta in self.models.items()
-            if meta.ticker == ticker and meta.version == version
+            (mid, self.models[mid]) for mid in self._lookup(ticker=ticker)
+            if self.models[mid].version == version
         ]
         
         if not candidates:
@@ -373,7 +764,7 @@ class ModelRegistry:
         self,
         model_ids: List[str],
         metric: str = 'test_metrics.f1'
-    ) -> pd.DataFrame:
+    ) -> 'pd.DataFrame':
         """
         Compare multiple models.
         
@@ -384,7 +775,14 @@ class ModelRegistry:
         Returns:
             DataFrame with comparison results
         """
-        comparison = []
+        # Built column-wise: a dict of lists avoids per-row dict construction
+        columns: Dict[str, List[Any]] = {
+            'model_id': [], 'version': [], 'model_type': [], 'status': [],
+            'trained_at': [], metric: [], 'n_train_samples': [], 'n_features': []
+        }
+        metric_values: List[Any] = []
+        # Read the metric straight off the dataclass instead of serializing it
+        head, *tail = metric.split('.')
         
         for model_id in model_ids:
             if model_id not in self.models:
@@ -394,25 +792,24 @@ class ModelRegistry:
             meta = self.models[model_id]
             
             # Extract metric value
-            metric_parts = metric.split('.')
-            value = meta.to_dict()
-            for part in metric_parts:
-                value = value.get(part, None)
-                if value is None:
-                    break
+            value = getattr(meta, head, None)
+            for part in tail:
+                value = value.get(part, None) if isinstance(value, dict) else None
             
-            comparison.append({
-                'model_id': model_id,
-                'version': meta.version,
-                'model_type': meta.model_type,
-                'status': meta.status,
-                'trained_at': meta.trained_at,
-                metric: value,
-                'n_train_samples': meta.n_train_samples,
-                'n_features': meta.n_features
-            })
-        
-        df = pd.DataFrame(comparison)
+            columns['model_id'].append(model_id)
+            columns['version'].append(meta.version)
+            columns['model_type'].append(meta.model_type)
+            columns['status'].append(meta.status)
+            columns['trained_at'].append(meta.trained_at)
+            metric_values.append(value)
+            columns['n_train_samples'].append(meta.n_train_samples)
+            columns['n_features'].append(meta.n_features)
+        
+        # Assigned last so a metric naming a base column (e.g. n_features) wins
+        columns[metric] = metric_values
+        
+        import pandas as pd
+        df = pd.DataFrame(columns)
         
         if not df.empty and metric in df.columns:
             df = df.sort_values(metric, ascending=False)
@@ -423,7 +820,7 @@ class ModelRegistry:
         self,
         ticker: str,
         model_type: Optional[str] = None
-    ) -> pd.DataFrame:
+    ) -> 'pd.DataFrame':
         """
         Get training history for a ticker.
         
@@ -434,29 +831,27 @@ class ModelRegistry:
         Returns:
             DataFrame with model history
         """
-        history = []
+        columns: Dict[str, List[Any]] = {
+            'model_id': [], 'version': [], 'model_type': [], 'trained_at': [],
+            'status': [], 'train_f1': [], 'val_f1': [], 'test_f1': [],
+            'n_train_samples': [], 'n_features': []
+        }
         
-        for model_id, meta in self.models.items():
-            if meta.ticker != ticker:
-                continue
-            
-            if model_type and meta.model_type != model_type:
-                continue
-            
-            history.append({
-                'model_id': model_id,
-                'version': meta.version,
-                'model_type': meta.model_type,
-                'trained_at': meta.trained_at,
-                'status': meta.status,
-                'train_f1': meta.train_metrics.get('f1', None),
-                'val_f1': meta.val_metrics.get('f1', None),
-                'test_f1': meta.test_metrics.get('f1', None),
-                'n_train_samples': meta.n_train_samples,
-                'n_features': meta.n_features
-            })
-        
-        df = pd.DataFrame(history)
+        for model_id in self._lookup(ticker=ticker, model_type=model_type):
+            meta = self.models[model_id]
+            columns['model_id'].append(model_id)
+            columns['version'].append(meta.version)
+            columns['model_type'].append(meta.model_type)
+            columns['trained_at'].append(meta.trained_at)
+            columns['status'].append(meta.status)
+            columns['train_f1'].append(meta.train_metrics.get('f1', None))
+            columns['val_f1'].append(meta.val_metrics.get('f1', None))
+            columns['test_f1'].append(meta.test_metrics.get('f1', None))
+            columns['n_train_samples'].append(meta.n_train_samples)
+            columns['n_features'].append(meta.n_features)
+        
+        import pandas as pd
+        df = pd.DataFrame(columns)
         
         if not df.empty:
             df = df.sort_values('trained_at', ascending=False)
@@ -483,15 +878,21 @@ class ModelRegistry:
         if metadata.status == ModelStatus.PRODUCTION.value:
             raise ValueError("Cannot delete production model. Demote first.")
         
-        # Delete model directory
+        # Move the model directory aside (a cheap rename) and remove it in
+        # the background, so large artifact trees don't stall the caller
         model_dir = self.registry_dir / model_id
         if model_dir.exists():
-            shutil.rmtree(model_dir)
+            trash = self.trash_dir / f"{model_id}-{uuid.uuid4().hex}"
+            self.trash_dir.mkdir(exist_ok=True)
+            model_dir.rename(trash)
+            _DELETE_EXECUTOR.submit(shutil.rmtree, trash, ignore_errors=True)
         
         # Remove from registry
         del self.models[model_id]
+        self._unindex_model(model_id)
+        self._evict_model(model_id)
         
-        self._save_registry()
+        self._append_wal("delete", model_id=model_id)
         
         logger.info(f"Deleted model: {model_id}")
     
@@ -516,14 +917,15 @@ class ModelRegistry:
         for key, value in updates.items():
             if hasattr(metadata, key):
                 setattr(metadata, key, value)
+        self._index_model(metadata)
+        self._evict_model(model_id)
         
         # Save updated metadata
         model_dir = self.registry_dir / model_id
         metadata_path = model_dir / "metadata.json"
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata.to_dict(), f, indent=2, default=str)
+        metadata_path.write_bytes(_json_dumps(metadata.to_dict()))
         
-        self._save_registry()
+        self._append_wal("upsert", metadata)
         
         logger.info(f"Updated metadata for model: {model_id}")
     
@@ -544,72 +946,186 @@ class ModelRegistry:
         Returns:
             List of model IDs
         """
-        models = []
+        return self._lookup(ticker=ticker, status=status, model_type=model_type)
+    
+    def _index_model(self, metadata: ModelMetadata) -> None:
+        """Add a model to the secondary indexes, moving it if its keys changed."""
+        model_id = metadata.model_id
+        keys = (metadata.ticker, metadata.status, metadata.model_type)
+        old_keys = self._index_keys.get(model_id)
+        if old_keys == keys:
+            return
         
-        for model_id, meta in self.models.items():
-            if ticker and meta.ticker != ticker:
-                continue
-            if status and meta.status != status:
-                continue
-            if model_type and meta.model_type != model_type:
-                continue
-            
-            models.append(model_id)
+        if old_keys is None:
+            self._index_positions[model_id] = self._next_position
+            self._next_position += 1
+        else:
+            self._remove_from_indexes(model_id, old_keys)
+        ticker, status, model_type = keys
+        self._by_ticker.setdefault(ticker, {})[model_id] = None
+        self._by_status.setdefault(status, {})[model_id] = None
+        self._by_model_type.setdefault(model_type, {})[model_id] = None
+        self._by_ticker_type.setdefault((ticker, model_type), {})[model_id] = None
+        self._index_keys[model_id] = keys
+    
+    def _unindex_model(self, model_id: str) -> None:
+        """Remove a model from the secondary indexes."""
+        keys = self._index_keys.pop(model_id, None)
+        if keys is None:
+            return
         
-        return models
+        del self._index_positions[model_id]
+        self._remove_from_indexes(model_id, keys)
+    
+    def _remove_from_indexes(self, model_id: str, keys: Tuple[str, str, str]) -> None:
+        """Remove a model from the index entries for ``keys``."""
+        ticker, status, model_type = keys
+        for index, key in (
+            (self._by_ticker, ticker),
+            (self._by_status, status),
+            (self._by_model_type, model_type),
+            (self._by_ticker_type, (ticker, model_type)),
+        ):
+            ids = index[key]
+            del ids[model_id]
+            if not ids:
+                del index[key]
+    
+    def _lookup(
+        self,
+        ticker: Optional[str] = None,
+        status: Optional[str] = None,
+        model_type: Optional[str] = None
+    ) -> List[str]:
+        """
+        Model IDs matching every given filter, via the secondary indexes.
+        
+        Walks the smallest matching index and checks membership in the rest,
+        so the cost is proportional to that index rather than the registry.
+        IDs are returned in registration order, as a scan of self.models would.
+        """
+        indexes = []
+        if ticker and model_type:
+            indexes.append(self._by_ticker_type.get((ticker, model_type), {}))
+        elif ticker:
+            indexes.append(self._by_ticker.get(ticker, {}))
+        elif model_type:
+            indexes.append(self._by_model_type.get(model_type, {}))
+        if status:
+            indexes.append(self._by_status.get(status, {}))
+        
+        if not indexes:
+            return list(self.models)
+        
+        smallest = min(indexes, key=len)
+        matches = [
+            model_id for model_id in smallest
+            if all(model_id in index for index in indexes if index is not smallest)
+        ]
+        matches.sort(key=self._index_positions.__getitem__)
+        return matches
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get registry statistics."""
+        by_status: Counter = Counter()
+        by_model_type: Counter = Counter()
+        by_ticker: Counter = Counter()
+        
+        # One pass feeding all three counters
+        for meta in self.models.values():
+            by_status[meta.status] += 1
+            by_model_type[meta.model_type] += 1
+            by_ticker[meta.ticker] += 1
+        
         stats = {
             'total_models': len(self.models),
-            'by_status': {},
-            'by_model_type': {},
-            'by_ticker': {},
-            'production_models': 0
+            'by_status': dict(by_status),
+            'by_model_type': dict(by_model_type),
+            'by_ticker': dict(by_ticker),
+            'production_models': by_status[ModelStatus.PRODUCTION.value]
         }
         
-        for meta in self.models.values():
-            # Count by status
-            stats['by_status'][meta.status] = stats['by_status'].get(meta.status, 0) + 1
-            
-            # Count by model type
-            stats['by_model_type'][meta.model_type] = stats['by_model_type'].get(meta.model_type, 0) + 1
-            
-            # Count by ticker
-            stats['by_ticker'][meta.ticker] = stats['by_ticker'].get(meta.ticker, 0) + 1
-            
-            # Count production
-            if meta.status == ModelStatus.PRODUCTION.value:
-                stats['production_models'] += 1
-        
         return stats
     
     def _load_registry(self) -> Dict[str, ModelMetadata]:
-        """Load registry from disk."""
-        if not self.metadata_file.exists():
-            return {}
-        
-        with open(self.metadata_file, 'r') as f:
-            data = json.load(f)
+        """Load the registry snapshot from disk and replay the WAL over it."""
+        models: Dict[str, ModelMetadata] = {}
+        if self.metadata_file.exists():
+            data = _json_loads(self.metadata_file.read_bytes())
+            models = {
+                model_id: ModelMetadata.from_dict(meta_dict)
+                for model_id, meta_dict in data.items()
+            }
         
-        models = {
-            model_id: ModelMetadata.from_dict(meta_dict)
-            for model_id, meta_dict in data.items()
-        }
+        if self.wal_file.exists():
+            for line in self.wal_file.read_bytes().splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    event = _json_loads(line)
+                except ValueError:
+                    # A crash mid-append leaves at most one torn line
+                    logger.warning(f"Skipping unreadable WAL entry in {self.wal_file}")
+                    continue
+                self._wal_events += 1
+                if event['op'] == 'delete':
+                    models.pop(event['model_id'], None)
+                else:
+                    models[event['model_id']] = ModelMetadata.from_dict(event['meta'])
         
         logger.info(f"Loaded {len(models)} models from registry")
         
         return models
     
+    def _append_wal(
+        self,
+        op: str,
+        metadata: Optional[ModelMetadata] = None,
+        model_id: Optional[str] = None
+    ) -> None:
+        """
+        Record one registry change in the WAL.
+        
+        Appends are O(1) regardless of registry size; once
+        _WAL_COMPACT_EVENTS have accumulated the log is folded into a fresh
+        registry.json snapshot.
+        
+        Args:
+            op: 'upsert' or 'delete'
+            metadata: Model metadata for upserts
+            model_id: Model ID for deletes (taken from metadata otherwise)
+        """
+        event: Dict[str, Any] = {'op': op, 'model_id': model_id or metadata.model_id}
+        if metadata is not None:
+            event['meta'] = metadata.to_dict()
+        
+        with open(self.wal_file, 'ab') as f:
+            f.write(_json_dumps(event, indent=False) + b"\n")
+        self._wal_events += 1
+        
+        if self._wal_events >= _WAL_COMPACT_EVENTS:
+            self._save_registry()
+    
     def _save_registry(self) -> None:
-        """Save registry to disk."""
+        """Write a full registry snapshot to disk and truncate the WAL."""
         data = {
             model_id: meta.to_dict()
             for model_id, meta in self.models.items()
         }
         
-        with open(self.metadata_file, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        # Write beside the snapshot and swap it in, so a crash mid-write
+        # leaves the previous registry.json intact
+        tmp_path = self.metadata_file.with_suffix('.json.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(_json_dumps(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.metadata_file)
+        
+        # Replaying events already in the snapshot is harmless, so a crash
+        # before this truncate loses nothing
+        self.wal_file.write_bytes(b"")
+        self._wal_events = 0
     
     def export_registry(self, export_path: str) -> None:
         """
@@ -618,16 +1134,17 @@ class ModelRegistry:
         Args:
             export_path: Path to export file
         """
-        data = {
-            'exported_at': datetime.now().isoformat(),
-            'registry': {
-                model_id: meta.to_dict()
-                for model_id, meta in self.models.items()
-            }
-        }
-        
-        with open(export_path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        # Streamed one model at a time so memory stays flat however large
+        # the registry is; the file is the same JSON document as before
+        with open(export_path, 'wb') as f:
+            f.write(b'{"exported_at": ' + _json_dumps(datetime.now().isoformat(), indent=False))
+            f.write(b', "registry": {')
+            for i, (model_id, meta) in enumerate(self.models.items()):
+                if i:
+                    f.write(b',')
+                f.write(b'\n  ' + _json_dumps(model_id, indent=False) + b': ')
+                f.write(_json_dumps(meta.to_dict(), indent=False))
+            f.write(b'\n}}\n')
         
         logger.info(f"Registry exported to {export_path}")
 
@@ -8,18 +8,126 @@ Implements XGBoost, LightGBM, and Ensemble models for binary classification:
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+import copy
+import json
+import logging
+import os
+import tempfile
+import warnings
+import weakref
 import xgboost as xgb
 import lightgbm as lgb
+from joblib import Parallel, delayed
 from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
 from sklearn.preprocessing import StandardScaler
 import pickle
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+# cuML's Forest Inference Library serves trained boosters on the GPU
+try:
+    from cuml import ForestInference
+    CUML_AVAILABLE = True
+except ImportError:
+    CUML_AVAILABLE = False
+
+
+@lru_cache(maxsize=None)
+def _xgboost_cuda_available() -> bool:
+    """
+    Whether XGBoost can build trees on a CUDA GPU here.
+    
+    Probed once per process with a one-tree fit on a tiny dummy set. XGBoost
+    silently falls back to the CPU when no GPU is visible, so the booster
+    config is checked for the device it actually used.
+    """
+    X = np.random.default_rng(0).random((32, 2))
+    y = np.arange(32) % 2
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            model = xgb.XGBClassifier(n_estimators=1, tree_method='hist', device='cuda')
+            model.fit(X, y)
+        config = json.loads(model.get_booster().save_config())
+        return config['learner']['generic_param']['device'].startswith('cuda')
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=None)
+def _lightgbm_cuda_available() -> bool:
+    """
+    Whether this LightGBM build can train on a CUDA GPU here.
+    
+    Probed once per process with a one-round fit on a tiny dummy set; CPU-only
+    builds and machines without a GPU raise LightGBMError.
+    """
+    X = np.random.default_rng(0).random((32, 2))
+    y = np.arange(32) % 2
+    try:
+        lgb.train(
+            {'objective': 'binary', 'device_type': 'cuda', 'min_data_in_leaf': 1, 'verbose': -1},
+            lgb.Dataset(X, y),
+            num_boost_round=1
+        )
+        return True
+    except Exception:
+        return False
+
+
+def _forest_inference(save_booster: Callable[[Path], None], filename: str, model_type: str):
+    """
+    Load a booster into cuML's Forest Inference Library.
+    
+    Args:
+        save_booster: Writes the booster to the path it is given
+        filename: File name for the saved booster (its suffix matters to FIL)
+        model_type: FIL model type, e.g. 'xgboost_ubj' or 'lightgbm'
+        
+    Returns:
+        A FIL classifier, or None when cuML or a GPU is unavailable
+    """
+    if not CUML_AVAILABLE:
+        return None
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / filename
+            save_booster(path)
+            return ForestInference.load(str(path), is_classifier=True, model_type=model_type)
+    except Exception as e:
+        logger.warning(f"Forest Inference unavailable, predicting on CPU: {e}")
+        return None
+
+
+def _as_array(X):
+    """Feature values as a NumPy array, skipping XGBoost's DataFrame conversion."""
+    return X.to_numpy() if isinstance(X, pd.DataFrame) else X
+
+
+def _as_float32(X):
+    """
+    Features in single precision, the width the boosters bin and score in.
+    
+    A no-op for frames already in float32, as FeatureConfig produces by
+    default, so callers that cast once upstream pay no copy here.
+    """
+    if isinstance(X, pd.DataFrame):
+        return X.astype(np.float32, copy=False)
+    return np.asarray(X, dtype=np.float32)
+
 
 class BaseModel:
     """Base class for ML models."""
     
+    # GPU (FIL) copy of the trained booster, when built; see _build_fil
+    _fil = None
+    _fil_batch_size = None
+    
     def __init__(self, model_name: str):
         self.model_name = model_name
         self.model = None
@@ -44,7 +152,7 @@ class BaseModel:
         Path(path).parent.mkdir(parents=True, exist_ok=True)
         with open(path, 'wb') as f:
             pickle.dump({
-                'model': self.model,
+                **self._dump_estimator(path),
                 'scaler': self.scaler,
                 'feature_names': self.feature_names,
                 'model_name': self.model_name
@@ -54,11 +162,49 @@ class BaseModel:
         """Load model from disk."""
         with open(path, 'rb') as f:
             data = pickle.load(f)
-            self.model = data['model']
+            self.model = self._load_estimator(data, path)
             self.scaler = data['scaler']
             self.feature_names = data['feature_names']
             self.model_name = data['model_name']
             self.is_trained = True
+        self._attach_fil()
+    
+    def __getstate__(self) -> Dict:
+        """Pickle without the GPU inference copy; it is rebuilt on load."""
+        state = self.__dict__.copy()
+        state.pop('_fil', None)
+        state.pop('_fil_batch_size', None)
+        return state
+    
+    def __setstate__(self, state: Dict) -> None:
+        """Restore a pickled model, rebuilding the FIL copy if it is trained."""
+        self.__dict__.update(state)
+        if self.is_trained:
+            self._attach_fil()
+    
+    def _attach_fil(self) -> None:
+        """(Re)build the FIL copy after the model is trained or loaded."""
+        self._fil = self._build_fil()
+        self._fil_batch_size = None
+    
+    def _build_fil(self):
+        """FIL copy of the trained model for GPU inference; None by default."""
+        return None
+    
+    def _fil_predict_proba(self, X) -> np.ndarray:
+        """Class probabilities from the FIL copy, tuned once for the batch size."""
+        if self._fil_batch_size is None:
+            self._fil.optimize(batch_size=len(X))
+            self._fil_batch_size = len(X)
+        return np.asarray(self._fil.predict_proba(_as_array(X)))
+    
+    def _dump_estimator(self, path: str) -> Dict:
+        """Entries that persist ``self.model`` in the file saved at ``path``."""
+        return {'model': self.model}
+    
+    def _load_estimator(self, data: Dict, path: str):
+        """Rebuild the estimator from the entries written by _dump_estimator."""
+        return data['model']
 
 
 class XGBoostModel(BaseModel):
@@ -71,9 +217,13 @@ class XGBoostModel(BaseModel):
         learning_rate: float = 0.05,
         subsample: float = 0.8,
         colsample_bytree: float = 0.8,
+        use_fil: bool = True,
         **kwargs
     ):
         super().__init__('XGBoost')
+        # Predict through cuML's Forest Inference Library when it is
+        # installed and a GPU is usable; otherwise on the CPU
+        self.use_fil = use_fil
         
         self.params = {
             'objective': 'binary:logistic',
@@ -85,6 +235,9 @@ class XGBoostModel(BaseModel):
             'colsample_bytree': colsample_bytree,
             'random_state': 42,
             'n_jobs': -1,
+            # Histogram tree building, on the GPU when one is usable
+            'tree_method': 'hist',
+            'device': 'cuda' if _xgboost_cuda_available() else 'cpu',
             **kwargs
         }
     
@@ -100,7 +253,7 @@ class XGBoostModel(BaseModel):
         Train XGBoost model.
         
         Args:
-            X: Feature DataFrame
+            X: Feature DataFrame (cast to float32; pass float32 to skip the copy)
             y: Target series
             eval_set: Optional validation set for early stopping
             early_stopping_rounds: Rounds without improvement before stopping
@@ -110,17 +263,20 @@ class XGBoostModel(BaseModel):
             Self (trained model)
         """
         self.feature_names = X.columns.tolist()
+        X = _as_float32(X)
         
         # Initialize model
         self.model = xgb.XGBClassifier(**self.params)
         
         # Fit model (simplified - no early stopping in this version)
         if eval_set:
-            self.model.fit(X, y, eval_set=eval_set, verbose=verbose)
+            eval_set = [(_as_array(_as_float32(X_val)), y_val) for X_val, y_val in eval_set]
+            self.model.fit(_as_array(X), y, eval_set=eval_set, verbose=verbose)
         else:
-            self.model.fit(X, y, verbose=verbose)
+            self.model.fit(_as_array(X), y, verbose=verbose)
         
         self.is_trained = True
+        self._attach_fil()
         return self
     
     def predict(self, X: pd.DataFrame) -> np.ndarray:
@@ -128,14 +284,38 @@ class XGBoostModel(BaseModel):
         if not self.is_trained:
             raise ValueError("Model not trained. Call fit() first.")
         
-        return self.model.predict(X)
+        if self._fil is not None:
+            return self.model.classes_[np.argmax(self._fil_predict_proba(X), axis=1)]
+        return self.model.predict(_as_array(X))
     
     def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
         """Predict class probabilities."""
         if not self.is_trained:
             raise ValueError("Model not trained. Call fit() first.")
         
-        return self.model.predict_proba(X)
+        if self._fil is not None:
+            return self._fil_predict_proba(X)
+        return self.model.predict_proba(_as_array(X))
+    
+    def _build_fil(self):
+        """FIL copy of the booster, via XGBoost's UBJSON format."""
+        if not getattr(self, 'use_fil', True):
+            return None
+        return _forest_inference(self.model.save_model, 'model.ubj', 'xgboost_ubj')
+    
+    def _dump_estimator(self, path: str) -> Dict:
+        """Write the booster in XGBoost's native UBJSON format beside ``path``."""
+        booster_path = Path(f"{path}.ubj")
+        self.model.save_model(booster_path)
+        return {'booster_file': booster_path.name}
+    
+    def _load_estimator(self, data: Dict, path: str):
+        """Load the native booster, or a pickled estimator from older saves."""
+        if 'booster_file' not in data:
+            return super()._load_estimator(data, path)
+        model = xgb.XGBClassifier(**self.params)
+        model.load_model(Path(path).parent / data['booster_file'])
+        return model
     
     def get_feature_importance(self) -> pd.DataFrame:
         """Get feature importance scores."""
@@ -160,9 +340,13 @@ class LightGBMModel(BaseModel):
         learning_rate: float = 0.05,
         feature_fraction: float = 0.8,
         bagging_fraction: float = 0.8,
+        use_fil: bool = True,
         **kwargs
     ):
         super().__init__('LightGBM')
+        # Predict through cuML's Forest Inference Library when it is
+        # installed and a GPU is usable; otherwise on the CPU
+        self.use_fil = use_fil
         
         self.params = {
             'objective': 'binary',
@@ -176,8 +360,25 @@ class LightGBMModel(BaseModel):
             'random_state': 42,
             'n_jobs': -1,
             'verbose': -1,
+            # CUDA histograms in single precision with 63 bins, when usable
+            **({'device_type': 'cuda', 'gpu_use_dp': False, 'max_bin': 63}
+               if _lightgbm_cuda_available() else {}),
             **kwargs
         }
+        
+        # The CUDA tree learner grows leaf-wise without honouring max_depth,
+        # so bound the tree size through num_leaves instead
+        max_depth = self.params.get('max_depth')
+        if (
+            self.params.get('device_type') == 'cuda'
+            and max_depth is not None and max_depth > 0
+            and self.params['num_leaves'] > 2 ** max_depth
+        ):
+            warnings.warn(
+                f"max_depth={max_depth} is not enforced by LightGBM's CUDA learner; "
+                f"limiting num_leaves to {2 ** max_depth}"
+            )
+            self.params['num_leaves'] = 2 ** max_depth
     
     def fit(
         self,
@@ -191,7 +392,7 @@ class LightGBMModel(BaseModel):
         Train LightGBM model.
         
         Args:
-            X: Feature DataFrame
+            X: Feature DataFrame (cast to float32; pass float32 to skip the copy)
             y: Target series
             eval_set: Optional validation set for early stopping
             early_stopping_rounds: Rounds without improvement before stopping
@@ -201,6 +402,7 @@ class LightGBMModel(BaseModel):
             Self (trained model)
         """
         self.feature_names = X.columns.tolist()
+        X = _as_float32(X)
         
         # Initialize model
         self.model = lgb.LGBMClassifier(**self.params)
@@ -209,21 +411,22 @@ class LightGBMModel(BaseModel):
         eval_set_scaled = None
         if eval_set:
             eval_set_scaled = [
-                (X_val, y_val)
+                (_as_float32(X_val), y_val)
                 for X_val, y_val in eval_set
             ]
         
         # Fit model
+        callbacks = [lgb.log_evaluation(period=100 if verbose else 0)]
+        if eval_set:
+            callbacks.insert(0, lgb.early_stopping(early_stopping_rounds))
         self.model.fit(
             X, y,
             eval_set=eval_set_scaled,
-            callbacks=[
-                lgb.early_stopping(early_stopping_rounds) if eval_set else None,
-                lgb.log_evaluation(period=100 if verbose else 0)
-            ]
+            callbacks=callbacks
         )
         
         self.is_trained = True
+        self._attach_fil()
         return self
     
     def predict(self, X: pd.DataFrame) -> np.ndarray:
@@ -231,14 +434,45 @@ class LightGBMModel(BaseModel):
         if not self.is_trained:
             raise ValueError("Model not trained. Call fit() first.")
         
-        return self.model.predict(X)
+        if self._fil is not None:
+            return self.model.classes_[np.argmax(self._fil_predict_proba(X), axis=1)]
+        return self.model.predict(_as_float32(X))
     
     def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
         """Predict class probabilities."""
         if not self.is_trained:
             raise ValueError("Model not trained. Call fit() first.")
         
-        return self.model.predict_proba(X)
+        if self._fil is not None:
+            return self._fil_predict_proba(X)
+        return self.model.predict_proba(_as_float32(X))
+    
+    def _build_fil(self):
+        """FIL copy of the booster, via LightGBM's text format."""
+        if not getattr(self, 'use_fil', True):
+            return None
+        return _forest_inference(self.model.booster_.save_model, 'model.txt', 'lightgbm')
+    
+    def _dump_estimator(self, path: str) -> Dict:
+        """
+        Write the booster in LightGBM's native text format beside ``path``.
+        
+        The sklearn wrapper is kept, without its booster, for the class
+        labels and fitted attributes; load reattaches the native booster.
+        """
+        booster_path = Path(f"{path}.txt")
+        self.model.booster_.save_model(booster_path)
+        estimator = copy.copy(self.model)
+        estimator._Booster = None
+        return {'booster_file': booster_path.name, 'estimator': estimator}
+    
+    def _load_estimator(self, data: Dict, path: str):
+        """Load the native booster, or a pickled estimator from older saves."""
+        if 'booster_file' not in data:
+            return super()._load_estimator(data, path)
+        model = data['estimator']
+        model._Booster = lgb.Booster(model_file=Path(path).parent / data['booster_file'])
+        return model
     
     def get_feature_importance(self) -> pd.DataFrame:
         """Get feature importance scores."""
@@ -262,9 +496,12 @@ class EnsembleModel(BaseModel):
     
     def __init__(
         self,
-        base_models: Optional[List[BaseModel]] = None
+        base_models: Optional[List[BaseModel]] = None,
+        cv_folds: int = 5
     ):
         super().__init__('Ensemble')
+        # Folds for the out-of-fold predictions the meta-learner trains on
+        self.cv_folds = cv_folds
         
         if base_models:
             self.base_models = base_models
@@ -280,6 +517,24 @@ class EnsembleModel(BaseModel):
             random_state=42,
             max_iter=1000
         )
+        
+        # Recent meta-features by input, so predict and predict_proba on
+        # the same X score the base models once
+        self._meta_cache: "OrderedDict[tuple, Tuple[weakref.ref, np.ndarray]]" = OrderedDict()
+    
+    # Inputs whose meta-features are kept
+    _META_CACHE_SIZE = 4
+    
+    def __getstate__(self) -> Dict:
+        """Pickle without cached meta-features."""
+        state = super().__getstate__()
+        state.pop('_meta_cache', None)
+        return state
+    
+    def __setstate__(self, state: Dict) -> None:
+        """Restore a pickled ensemble with an empty meta-feature cache."""
+        super().__setstate__(state)
+        self._meta_cache = OrderedDict()
     
     def fit(
         self,
@@ -292,12 +547,14 @@ class EnsembleModel(BaseModel):
         Train ensemble model.
         
         Steps:
-        1. Train each base model
-        2. Generate meta-features (base model predictions)
+        1. Train the base models on all of X and, for out-of-fold
+           predictions, on each of ``cv_folds`` stratified folds, in parallel
+        2. Collect the fold models' predictions on their held-out rows as
+           meta-features, so the meta-learner never sees in-sample scores
         3. Train meta-learner on meta-features
         
         Args:
-            X: Feature DataFrame
+            X: Feature DataFrame (cast to float32; pass float32 to skip the copy)
             y: Target series
             eval_set: Optional validation set
             verbose: Print training progress
@@ -306,16 +563,57 @@ class EnsembleModel(BaseModel):
             Self (trained model)
         """
         self.feature_names = X.columns.tolist()
-        
-        # Step 1: Train base models
+        # Cast once so the base models and their fold copies share one
+        # single-precision matrix
+        X = _as_float32(X)
+        folds = self._folds(y)
+        
+        # Step 1: Train base models and their fold copies, concurrently on
+        # threads (the boosters release the GIL) with the CPU cores split
+        # between the base models
         print(f"\n🔨 Training {len(self.base_models)} base models...")
+        threads = max(1, (os.cpu_count() or 1) // len(self.base_models))
+        jobs = []
+        fold_models = []
+        shared = []
         for i, model in enumerate(self.base_models, 1):
             print(f"  [{i}/{len(self.base_models)}] Training {model.model_name}...")
-            model.fit(X, y, eval_set=eval_set, verbose=verbose)
-        
-        # Step 2: Generate meta-features
+            params = getattr(model, 'params', None)
+            if params is not None and params.get('n_jobs', -1) in (-1, None):
+                shared.append((model, params.get('n_jobs', -1)))
+                params['n_jobs'] = threads
+            
+            # Fold copies are scored once on the CPU, so skip their FIL copy
+            copies = []
+            for train_idx, _ in folds:
+                fold_model = copy.deepcopy(model)
+                fold_model.use_fil = False
+                copies.append(fold_model)
+                jobs.append(delayed(fold_model.fit)(
+                    X.iloc[train_idx], y.iloc[train_idx], eval_set=eval_set, verbose=verbose
+                ))
+            fold_models.append(copies)
+            jobs.append(delayed(model.fit)(X, y, eval_set=eval_set, verbose=verbose))
+        try:
+            Parallel(n_jobs=len(self.base_models), backend='threading')(jobs)
+        finally:
+            # The core share is for this concurrent fit only; give the caller's
+            # models, and the estimators they now hold, their own setting back
+            for model, n_jobs in shared:
+                model.params['n_jobs'] = n_jobs
+                if model.model is not None:
+                    model.model.set_params(n_jobs=n_jobs)
+        
+        # Step 2: Generate meta-features from out-of-fold predictions
         print(f"\n🔀 Generating meta-features...")
-        meta_features = self._generate_meta_features(X)
+        self._meta_cache.clear()
+        if folds:
+            meta_features = np.empty((len(X), 2 * len(self.base_models)), dtype=np.float32)
+            for i, copies in enumerate(fold_models):
+                for fold_model, (_, test_idx) in zip(copies, folds):
+                    meta_features[test_idx, 2 * i:2 * i + 2] = fold_model.predict_proba(X.iloc[test_idx])
+        else:
+            meta_features = self._generate_meta_features(X)
         
         # Step 3: Train meta-learner
         print(f"\n🎯 Training meta-learner...")
@@ -326,6 +624,22 @@ class EnsembleModel(BaseModel):
         
         return self
     
+    def _folds(self, y: pd.Series) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Stratified (train, held-out) row indices for out-of-fold meta-features.
+        
+        Uses fewer folds when a class has fewer than ``cv_folds`` rows; returns
+        no folds, with a warning, when a class has fewer than two.
+        """
+        n_splits = min(self.cv_folds, int(np.bincount(pd.factorize(np.asarray(y))[0]).min()))
+        if n_splits < 2:
+            warnings.warn(
+                "Too few rows per class for out-of-fold predictions; "
+                "training the meta-learner on in-sample predictions"
+            )
+            return []
+        return list(StratifiedKFold(n_splits=n_splits).split(np.zeros(len(y)), y))
+    
     def _generate_meta_features(self, X: pd.DataFrame) -> np.ndarray:
         """
         Generate meta-features from base model predictions.
@@ -334,18 +648,15 @@ class EnsembleModel(BaseModel):
             X: Feature DataFrame
             
         Returns:
-            Array of shape (n_samples, n_base_models * 2)
+            float32 array of shape (n_samples, n_base_models * 2)
             For each base model: [prob_class_0, prob_class_1]
         """
-        meta_features_list = []
-        
-        for model in self.base_models:
-            # Get probability predictions from each base model
-            proba = model.predict_proba(X)
-            meta_features_list.append(proba)
+        # Write each base model's probabilities straight into their columns,
+        # in single precision, which the meta-learner fits and scores as is
+        meta_features = np.empty((len(X), 2 * len(self.base_models)), dtype=np.float32)
         
-        # Concatenate all base model predictions
-        meta_features = np.hstack(meta_features_list)
+        for i, model in enumerate(self.base_models):
+            meta_features[:, 2 * i:2 * i + 2] = model.predict_proba(X)
         
         return meta_features
     
@@ -354,7 +665,7 @@ class EnsembleModel(BaseModel):
         if not self.is_trained:
             raise ValueError("Model not trained. Call fit() first.")
         
-        meta_features = self._generate_meta_features(X)
+        meta_features = self._cached_meta_features(X)
         return self.meta_learner.predict(meta_features)
     
     def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
@@ -362,9 +673,52 @@ class EnsembleModel(BaseModel):
         if not self.is_trained:
             raise ValueError("Model not trained. Call fit() first.")
         
-        meta_features = self._generate_meta_features(X)
+        meta_features = self._cached_meta_features(X)
         return self.meta_learner.predict_proba(meta_features)
     
+    def predict_with_proba(self, X: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict class labels and probabilities from one pass over the base models.
+        
+        Args:
+            X: Feature DataFrame
+            
+        Returns:
+            Tuple of (labels, probabilities)
+        """
+        proba = self.predict_proba(X)
+        return self.meta_learner.classes_[np.argmax(proba, axis=1)], proba
+    
+    def _cached_meta_features(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Meta-features for X, reused when the same input was scored recently.
+        
+        Inputs are recognised by identity (checked through a weak reference,
+        so a recycled id() never matches), shape and the bytes of their first
+        and last rows. Edits to other rows of the same object are not detected.
+        """
+        try:
+            ref = weakref.ref(X)
+        except TypeError:
+            return self._generate_meta_features(X)
+        if len(X) == 0:
+            return self._generate_meta_features(X)
+        
+        edges = X.iloc[[0, -1]] if isinstance(X, pd.DataFrame) else np.asarray(X)[[0, -1]]
+        key = (id(X), X.shape, np.ascontiguousarray(edges, dtype=np.float64).tobytes())
+        
+        cached = self._meta_cache.get(key)
+        if cached is not None and cached[0]() is X:
+            self._meta_cache.move_to_end(key)
+            return cached[1]
+        
+        meta_features = self._generate_meta_features(X)
+        self._meta_cache[key] = (ref, meta_features)
+        self._meta_cache.move_to_end(key)
+        while len(self._meta_cache) > self._META_CACHE_SIZE:
+            self._meta_cache.popitem(last=False)
+        return meta_features
+    
     def get_base_model_predictions(self, X: pd.DataFrame) -> Dict[str, np.ndarray]:
         """
         Get predictions from each base model.
@@ -460,4 +814,5 @@ class EnsembleModel(BaseModel):
                 model.load(base_path)
                 self.base_models.append(model)
             
+            self._meta_cache.clear()
             self.is_trained = True
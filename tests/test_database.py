@@ -6,6 +6,7 @@ query execution, and backend-specific functionality.
 """
 
 import pytest
+import numpy as np
 import pandas as pd
 from datetime import date, datetime
 from unittest.mock import patch, MagicMock
@@ -179,6 +180,138 @@ class TestQueryExecution:
         result = db.query("SELECT * FROM test_insert_df ORDER BY id")
         assert len(result) == 3
         assert list(result['id']) == [1, 2, 3]
+    
+    def test_insert_dfs_is_atomic(self, reset_db_singleton, mock_duckdb_env):
+        """Test that insert_dfs rolls back every table when one insert fails."""
+        from modules.database.factory import get_db_connection
+        
+        db = get_db_connection()
+        
+        db.execute("CREATE TABLE IF NOT EXISTS test_atomic_a (id INTEGER PRIMARY KEY)")
+        db.execute("CREATE TABLE IF NOT EXISTS test_atomic_b (id INTEGER PRIMARY KEY)")
+        
+        good = pd.DataFrame({'id': [1, 2]})
+        duplicate = pd.DataFrame({'id': [1, 1]})
+        
+        with pytest.raises(Exception):
+            db.insert_dfs([(good, 'test_atomic_a', None), (duplicate, 'test_atomic_b', None)])
+        
+        assert db.get_row_count('test_atomic_a') == 0
+        assert db.get_row_count('test_atomic_b') == 0
+        
+        db.insert_dfs([(good, 'test_atomic_a', ['id']), (good, 'test_atomic_b', ['id'])])
+        
+        assert db.get_row_count('test_atomic_a') == 2
+        assert db.get_row_count('test_atomic_b') == 2
+    
+    def test_execute_many_is_atomic(self, reset_db_singleton, mock_duckdb_env):
+        """Test that execute_many writes every row or, on failure, none."""
+        from modules.database.factory import get_db_connection
+        
+        db = get_db_connection()
+        db.execute("CREATE TABLE IF NOT EXISTS test_execute_many (id INTEGER PRIMARY KEY, name VARCHAR)")
+        
+        with pytest.raises(Exception):
+            db.execute_many("INSERT INTO test_execute_many VALUES (?, ?)", [(1, 'a'), (1, 'b')])
+        assert db.get_row_count('test_execute_many') == 0
+        
+        db.execute_many("INSERT INTO test_execute_many VALUES (?, ?)", [(1, 'a'), (2, 'b')])
+        
+        result = db.query("SELECT * FROM test_execute_many ORDER BY id")
+        assert list(result['name']) == ['a', 'b']
+    
+    def test_copy_rows(self, reset_db_singleton, mock_duckdb_env):
+        """Test that copy_rows bulk-appends rows, keeping None as NULL."""
+        from modules.database.factory import get_db_connection
+        
+        db = get_db_connection()
+        db.execute("CREATE TABLE IF NOT EXISTS test_copy_rows (id INTEGER, name VARCHAR, created TIMESTAMP)")
+        
+        db.copy_rows('test_copy_rows', ['id', 'name', 'created'],
+                     [(1, 'a\tb', '2024-01-02T00:00:00'), (2, None, None)])
+        
+        result = db.query("SELECT * FROM test_copy_rows ORDER BY id")
+        assert list(result['id']) == [1, 2]
+        assert result['name'].iloc[0] == 'a\tb'
+        assert result['name'].isna().iloc[1] and result['created'].isna().iloc[1]
+    
+    def test_postgres_copy_text_escaping(self):
+        """Test COPY text encoding escapes delimiters and marks NULLs."""
+        from modules.database.factory import PostgreSQLBackend
+        
+        assert PostgreSQLBackend._copy_text_value(None) == '\\N'
+        assert PostgreSQLBackend._copy_text_value('a\tb\nc\\d') == 'a\\tb\\nc\\\\d'
+        assert PostgreSQLBackend._copy_text_value(3) == '3'
+    
+    def test_postgres_execute_prepared_prepares_once_per_connection(self):
+        """Test execute_prepared PREPAREs on first use of a connection, then only EXECUTEs."""
+        import weakref
+        from modules.database.factory import PostgreSQLBackend
+        
+        backend = PostgreSQLBackend.__new__(PostgreSQLBackend)
+        backend._pool = MagicMock()
+        backend._prepared = weakref.WeakKeyDictionary()
+        conn = backend._pool.getconn.return_value
+        cursor = conn.cursor.return_value.__enter__.return_value
+        
+        with patch('psycopg2.extras.execute_batch') as execute_batch:
+            backend.execute_prepared('ins', "INSERT INTO t (a, b) VALUES (%s, %s)", [(1, 2)])
+            backend.execute_prepared('ins', "INSERT INTO t (a, b) VALUES (%s, %s)", [(3, 4), (5, 6)])
+        
+        cursor.execute.assert_called_once_with("PREPARE ins AS INSERT INTO t (a, b) VALUES ($1, $2)")
+        assert [c.args[1:] for c in execute_batch.call_args_list] == [
+            ("EXECUTE ins (%s, %s)", [(1, 2)]),
+            ("EXECUTE ins (%s, %s)", [(3, 4), (5, 6)]),
+        ]
+        assert conn.commit.call_count == 2
+    
+    def test_postgres_insert_dfs_single_transaction(self):
+        """Test PostgreSQL insert_dfs writes every table on one connection and commits once."""
+        from modules.database.factory import PostgreSQLBackend
+        
+        backend = PostgreSQLBackend.__new__(PostgreSQLBackend)
+        backend._pool = MagicMock()
+        conn = backend._pool.getconn.return_value
+        weekly = pd.DataFrame({'week': pd.to_datetime(['2024-01-05']), 'fund': ['a'], 'flow': [np.nan]})
+        monthly = pd.DataFrame({'id': np.array([1, 2], dtype=np.int64)})
+        
+        with patch('psycopg2.extras.execute_values') as execute_values:
+            backend.insert_dfs([
+                (weekly, 'weekly', ['week', 'fund']),
+                (pd.DataFrame(), 'skipped', None),
+                (monthly, 'monthly', ['id']),
+            ])
+        
+        backend._pool.getconn.assert_called_once()
+        conn.commit.assert_called_once()
+        (_, weekly_sql, weekly_rows), (_, monthly_sql, monthly_rows) = [
+            c.args for c in execute_values.call_args_list
+        ]
+        assert weekly_sql == (
+            "INSERT INTO weekly (week, fund, flow) VALUES %s "
+            "ON CONFLICT (week, fund) DO UPDATE SET flow = EXCLUDED.flow"
+        )
+        assert weekly_rows == [(pd.Timestamp('2024-01-05'), 'a', None)]
+        assert monthly_sql.endswith("ON CONFLICT (id) DO NOTHING")
+        assert monthly_rows == [(1,), (2,)]
+        assert type(monthly_rows[0][0]) is int
+    
+    def test_postgres_insert_dfs_rolls_back_on_failure(self):
+        """Test a failing table rolls back the tables written before it."""
+        from modules.database.factory import PostgreSQLBackend
+        
+        backend = PostgreSQLBackend.__new__(PostgreSQLBackend)
+        backend._pool = MagicMock()
+        conn = backend._pool.getconn.return_value
+        frame = pd.DataFrame({'id': [1]})
+        
+        with patch('psycopg2.extras.execute_values', side_effect=[None, RuntimeError('boom')]):
+            with pytest.raises(RuntimeError):
+                backend.insert_dfs([(frame, 'a', None), (frame, 'b', None)])
+        
+        conn.commit.assert_not_called()
+        conn.rollback.assert_called_once()
+        backend._pool.putconn.assert_called_once_with(conn)
 
 
 # =============================================================================
@@ -303,6 +436,32 @@ class TestTransactions:
         
         result = db.query("SELECT COUNT(*) as cnt FROM test_tx")
         assert result.iloc[0]['cnt'] == 1
+    
+    def test_duckdb_transactions_isolated_between_threads(self, reset_db_singleton, mock_duckdb_env):
+        """Test concurrent transactional writes from two threads neither fail nor interleave."""
+        import threading
+        from modules.database.factory import get_db_connection
+        
+        db = get_db_connection()
+        db.execute("CREATE TABLE IF NOT EXISTS test_threads (thread VARCHAR, n INTEGER)")
+        errors = []
+        
+        def write(name):
+            try:
+                for n in range(100):
+                    db.execute_many("INSERT INTO test_threads VALUES (?, ?)", [(name, n), (name, -n)])
+            except Exception as e:
+                errors.append(e)
+        
+        worker = threading.Thread(target=write, args=('worker',))
+        worker.start()
+        write('main')
+        worker.join()
+        
+        assert errors == []
+        counts = db.query("SELECT thread, COUNT(*) AS cnt FROM test_threads GROUP BY thread")
+        assert counts.set_index('thread')['cnt'].to_dict() == {'main': 200, 'worker': 200}
+        assert db._backend._cursors and db._backend._cursors[0] is not db._backend._connection
 
 
 # =============================================================================
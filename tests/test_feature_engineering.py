@@ -0,0 +1,342 @@
+"""
+Unit tests for the ML feature engineering module.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from modules.ml.feature_engineering import (
+    NUMBA_AVAILABLE, FeatureConfig, FeatureEngineer, OHLCVArrays
+)
+
+
+@pytest.fixture
+def ohlcv():
+    """Synthetic daily OHLCV history long enough for the 200-day windows."""
+    rng = np.random.default_rng(7)
+    n = 400
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = close * (1 + rng.normal(0, 0.003, n))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, n))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, n))
+    volume = rng.integers(1_000_000, 5_000_000, n).astype(float)
+    return pd.DataFrame(
+        {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume},
+        index=pd.bdate_range('2022-01-03', periods=n)
+    )
+
+
+class TestOHLCVArrays:
+    """Test cases for the structure-of-arrays OHLCV container."""
+    
+    def test_from_frame(self, ohlcv):
+        """Test columns are extracted as float64 arrays with the frame index."""
+        arrays = OHLCVArrays.from_frame(ohlcv.astype({'volume': 'int64'}))
+        
+        assert arrays.volume.dtype == np.float64
+        np.testing.assert_array_equal(arrays.close, ohlcv['close'].to_numpy())
+        assert arrays.index.equals(ohlcv.index)
+
+    def test_shared_intermediates(self, ohlcv):
+        """Test derived series match pandas and are computed only once."""
+        arrays = OHLCVArrays.from_frame(ohlcv)
+
+        np.testing.assert_array_equal(arrays.prev_close, ohlcv['close'].shift(1).to_numpy())
+        np.testing.assert_allclose(arrays.returns, ohlcv['close'].pct_change().to_numpy(),
+                                   rtol=1e-12)
+        np.testing.assert_allclose(
+            arrays.typical_price,
+            ((ohlcv['high'] + ohlcv['low'] + ohlcv['close']) / 3).to_numpy()
+        )
+        assert arrays.prev_close is arrays.prev_close
+        assert arrays.typical_price is arrays.typical_price
+
+
+class TestGenerateAllFeatures:
+    """Test cases for the combined feature frame."""
+    
+    def test_blocks_combined_in_order(self, ohlcv):
+        """Test every block lands once, in order, on the OHLCV index."""
+        engineer = FeatureEngineer()
+        features = engineer.generate_all_features(ohlcv)
+        
+        assert features.index.equals(ohlcv.index)
+        assert features.columns.is_unique
+        assert engineer.feature_names == features.columns.tolist()
+        columns = features.columns.tolist()
+        assert columns[0] == 'return_1d'
+        assert columns.index('vol_momentum_ratio') < columns.index('bullish_regime')
+        assert columns[-1] == 'trending_regime'
+
+    def test_storage_dtype(self, ohlcv):
+        """Test float columns use the configured dtype and flags are int8."""
+        features = FeatureEngineer().generate_all_features(ohlcv)
+        full = FeatureEngineer(FeatureConfig(dtype=np.float64)).generate_all_features(ohlcv)
+        
+        assert features['return_1d'].dtype == np.float32
+        assert features['above_ma20'].dtype == np.int8
+        assert full['return_1d'].dtype == np.float64
+        float_columns = full.select_dtypes('float').columns
+        np.testing.assert_allclose(
+            features[float_columns].to_numpy(np.float64), full[float_columns], rtol=1e-6
+        )
+    
+    def test_feature_groups_recorded_per_block(self, ohlcv):
+        """Test each column is grouped by the block that produced it."""
+        engineer = FeatureEngineer()
+        features = engineer.generate_all_features(
+            ohlcv, alternative_data=pd.DataFrame({'sentiment': 0.0}, index=ohlcv.index)
+        )
+        groups = engineer.get_feature_importance_groups()
+        
+        assert sorted(sum(groups.values(), [])) == sorted(features.columns)
+        assert 'volume_ratio_ma5' in groups['volume']
+        assert 'money_flow_ratio_5d' in groups['volume']
+        assert 'vol_momentum_ratio' in groups['interaction']
+        assert 'is_month_start' in groups['cyclical']
+        assert groups['alternative'] == ['sentiment']
+    
+    def test_unaligned_extra_data_joins_on_index(self, ohlcv):
+        """Test extra data on a different index is outer-joined like pd.concat."""
+        extra = pd.DataFrame({'sentiment': [0.5, -0.25]},
+                             index=[ohlcv.index[10], pd.Timestamp('2030-01-01')])
+        
+        features = FeatureEngineer().generate_all_features(ohlcv, alternative_data=extra)
+        
+        assert len(features) == len(ohlcv) + 1
+        assert features.loc[ohlcv.index[10], 'sentiment'] == 0.5
+        assert features['return_1d'].dtype == np.float32
+    
+    def test_adx_computed_once(self, ohlcv, monkeypatch):
+        """Test the technical and regime blocks share one ADX computation."""
+        calls = []
+        original = FeatureEngineer._calculate_adx
+        
+        def counting_adx(data, period=14):
+            calls.append(period)
+            return original(data, period)
+        
+        monkeypatch.setattr(FeatureEngineer, '_calculate_adx', staticmethod(counting_adx))
+        features = FeatureEngineer().generate_all_features(ohlcv)
+        
+        assert calls == [14]
+        np.testing.assert_array_equal(features['trending_regime'], features['adx'] > 25)
+    
+    def test_threaded_blocks_match_serial(self, ohlcv):
+        """Test running the blocks on a thread pool gives the serial frame."""
+        serial = FeatureEngineer(FeatureConfig(max_workers=1)).generate_all_features(ohlcv)
+        threaded = FeatureEngineer(FeatureConfig(max_workers=4)).generate_all_features(ohlcv)
+        
+        pd.testing.assert_frame_equal(threaded, serial)
+
+
+class TestPriceFeatures:
+    """Test cases for the price-based features."""
+    
+    def test_returns_from_log_prices(self, ohlcv):
+        """Test simple, log and ROC returns match their pandas definitions."""
+        features = FeatureEngineer()._price_features(OHLCVArrays.from_frame(ohlcv))
+        close = ohlcv['close']
+        
+        for lag in [1, 5, 20]:
+            np.testing.assert_allclose(features[f'return_{lag}d'], close.pct_change(lag), rtol=1e-9)
+            np.testing.assert_allclose(
+                features[f'log_return_{lag}d'], np.log(close / close.shift(lag)), rtol=1e-9
+            )
+        np.testing.assert_allclose(
+            features['roc_10d'], (close - close.shift(10)) / close.shift(10) * 100, rtol=1e-9
+        )
+
+
+class TestTimeseriesFeatures:
+    """Test cases for the time-series statistical features."""
+    
+    def test_autocorr_matches_series_autocorr(self, ohlcv):
+        """Test the rolling correlation equals per-window Series.autocorr."""
+        engineer = FeatureEngineer(FeatureConfig(include_autocorr=True))
+        features = engineer._timeseries_features(OHLCVArrays.from_frame(ohlcv))
+        
+        returns = ohlcv['close'].pct_change()
+        for lag in [1, 5, 10]:
+            expected = returns.rolling(60).apply(lambda x: x.autocorr(lag=lag))
+            pd.testing.assert_series_equal(
+                features[f'autocorr_lag{lag}'], expected, check_names=False
+            )
+    
+    def test_hurst_matches_polyfit(self, ohlcv):
+        """Test the compiled Hurst kernel agrees with a polyfit reference."""
+        def reference(x):
+            lags = range(2, min(20, len(x) // 2))
+            tau = [np.std(x[lag:] - x[:-lag]) for lag in lags]
+            return np.polyfit(np.log(lags), np.log(tau), 1)[0]
+        
+        engineer = FeatureEngineer(FeatureConfig(include_hurst=True))
+        features = engineer._timeseries_features(OHLCVArrays.from_frame(ohlcv))
+        
+        returns = ohlcv['close'].pct_change()
+        expected = returns.rolling(60).apply(reference, raw=True)
+        np.testing.assert_allclose(features['hurst_60d'], expected, rtol=1e-9)
+        assert features['hurst_60d'].iloc[60:].notna().all()
+
+    @pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+    def test_skew_kurt_kernel_matches_pandas(self):
+        """Test the running-moments kernel matches rolling skew/kurt, gaps and flats included."""
+        from modules.ml.feature_engineering import _rolling_skew_kurt_kernel
+        
+        rng = np.random.default_rng(3)
+        values = rng.standard_t(4, 500) * 0.01
+        values[100] = np.nan
+        values[200:240] = 0.0
+        series = pd.Series(values)
+        
+        for window in [20, 60]:
+            skew, kurt = _rolling_skew_kurt_kernel(values, window)
+            np.testing.assert_allclose(skew, series.rolling(window).skew(), rtol=1e-8, atol=1e-10)
+            np.testing.assert_allclose(kurt, series.rolling(window).kurt(), rtol=1e-8, atol=1e-10)
+    
+    def test_drawdown_duration_counts_runs(self):
+        """Test the duration resets on each new high and ignores leading NaNs."""
+        prices = np.array([np.nan, 10.0, 9.0, 8.0, 11.0, 10.0, 12.0, 11.0, 10.5, 9.0])
+
+        duration = FeatureEngineer._calculate_drawdown_duration(prices)
+
+        np.testing.assert_array_equal(duration, [0, 0, 1, 2, 0, 1, 0, 1, 2, 3])
+
+
+class TestCyclicalFeatures:
+    """Test cases for the calendar encodings."""
+
+    def test_lookup_matches_trig(self, ohlcv):
+        """Test the table lookups equal sin/cos evaluated per row."""
+        features = FeatureEngineer()._cyclical_features(OHLCVArrays.from_frame(ohlcv))
+
+        index = ohlcv.index
+        for name, values, period in [('dow', index.dayofweek, 7), ('dom', index.day, 31),
+                                     ('month', index.month, 12), ('quarter', index.quarter, 4)]:
+            np.testing.assert_array_equal(features[f'{name}_sin'], np.sin(2 * np.pi * values / period))
+            np.testing.assert_array_equal(features[f'{name}_cos'], np.cos(2 * np.pi * values / period))
+
+
+class TestVolumeFeatures:
+    """Test cases for the volume-based features."""
+
+    def test_obv_and_vpt_match_pandas(self, ohlcv):
+        """Test the running OBV/VPT sums match the pandas formulas, gaps included."""
+        ohlcv = ohlcv.copy()
+        ohlcv.iloc[50, ohlcv.columns.get_loc('close')] = np.nan
+        ohlcv.iloc[80, ohlcv.columns.get_loc('volume')] = np.nan
+        features = FeatureEngineer()._volume_features(OHLCVArrays.from_frame(ohlcv))
+
+        close, volume = ohlcv['close'], ohlcv['volume']
+        obv = (np.sign(close.diff()) * volume).fillna(0).cumsum()
+        vpt = (volume * (close / close.shift(1) - 1)).fillna(0).cumsum()
+        pd.testing.assert_series_equal(features['obv'], obv, check_names=False)
+        np.testing.assert_allclose(features['vpt'], vpt, rtol=1e-12)
+
+
+class TestTechnicalIndicators:
+    """Test cases for the technical indicator helpers."""
+    
+    def test_cci_matches_rolling_apply(self, ohlcv):
+        """Test the strided mean absolute deviation gives the same CCI."""
+        typical_price = (ohlcv['high'] + ohlcv['low'] + ohlcv['close']) / 3
+        sma = typical_price.rolling(20).mean()
+        mad = typical_price.rolling(20).apply(lambda x: np.abs(x - x.mean()).mean())
+        expected = (typical_price - sma) / (0.015 * mad)
+        
+        cci = FeatureEngineer._calculate_cci(OHLCVArrays.from_frame(ohlcv), 20)
+        
+        np.testing.assert_allclose(cci, expected, rtol=1e-9)
+    
+    @pytest.mark.parametrize('use_numba', [
+        pytest.param(True, marks=pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")),
+        False,
+    ])
+    def test_macd_matches_pandas_ewm(self, ohlcv, monkeypatch, use_numba):
+        """Test MACD matches pandas' adjusted EWMs, with NaN gaps in the prices."""
+        monkeypatch.setattr('modules.ml.feature_engineering.NUMBA_AVAILABLE', use_numba)
+        close = ohlcv['close'].copy()
+        close.iloc[[0, 40, 41]] = np.nan
+        
+        macd = FeatureEngineer._calculate_macd(close.to_numpy(), 12, 26, 9)
+        
+        expected_macd = close.ewm(span=12).mean() - close.ewm(span=26).mean()
+        expected_signal = expected_macd.ewm(span=9).mean()
+        np.testing.assert_allclose(macd['macd'], expected_macd, rtol=1e-9)
+        np.testing.assert_allclose(macd['signal'], expected_signal, rtol=1e-9)
+        np.testing.assert_allclose(macd['histogram'], expected_macd - expected_signal, rtol=1e-9)
+    
+    def test_cci_short_history(self, ohlcv):
+        """Test histories shorter than the period yield all-NaN CCI."""
+        cci = FeatureEngineer._calculate_cci(OHLCVArrays.from_frame(ohlcv.iloc[:10]), 20)
+        assert np.isnan(cci).all()
+
+    def test_zero_range_gives_nan(self, ohlcv):
+        """Test flat bars and windows give NaN rather than a near-zero-epsilon ratio."""
+        flat = ohlcv.copy()
+        flat.iloc[:30, :4] = 50.0
+        arrays = OHLCVArrays.from_frame(flat)
+        
+        stoch = FeatureEngineer._calculate_stochastic(arrays, 14, 3)
+        cci = FeatureEngineer._calculate_cci(arrays, 20)
+        close_position = FeatureEngineer()._price_features(arrays)['close_position']
+        
+        assert np.isnan(stoch['k'][13:30]).all()
+        assert np.isnan(cci[19:30]).all()
+        assert close_position.iloc[:30].isna().all()
+        assert close_position.iloc[30:].between(0, 1).all()
+    
+    def test_atr_true_range_matches_frame_max(self, ohlcv):
+        """Test the array true range skips NaN like DataFrame.max(axis=1)."""
+        ohlcv = ohlcv.copy()
+        ohlcv.iloc[30, ohlcv.columns.get_loc('close')] = np.nan
+        high, low, prev_close = ohlcv['high'], ohlcv['low'], ohlcv['close'].shift(1)
+        ranges = pd.concat(
+            [high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1
+        )
+        
+        atr = FeatureEngineer._calculate_atr(OHLCVArrays.from_frame(ohlcv), 1)
+        
+        np.testing.assert_allclose(atr, ranges.max(axis=1), rtol=1e-12)
+        assert not np.isnan(atr).any()
+
+
+class TestFundamentalFeatures:
+    """Test cases for the fundamental data features."""
+    
+    def test_trend_matches_polyfit(self):
+        """Test the closed-form 8-quarter slope equals np.polyfit, NaN windows included."""
+        rng = np.random.default_rng(11)
+        revenue = rng.normal(100, 10, 30).cumsum()
+        revenue[12] = np.nan
+        fundamental = pd.DataFrame(
+            {'ticker': 'SPY', 'revenue': revenue, 'eps': np.linspace(1, 4, 30)},
+            index=pd.date_range('2015-03-31', periods=30, freq='QE')
+        )
+        
+        features = FeatureEngineer()._fundamental_features(fundamental)
+        
+        expected = fundamental['revenue'].rolling(8).apply(
+            lambda x: np.polyfit(range(len(x)), x, 1)[0]
+        )
+        np.testing.assert_allclose(features['revenue_trend_8q'], expected, rtol=1e-9)
+        np.testing.assert_allclose(features['eps_trend_8q'].iloc[7:], 3 / 29)
+        assert 'ticker_trend_8q' not in features.columns
+
+
+class TestRollingHelpers:
+    """Test cases for the array rolling-window helpers."""
+    
+    @pytest.mark.parametrize('name', ['mean', 'std', 'min', 'max'])
+    def test_match_pandas_rolling(self, ohlcv, name):
+        """Test each helper agrees with pandas, including NaN and over-long windows."""
+        from modules.ml import feature_engineering as fe
+        
+        values = ohlcv['close'].to_numpy().copy()
+        values[50] = np.nan
+        helper = getattr(fe, f'_rolling_{name}')
+        
+        for window in [5, 20, 1000]:
+            expected = getattr(pd.Series(values).rolling(window), name)().to_numpy()
+            np.testing.assert_allclose(helper(values, window), expected, rtol=1e-7)
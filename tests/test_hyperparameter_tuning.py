@@ -0,0 +1,648 @@
+"""
+Unit tests for the ML hyperparameter optimization module.
+"""
+
+import json
+from pathlib import Path
+import pytest
+import numpy as np
+import pandas as pd
+
+optuna = pytest.importorskip('optuna')
+
+from modules.ml.hyperparameter_tuning import HyperparameterOptimizer, OptimizationConfig
+
+
+@pytest.fixture
+def dataset():
+    """Small separable classification problem with a time-ordered index."""
+    rng = np.random.default_rng(0)
+    n = 300
+    X = pd.DataFrame(rng.normal(size=(n, 8)), columns=[f'f{i}' for i in range(8)])
+    y = pd.Series((X['f0'] + 0.5 * X['f1'] + rng.normal(0, 0.5, n) > 0).astype(int))
+    return X, y
+
+
+def make_optimizer(tmp_path, **overrides):
+    """Create an optimizer writing into a temporary results directory."""
+    settings = dict(n_trials=3, n_jobs=1, n_cv_splits=3, timeout_seconds=None,
+                    feature_selection_enabled=False)
+    settings.update(overrides)
+    config = OptimizationConfig(**settings)
+    return HyperparameterOptimizer(config=config, results_dir=str(tmp_path))
+
+
+class TestPruner:
+    """Test cases for pruner construction and pruning during CV."""
+    
+    def test_patient_hyperband_by_default(self, tmp_path):
+        """Test Hyperband, one CV fold per unit of resource, wrapped for patience."""
+        pruner = make_optimizer(tmp_path, pruner_gate_margin=None)._create_pruner()
+        
+        assert isinstance(pruner, optuna.pruners.PatientPruner)
+        assert pruner._patience == 2
+        assert isinstance(pruner._wrapped_pruner, optuna.pruners.HyperbandPruner)
+        assert pruner._wrapped_pruner._max_resource == 3
+    
+    def test_pruner_types(self, tmp_path):
+        """Test the median option, disabled pruning and an unknown type."""
+        assert isinstance(
+            make_optimizer(tmp_path, pruner_type='median', pruner_patience=None,
+                           pruner_gate_margin=None)._create_pruner(),
+            optuna.pruners.MedianPruner
+        )
+        assert isinstance(make_optimizer(tmp_path, pruning_enabled=False)._create_pruner(),
+                          optuna.pruners.NopPruner)
+        with pytest.raises(ValueError, match="Unknown pruner type"):
+            make_optimizer(tmp_path, pruner_type='random')._create_pruner()
+    
+    def test_pruned_trial_is_not_swallowed(self, tmp_path, dataset):
+        """Test TrialPruned escapes the fold loop instead of being logged as a failure."""
+        X, y = dataset
+        optimizer = make_optimizer(tmp_path, model_type='lightgbm')
+        study = optuna.create_study(direction='maximize', pruner=optuna.pruners.ThresholdPruner(lower=2.0))
+        trial = study.ask()
+        
+        with pytest.raises(optuna.TrialPruned):
+            optimizer._evaluate_with_cv(X, y, {'n_estimators': 10}, trial)
+    
+    def test_reports_raw_fold_scores(self, tmp_path, dataset):
+        """Test each fold's own score is reported at its step."""
+        X, y = dataset
+        optimizer = make_optimizer(tmp_path, model_type='lightgbm')
+        study = optuna.create_study(direction='maximize')
+        trial = study.ask()
+        
+        scores = optimizer._evaluate_with_cv(X, y, {'n_estimators': 10}, trial)
+        
+        frozen = study.trials[0]
+        assert frozen.intermediate_values == dict(enumerate(scores))
+
+
+class TestScoreGatePruner:
+    """Test cases for the best-score gate in front of the rung pruner."""
+    
+    @pytest.fixture
+    def study(self):
+        """Study whose best trial scored 0.8."""
+        study = optuna.create_study(direction='maximize')
+        study.add_trial(optuna.trial.create_trial(value=0.8))
+        return study
+    
+    @staticmethod
+    def report(study, pruner, values):
+        trial = study.ask()
+        for step, value in enumerate(values):
+            trial.report(value, step)
+        return pruner.prune(study, study._storage.get_trial(trial._trial_id))
+    
+    def test_default_gate_wraps_patient_hyperband(self, tmp_path):
+        """Test the gate is the outermost layer by default."""
+        from modules.ml.hyperparameter_tuning import _ScoreGatePruner
+        
+        pruner = make_optimizer(tmp_path)._create_pruner()
+        
+        assert isinstance(pruner, _ScoreGatePruner)
+        assert pruner._margin == 0.1 and pruner._n_steps == 3
+        assert isinstance(pruner._wrapped_pruner, optuna.pruners.PatientPruner)
+    
+    def test_first_fold_gate(self, study):
+        """Test a first fold far below the best is pruned and a close one deferred."""
+        from modules.ml.hyperparameter_tuning import _ScoreGatePruner
+        
+        pruner = _ScoreGatePruner(optuna.pruners.NopPruner(), n_steps=5, margin=0.1)
+        
+        assert self.report(study, pruner, [0.65])
+        assert not self.report(study, pruner, [0.75])
+    
+    def test_extrapolated_mean_gate(self, study):
+        """Test a falling trend is pruned once its projected mean misses the threshold."""
+        from modules.ml.hyperparameter_tuning import _ScoreGatePruner
+        
+        pruner = _ScoreGatePruner(optuna.pruners.NopPruner(), n_steps=5, margin=0.05)
+        no_extrapolation = _ScoreGatePruner(
+            optuna.pruners.NopPruner(), n_steps=5, margin=0.05, extrapolate=False
+        )
+        
+        # Projected folds 0.72, 0.68, 0.64: mean 0.72 < 0.75
+        assert self.report(study, pruner, [0.80, 0.76])
+        assert not self.report(study, no_extrapolation, [0.80, 0.76])
+        assert not self.report(study, pruner, [0.76, 0.80])
+    
+    def test_gate_uses_best_trial_fold_scores(self):
+        """Test folds are gated against the best trial's fold scores, not its objective."""
+        from modules.ml.hyperparameter_tuning import _ScoreGatePruner
+        
+        # A 'multi' objective (mean penalized by std) below its fold scores
+        study = optuna.create_study(direction='maximize')
+        study.add_trial(optuna.trial.create_trial(
+            value=0.5, intermediate_values={0: 0.6, 1: 0.8, 2: 0.9},
+        ))
+        pruner = _ScoreGatePruner(optuna.pruners.NopPruner(), n_steps=3, margin=0.1)
+        
+        assert self.report(study, pruner, [0.45])
+        assert not self.report(study, pruner, [0.55])
+        # Projected third fold 0.66: mean 0.62 < 0.77 - 0.1
+        assert self.report(study, pruner, [0.58, 0.62])
+        assert not self.report(study, pruner, [0.6, 0.75])
+    
+    def test_no_completed_trials_defers(self):
+        """Test nothing is gated before a best value exists."""
+        from modules.ml.hyperparameter_tuning import _ScoreGatePruner
+        
+        study = optuna.create_study(direction='maximize')
+        pruner = _ScoreGatePruner(optuna.pruners.NopPruner(), n_steps=5, margin=0.1)
+        
+        assert not self.report(study, pruner, [0.0])
+
+
+class TestEvaluateWithCV:
+    """Test cases for the time-series cross-validation loop."""
+    
+    def test_parallel_folds_match_sequential(self, tmp_path, dataset):
+        """Test spreading folds over workers gives the same scores in order."""
+        X, y = dataset
+        params = {'n_estimators': 10}
+        sequential = make_optimizer(tmp_path, model_type='lightgbm')._evaluate_with_cv(X, y, params)
+        parallel = make_optimizer(tmp_path, model_type='lightgbm', n_jobs_per_trial=2)._evaluate_with_cv(
+            X, y, params
+        )
+        
+        assert len(sequential) == 3
+        assert parallel == pytest.approx(sequential)
+    
+    def test_failed_fold_is_skipped(self, tmp_path, dataset):
+        """Test a fold whose model cannot be fit is left out of the scores."""
+        X, y = dataset
+        optimizer = make_optimizer(tmp_path, model_type='lightgbm')
+        
+        scores = optimizer._evaluate_with_cv(X, y, {'n_estimators': -5})
+        
+        assert scores == []
+    
+    def test_native_xgboost_matches_classifier(self, tmp_path, dataset):
+        """Test the DMatrix path scores folds like the XGBClassifier does."""
+        from modules.ml.hyperparameter_tuning import _get_scorer, _run_fold
+        from sklearn.model_selection import TimeSeriesSplit
+        
+        X, y = dataset
+        optimizer = make_optimizer(tmp_path, model_type='xgboost', device='cpu')
+        params = {'n_estimators': 20, 'max_depth': 3, 'learning_rate': 0.1}
+        X_np, y_np = X.to_numpy(dtype=np.float32), y.to_numpy()
+        
+        scores = optimizer._evaluate_with_cv(X_np, y_np, params)
+        expected = [
+            _run_fold(optimizer._create_model(params), X_np, y_np, train_idx, val_idx,
+                      _get_scorer('f1'))[0]
+            for train_idx, val_idx in TimeSeriesSplit(n_splits=3).split(X_np)
+        ]
+        
+        assert scores == pytest.approx(expected)
+    
+    def test_dmatrices_reused_per_feature_set(self, tmp_path, dataset):
+        """Test fold DMatrices are cached by feature key and evicted LRU-first."""
+        from modules.ml import hyperparameter_tuning as ht
+        from sklearn.model_selection import TimeSeriesSplit
+        
+        X, y = dataset
+        optimizer = make_optimizer(tmp_path, model_type='xgboost', device='cpu')
+        X_np, y_np = X.to_numpy(dtype=np.float32), y.to_numpy()
+        folds = list(TimeSeriesSplit(n_splits=3).split(X_np))
+        
+        first = optimizer._fold_dmatrices(X_np, y_np, folds, (0, 1))
+        assert optimizer._fold_dmatrices(X_np, y_np, folds, (0, 1)) is first
+        assert optimizer._fold_dmatrices(X_np, y_np, folds) is not first
+        
+        for key in range(ht._DMATRIX_CACHE_SIZE):
+            optimizer._fold_dmatrices(X_np, y_np, folds, (key,))
+        assert (0, 1) not in optimizer._dmatrix_cache
+        assert len(optimizer._dmatrix_cache) == ht._DMATRIX_CACHE_SIZE
+
+
+class TestScorer:
+    """Test cases for fold metric resolution."""
+    
+    @pytest.mark.parametrize('optimize_for, needs_scores', [
+        ('accuracy', False), ('f1', False), ('multi', False), ('roc_auc', True)
+    ])
+    def test_scorer_per_metric(self, optimize_for, needs_scores):
+        """Test each metric says whether it ranks continuous scores."""
+        from modules.ml.hyperparameter_tuning import _get_scorer
+        
+        metric, scores = _get_scorer(optimize_for)
+        
+        assert scores is needs_scores
+        assert metric(np.array([0, 1, 1, 0]), np.array([0, 1, 1, 0])) == 1.0
+    
+    def test_unknown_metric_rejected(self):
+        """Test an unknown optimize_for raises."""
+        from modules.ml.hyperparameter_tuning import _get_scorer
+        
+        with pytest.raises(ValueError):
+            _get_scorer('sharpe')
+    
+    @pytest.mark.parametrize('model_type', ['xgboost', 'lightgbm'])
+    def test_roc_auc_folds(self, tmp_path, dataset, model_type):
+        """Test ROC-AUC folds score on both training paths."""
+        X, y = dataset
+        optimizer = make_optimizer(tmp_path, model_type=model_type, device='cpu',
+                                   optimize_for='roc_auc')
+        
+        scores = optimizer._evaluate_with_cv(X, y, {'n_estimators': 10})
+        
+        assert len(scores) == 3
+        assert all(0.0 <= score <= 1.0 for score in scores)
+    
+    @pytest.mark.parametrize('model_type', ['xgboost', 'lightgbm'])
+    def test_margins_rank_like_probabilities(self, tmp_path, dataset, model_type):
+        """Test ROC-AUC from raw margins equals ROC-AUC from predict_proba."""
+        from sklearn.metrics import roc_auc_score
+        from modules.ml.hyperparameter_tuning import _ranking_scores
+        
+        X, y = dataset
+        optimizer = make_optimizer(tmp_path, model_type=model_type, device='cpu')
+        model = optimizer._create_model({'n_estimators': 10})
+        X_np, y_np = X.to_numpy(dtype=np.float32), y.to_numpy()
+        model.fit(X_np[:200], y_np[:200])
+        
+        assert roc_auc_score(y_np[200:], _ranking_scores(model, X_np[200:])) == pytest.approx(
+            roc_auc_score(y_np[200:], model.predict_proba(X_np[200:])[:, 1])
+        )
+
+
+class TestDevice:
+    """Test cases for training device selection."""
+    
+    @pytest.mark.parametrize('model_type', ['xgboost', 'lightgbm'])
+    def test_auto_resolves_to_usable_device(self, tmp_path, model_type):
+        """Test 'auto' picks the GPU only when the probe finds one."""
+        from modules.ml.hyperparameter_tuning import _gpu_available
+        
+        optimizer = make_optimizer(tmp_path, model_type=model_type)
+        
+        assert optimizer.device == ('cuda' if _gpu_available(model_type) else 'cpu')
+    
+    def test_device_passed_to_models(self, tmp_path):
+        """Test the resolved device reaches the estimator parameters."""
+        xgb_model = make_optimizer(tmp_path, device='cpu')._create_model({})
+        lgb_model = make_optimizer(tmp_path, model_type='lightgbm', device='cuda')._create_model({})
+        
+        assert xgb_model.get_params()['device'] == 'cpu'
+        assert xgb_model.get_params()['tree_method'] == 'hist'
+        assert lgb_model.get_params()['device_type'] == 'gpu'
+
+
+class TestFeatureSelection:
+    """Test cases for the per-feature selection mask."""
+    
+    def test_mask_selects_flagged_features(self, tmp_path, dataset):
+        """Test features flagged with use_<name>=1 are selected, in column order."""
+        X, _ = dataset
+        optimizer = make_optimizer(tmp_path, min_features_pct=0.0)
+        flags = {f'use_{col}': int(col not in ('f1', 'f4')) for col in X.columns}
+        
+        selected = optimizer._suggest_features(optuna.trial.FixedTrial(flags), X)
+        
+        assert selected == ['f0', 'f2', 'f3', 'f5', 'f6', 'f7']
+    
+    def test_too_few_features_falls_back_to_all(self, tmp_path, dataset):
+        """Test a mask below the minimum feature count keeps every feature."""
+        X, _ = dataset
+        optimizer = make_optimizer(tmp_path)
+        flags = {f'use_{col}': int(col == 'f0') for col in X.columns}
+        
+        assert optimizer._suggest_features(optuna.trial.FixedTrial(flags), X) == X.columns.tolist()
+    
+    def test_selection_frequency(self, tmp_path, dataset):
+        """Test selection frequency counts use_ flags set to 1 over completed trials."""
+        X, y = dataset
+        optimizer = make_optimizer(tmp_path, model_type='lightgbm', feature_selection_enabled=True,
+                                   n_trials=4, pruning_enabled=False)
+        optimizer.optimize(X, y, study_name='selection')
+        
+        importance = optimizer.get_feature_importance_from_optimization()
+        completed = optimizer.study.get_trials(states=(optuna.trial.TrialState.COMPLETE,))
+        expected = np.mean([t.params['use_f0'] for t in completed])
+        
+        row = importance.set_index('feature').loc['f0']
+        assert row['selection_frequency'] == pytest.approx(expected)
+        assert importance['selection_frequency'].is_monotonic_decreasing
+    
+    def test_selection_counts_over_completed_trials(self, tmp_path):
+        """Test counts and frequencies from completed trials only, most selected first."""
+        optimizer = make_optimizer(tmp_path, feature_selection_enabled=True)
+        optimizer.study = optuna.create_study(direction='maximize')
+        flag = optuna.distributions.IntDistribution(0, 1)
+        distributions = {'use_a': flag, 'use_b': flag, 'use_c': flag}
+        for flags, state in [((1, 1, 0), 'COMPLETE'), ((1, 0, 0), 'COMPLETE'),
+                             ((0, 0, 0), 'COMPLETE'), ((0, 1, 1), 'PRUNED')]:
+            optimizer.study.add_trial(optuna.trial.create_trial(
+                params=dict(zip(distributions, flags)), distributions=distributions,
+                value=0.5 if state == 'COMPLETE' else None,
+                state=optuna.trial.TrialState[state]
+            ))
+        
+        importance = optimizer.get_feature_importance_from_optimization()
+        
+        assert list(importance.columns) == ['feature', 'selection_count', 'selection_frequency']
+        assert importance['feature'].tolist() == ['a', 'b']
+        assert importance['selection_count'].tolist() == [2, 1]
+        assert importance['selection_frequency'].tolist() == pytest.approx([2 / 3, 1 / 3])
+
+
+class TestSampler:
+    """Test cases for sampler construction."""
+    
+    @pytest.mark.parametrize('n_jobs, constant_liar', [(1, False), (4, True), (-1, True)])
+    def test_multivariate_with_constant_liar_for_parallel_trials(self, n_jobs, constant_liar):
+        """Test the constant liar is only enabled when trials run in parallel."""
+        sampler = HyperparameterOptimizer._create_sampler(n_jobs)
+        
+        assert sampler._multivariate
+        assert sampler._constant_liar is constant_liar
+    
+    @pytest.mark.parametrize('n_warm_start, n_startup', [(0, 10), (3, 7), (8, 5)])
+    def test_warm_start_shrinks_random_startup(self, n_warm_start, n_startup):
+        """Test each warm-start point replaces a random startup trial, down to five."""
+        sampler = HyperparameterOptimizer._create_sampler(1, n_warm_start=n_warm_start)
+        
+        assert sampler._n_startup_trials == n_startup
+    
+    def test_warm_start_params_evaluated_first(self, tmp_path, dataset):
+        """Test warm-start points run first and are not queued twice on resume."""
+        X, y = dataset
+        warm = [{'n_estimators': 100, 'max_depth': 4, 'learning_rate': 0.05}]
+        optimizer = make_optimizer(tmp_path, model_type='lightgbm', n_trials=2,
+                                   pruning_enabled=False)
+        optimizer.optimize(X, y, study_name='warm', warm_start_params=warm)
+        
+        first = optimizer.study.trials[0].params
+        assert {k: first[k] for k in warm[0]} == warm[0]
+        
+        optimizer.optimize(X, y, study_name='warm', load_if_exists=True, warm_start_params=warm)
+        matches = [t for t in optimizer.study.trials
+                   if all(t.params.get(k) == v for k, v in warm[0].items())]
+        assert len(optimizer.study.trials) == 4
+        assert len(matches) == 1
+
+
+class TestObjective:
+    """Test cases for the Optuna objective."""
+    
+    def test_trial_slices_selected_columns_from_float32_matrix(self, tmp_path, dataset):
+        """Test the CV sees a float32 matrix holding only the selected columns."""
+        X, y = dataset
+        optimizer = make_optimizer(tmp_path, model_type='lightgbm', feature_selection_enabled=True)
+        seen = {}
+        
+        def fake_cv(X_trial, y_trial, params, trial, feature_key=None, scorer=None, folds=None):
+            seen['X'], seen['y'], seen['key'] = X_trial, y_trial, feature_key
+            return [0.5]
+        
+        optimizer._evaluate_with_cv = fake_cv
+        objective = optimizer._create_objective_function(X, y)
+        flags = {f'use_{col}': int(col != 'f3') for col in X.columns}
+        params = {'n_estimators': 100, 'max_depth': 3, 'learning_rate': 0.1, 'num_leaves': 20,
+                  'feature_fraction': 0.5, 'bagging_fraction': 0.5, 'bagging_freq': 1,
+                  'min_child_samples': 5, 'reg_alpha': 0.0, 'reg_lambda': 0.0}
+        
+        assert objective(optuna.trial.FixedTrial({**params, **flags})) == 0.5
+        assert seen['X'].dtype == np.float32 and seen['X'].flags['C_CONTIGUOUS']
+        np.testing.assert_array_equal(
+            seen['X'], X.drop(columns='f3').to_numpy(dtype=np.float32)
+        )
+        np.testing.assert_array_equal(seen['y'], y.to_numpy())
+        assert seen['key'] == (0, 1, 2, 4, 5, 6, 7)
+    
+    def test_folds_split_once_per_study(self, tmp_path, dataset):
+        """Test every trial is handed the same precomputed folds."""
+        from sklearn.model_selection import TimeSeriesSplit
+        
+        X, y = dataset
+        optimizer = make_optimizer(tmp_path, model_type='lightgbm')
+        seen = []
+        optimizer._evaluate_with_cv = lambda *args: seen.append(args[-1]) or [0.5]
+        objective = optimizer._create_objective_function(X, y)
+        params = {'n_estimators': 100, 'max_depth': 3, 'learning_rate': 0.1, 'num_leaves': 20,
+                  'feature_fraction': 0.5, 'bagging_fraction': 0.5, 'bagging_freq': 1,
+                  'min_child_samples': 5, 'reg_alpha': 0.0, 'reg_lambda': 0.0}
+        
+        objective(optuna.trial.FixedTrial(params))
+        objective(optuna.trial.FixedTrial(params))
+        
+        assert seen[0] is seen[1]
+        for (train_idx, val_idx), (exp_train, exp_val) in zip(
+            seen[0], TimeSeriesSplit(n_splits=3).split(X)
+        ):
+            np.testing.assert_array_equal(train_idx, exp_train)
+            np.testing.assert_array_equal(val_idx, exp_val)
+
+
+class TestSaveResults:
+    """Test cases for writing results to disk."""
+    
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_results_round_trip(self, tmp_path, monkeypatch, use_orjson):
+        """Test results with numpy and datetime values are written atomically."""
+        from datetime import datetime
+        from modules.ml import hyperparameter_tuning as ht
+        
+        if use_orjson and not ht.ORJSON_AVAILABLE:
+            pytest.skip('orjson not installed')
+        monkeypatch.setattr(ht, 'ORJSON_AVAILABLE', use_orjson)
+        optimizer = make_optimizer(tmp_path)
+        results = {
+            'best_value': np.float64(0.75),
+            'best_params': {'max_depth': 3},
+            'timestamp': datetime(2024, 1, 2),
+        }
+        
+        optimizer._save_results(results, 'study')
+        
+        saved = json.loads((optimizer.results_dir / 'study_results.json').read_text())
+        assert saved['best_value'] == 0.75
+        assert saved['best_params'] == {'max_depth': 3}
+        assert saved['timestamp'].startswith('2024-01-02')
+        assert list(optimizer.results_dir.glob('*.tmp')) == []
+
+
+class TestSummarizeTrials:
+    """Test cases for the trial summary."""
+    
+    def test_counts_and_stats(self, tmp_path):
+        """Test state counts and value statistics over a mixed study."""
+        optimizer = make_optimizer(tmp_path)
+        optimizer.study = optuna.create_study(direction='maximize')
+        values = [0.2, 0.5, 0.9, 0.4]
+        for value in values:
+            optimizer.study.add_trial(optuna.trial.create_trial(
+                params={}, distributions={}, value=value
+            ))
+        optimizer.study.add_trial(optuna.trial.create_trial(state=optuna.trial.TrialState.PRUNED))
+        optimizer.study.add_trial(optuna.trial.create_trial(state=optuna.trial.TrialState.FAIL))
+        
+        summary = optimizer._summarize_trials()
+        
+        assert summary['n_completed'] == 4
+        assert summary['n_pruned'] == 1
+        assert summary['n_failed'] == 1
+        assert summary['value_mean'] == pytest.approx(np.mean(values))
+        assert summary['value_std'] == pytest.approx(np.std(values))
+        assert summary['value_min'] == 0.2
+        assert summary['value_max'] == 0.9
+        assert summary['value_median'] == pytest.approx(0.45)
+    
+    def test_no_completed_trials(self, tmp_path):
+        """Test an empty summary when nothing completed."""
+        optimizer = make_optimizer(tmp_path)
+        optimizer.study = optuna.create_study(direction='maximize')
+        optimizer.study.add_trial(optuna.trial.create_trial(state=optuna.trial.TrialState.PRUNED))
+        
+        assert optimizer._summarize_trials() == {}
+
+
+class TestHistory:
+    """Test cases for the streamed optimization history."""
+    
+    def test_history_streamed_to_parquet(self, tmp_path, dataset, monkeypatch):
+        """Test every completed trial lands in the file while memory keeps the latest."""
+        from modules.ml import hyperparameter_tuning as ht
+        
+        if not ht.PYARROW_AVAILABLE:
+            pytest.skip('pyarrow not installed')
+        monkeypatch.setattr(ht, '_HISTORY_BUFFER_SIZE', 2)
+        X, y = dataset
+        optimizer = make_optimizer(tmp_path, model_type='lightgbm', n_trials=5, pruning_enabled=False)
+        
+        optimizer.optimize(X, y, study_name='history')
+        
+        history = pd.read_parquet(optimizer.history_path('history'))
+        assert history['trial'].tolist() == list(range(5))
+        assert json.loads(history['params'].iloc[-1]) == optimizer.study.trials[-1].params
+        assert [record['trial'] for record in optimizer.optimization_history] == [3, 4]
+        assert optimizer._history_writer is None
+    
+    def test_resumed_study_appends_history(self, tmp_path, dataset):
+        """Test resuming a study adds a part file rather than overwriting earlier trials."""
+        from modules.ml import hyperparameter_tuning as ht
+        
+        if not ht.PYARROW_AVAILABLE:
+            pytest.skip('pyarrow not installed')
+        X, y = dataset
+        optimizer = make_optimizer(tmp_path, model_type='lightgbm', n_trials=2, pruning_enabled=False)
+        
+        optimizer.optimize(X, y, study_name='resumed')
+        optimizer.optimize(X, y, study_name='resumed', load_if_exists=True)
+        
+        history_dir = optimizer.history_path('resumed')
+        assert len(list(history_dir.glob('part-*.parquet'))) == 2
+        assert sorted(pd.read_parquet(history_dir)['trial']) == [0, 1, 2, 3]
+
+
+class TestPlots:
+    """Test cases for optimization plots."""
+    
+    @pytest.fixture
+    def optimizer(self, tmp_path):
+        """Optimizer holding a study of ten completed trials."""
+        optimizer = make_optimizer(tmp_path)
+        optimizer.study = optuna.create_study(direction='maximize')
+        distributions = {
+            'max_depth': optuna.distributions.IntDistribution(3, 10),
+            'learning_rate': optuna.distributions.FloatDistribution(0.01, 0.3),
+        }
+        for i in range(10):
+            params = {'max_depth': 3 + i % 8, 'learning_rate': 0.01 + 0.02 * i}
+            optimizer.study.add_trial(optuna.trial.create_trial(
+                params=params, distributions=distributions, value=0.5 + 0.01 * params['max_depth']
+            ))
+        return optimizer
+    
+    @pytest.mark.parametrize('suffix', ['.html', '.png'])
+    def test_importances_computed_once(self, optimizer, tmp_path, monkeypatch, suffix):
+        """Test importance is computed once per plot and reused while trials are unchanged."""
+        pytest.importorskip('plotly' if suffix == '.html' else 'matplotlib')
+        calls = []
+        original = optuna.importance.get_param_importances
+        monkeypatch.setattr(optuna.importance, 'get_param_importances',
+                            lambda *args, **kwargs: calls.append(1) or original(*args, **kwargs))
+        path = tmp_path / f'plots{suffix}'
+        
+        optimizer.plot_optimization_history(str(path))
+        optimizer.plot_optimization_history(str(path))
+        
+        assert len(calls) == 1
+        assert path.stat().st_size > 0
+    
+    def test_html_report_is_interactive(self, optimizer, tmp_path):
+        """Test the HTML report embeds plotly.js once and every figure."""
+        pytest.importorskip('plotly')
+        path = tmp_path / 'plots.html'
+        
+        optimizer.plot_optimization_history(str(path))
+        
+        html = path.read_text(encoding='utf-8')
+        assert html.count('class="plotly-graph-div"') == 4
+        assert 'Parameter Importance (Top 10)' in html
+
+
+class TestStorage:
+    """Test cases for study persistence."""
+    
+    def test_study_resumed_from_journal(self, tmp_path, dataset):
+        """Test a study is written to the journal file and resumed by name."""
+        X, y = dataset
+        optimizer = make_optimizer(tmp_path, model_type='lightgbm', n_trials=2)
+        optimizer.optimize(X, y, study_name='resume')
+        
+        resumed = make_optimizer(tmp_path, model_type='lightgbm', n_trials=2)
+        resumed.optimize(X, y, study_name='resume', load_if_exists=True)
+        
+        assert (resumed.results_dir / 'optuna_journal.log').exists()
+        assert len(resumed.study.trials) == 4
+    
+    def test_older_optuna_without_journal_module_still_available(self):
+        """Test Optuna 3.x, without optuna.storages.journal, keeps the optimizer enabled."""
+        import subprocess
+        import sys
+        
+        code = (
+            "import sys, optuna.storages\n"
+            "sys.modules['optuna.storages.journal'] = None\n"
+            "from modules.ml import hyperparameter_tuning as ht\n"
+            "assert ht.OPTUNA_AVAILABLE\n"
+            "assert ht.JournalFileBackend is optuna.storages.JournalFileStorage\n"
+        )
+        subprocess.run([sys.executable, '-c', code], check=True, cwd=Path(__file__).parent.parent)
+    
+    def test_sqlite_without_journal_storage(self, tmp_path, monkeypatch):
+        """Test Optuna releases without journal storage fall back to the SQLite file."""
+        from modules.ml import hyperparameter_tuning as ht
+        
+        monkeypatch.setattr(ht, 'JournalFileBackend', None)
+        storage = make_optimizer(tmp_path)._create_storage()
+        
+        assert storage == f"sqlite:///{tmp_path / 'optuna_studies.db'}"
+
+
+class TestModelTypes:
+    """Test cases for model type dispatch."""
+    
+    def test_unknown_model_type_rejected_at_init(self, tmp_path):
+        """Test an unsupported model type fails when the optimizer is built."""
+        with pytest.raises(ValueError, match='Unknown model type'):
+            make_optimizer(tmp_path, model_type='ensemble')
+    
+    @pytest.mark.parametrize('model_type, param', [('xgboost', 'gamma'), ('lightgbm', 'num_leaves')])
+    def test_search_space_and_model_per_type(self, tmp_path, model_type, param):
+        """Test each model type suggests its own space and builds its own classifier."""
+        optimizer = make_optimizer(tmp_path, model_type=model_type, device='cpu')
+        study = optuna.create_study()
+        
+        params = optimizer._suggest_parameters(study.ask())
+        model = optimizer._create_model(params)
+        
+        assert param in params
+        assert type(model).__module__.startswith(model_type)
+        assert model.get_params()['n_estimators'] == params['n_estimators']
+        assert model.get_params()['random_state'] == 42
@@ -31,6 +31,9 @@ class TestICIETFDataLoader:
         assert not result.empty
         assert 'week_ending' in result.columns
         assert 'fund_type' in result.columns
+        assert result['estimated_flows'].dtype == 'float32'
+        assert result['total_net_assets'].dtype == 'float32'
+        assert result['fund_type'].dtype == 'category'
         mock_get.assert_called_once()
 
     @patch('modules.ici_etf_data.requests.get')
@@ -64,6 +67,31 @@ class TestICIETFDataLoader:
         assert 'date' in result.columns
         assert 'fund_category' in result.columns
 
+    @patch('modules.database.queries.log_data_refresh')
+    @patch('modules.database.get_db_connection')
+    @patch('modules.ici_etf_data.fetch_ici_monthly_etf_flows')
+    @patch('modules.ici_etf_data.fetch_ici_weekly_etf_flows')
+    def test_save_ici_etf_flows_fetches_both_feeds(self, mock_weekly, mock_monthly,
+                                                   mock_db, mock_log):
+        """Test that both feeds are fetched when neither DataFrame is supplied."""
+        mock_weekly.return_value = pd.DataFrame({
+            'week_ending': ['2024-01-10'], 'fund_type': ['Equity'],
+            'estimated_flows': [1000.0], 'total_net_assets': [50000.0],
+        })
+        mock_monthly.return_value = pd.DataFrame({
+            'date': ['2024-01-31'], 'fund_category': ['Domestic Equity'],
+            'net_new_cash_flow': [5000.0], 'net_issuance': [5500.0], 'redemptions': [500.0],
+            'reinvested_dividends': [100.0], 'total_net_assets': [100000.0],
+        })
+
+        from modules.ici_etf_data import save_ici_etf_flows_to_duckdb
+
+        results = save_ici_etf_flows_to_duckdb()
+
+        mock_weekly.assert_called_once()
+        mock_monthly.assert_called_once()
+        assert results == {'weekly_records': 1, 'monthly_records': 1}
+
     def test_ici_etf_flows_table_schema(self):
         """Test that ICI ETF flows table has correct columns."""
         expected_weekly_columns = ['week_ending', 'fund_type', 'estimated_flows', 'total_net_assets']
@@ -0,0 +1,432 @@
+"""
+Unit tests for the ML model evaluation module.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from sklearn.metrics import (
+    accuracy_score, f1_score, log_loss, precision_score, recall_score, roc_auc_score, roc_curve
+)
+
+from modules.ml.evaluation import (
+    ModelEvaluator, NUMBA_AVAILABLE, PLOTTING_AVAILABLE, _compute_roc_bundle,
+    _fast_binary_auc, _rolling_mean
+)
+
+
+@pytest.fixture
+def binary_predictions():
+    """Create reproducible binary labels, predictions and probabilities."""
+    rng = np.random.default_rng(42)
+    y_true = rng.integers(0, 2, 500)
+    proba_up = np.clip(0.5 * y_true + rng.uniform(0, 0.6, 500), 0.01, 0.99)
+    y_pred = (proba_up > 0.5).astype(int)
+    return y_true, y_pred, proba_up
+
+
+@pytest.fixture
+def evaluator(monkeypatch):
+    """Create a ModelEvaluator without leaking DUCKDB_PATH into other tests."""
+    monkeypatch.setenv('DUCKDB_PATH', ':memory:')
+    return ModelEvaluator()
+
+
+class TestFastBinaryAUC:
+    """Test cases for the rank-based AUC helper."""
+    
+    def test_matches_sklearn(self, binary_predictions):
+        """Test AUC agrees with sklearn on continuous scores."""
+        y_true, _, proba_up = binary_predictions
+        assert _fast_binary_auc(y_true, proba_up) == pytest.approx(roc_auc_score(y_true, proba_up))
+    
+    def test_matches_sklearn_with_ties(self, binary_predictions):
+        """Test tied scores are ranked by their average rank."""
+        y_true, _, proba_up = binary_predictions
+        rounded = np.round(proba_up, 1)
+        assert _fast_binary_auc(y_true, rounded) == pytest.approx(roc_auc_score(y_true, rounded))
+    
+    def test_single_class_returns_nan(self):
+        """Test AUC is undefined when only one class is present."""
+        assert np.isnan(_fast_binary_auc(np.ones(5), np.linspace(0, 1, 5)))
+        assert np.isnan(_fast_binary_auc(np.array([]), np.array([])))
+
+
+class TestRocBundle:
+    """Test cases for the single-sort ROC bundle."""
+    
+    @pytest.mark.parametrize('decimals', [None, 1])
+    def test_matches_sklearn(self, binary_predictions, decimals):
+        """Test curve, AUC and log loss agree with sklearn, with and without ties."""
+        y_true, _, proba_up = binary_predictions
+        if decimals is not None:
+            proba_up = np.round(proba_up, decimals)
+        bundle = _compute_roc_bundle(y_true, proba_up)
+        fpr, tpr, thresholds = roc_curve(y_true, proba_up, drop_intermediate=False)
+        
+        np.testing.assert_allclose(bundle.fpr, fpr)
+        np.testing.assert_allclose(bundle.tpr, tpr)
+        np.testing.assert_allclose(bundle.thresholds[1:], thresholds[1:])
+        assert bundle.auc == pytest.approx(roc_auc_score(y_true, proba_up))
+        assert bundle.log_loss == pytest.approx(
+            log_loss(y_true, np.column_stack([1 - proba_up, proba_up]))
+        )
+        np.testing.assert_array_equal(np.sort(proba_up), proba_up[bundle.order])
+    
+    def test_float32_scores(self, binary_predictions):
+        """Test float32 probabilities keep the AUC and log loss of float64."""
+        y_true, _, proba_up = binary_predictions
+        full = _compute_roc_bundle(y_true, proba_up)
+        narrow = _compute_roc_bundle(y_true.astype(np.int8), proba_up.astype(np.float32))
+        
+        assert narrow.auc == full.auc
+        assert narrow.log_loss == pytest.approx(full.log_loss, abs=1e-6)
+
+
+class TestRollingMean:
+    """Test cases for the cumulative-sum rolling mean."""
+    
+    def test_matches_pandas_rolling(self, binary_predictions):
+        """Test agreement with pandas rolling mean including min_periods."""
+        y_true, y_pred, _ = binary_predictions
+        correct = (y_true == y_pred).astype(int)
+        
+        expected = pd.Series(correct).rolling(window=30, min_periods=10).mean().to_numpy()
+        
+        np.testing.assert_allclose(_rolling_mean(correct, 30, 10), expected, equal_nan=True)
+
+class TestEvaluatePredictions:
+    """Test cases for ModelEvaluator.evaluate_predictions."""
+    
+    def test_probabilistic_metrics(self, evaluator, binary_predictions):
+        """Test ROC-AUC is reported from positive-class probabilities."""
+        y_true, y_pred, proba_up = binary_predictions
+        y_proba = np.column_stack([1 - proba_up, proba_up])
+        
+        metrics = evaluator.evaluate_predictions(y_true, y_pred, y_proba)
+        
+        assert metrics['support'] == 500
+        assert metrics['roc_auc'] == pytest.approx(roc_auc_score(y_true, proba_up))
+        assert metrics['log_loss'] > 0
+    
+    @pytest.mark.parametrize('y_pred', [
+        np.array([1, 0, 1, 1, 0, 0]),
+        np.zeros(6, dtype=int),  # no positive predictions: precision/F1 fall back to 0
+    ])
+    def test_threshold_metrics_match_sklearn(self, evaluator, y_pred):
+        """Test metrics derived from confusion counts agree with sklearn."""
+        y_true = np.array([1, 0, 0, 1, 1, 0])
+        
+        metrics = evaluator.evaluate_predictions(y_true, y_pred)
+        
+        assert metrics['accuracy'] == pytest.approx(accuracy_score(y_true, y_pred))
+        assert metrics['precision'] == pytest.approx(precision_score(y_true, y_pred, zero_division=0))
+        assert metrics['recall'] == pytest.approx(recall_score(y_true, y_pred, zero_division=0))
+        assert metrics['f1'] == pytest.approx(f1_score(y_true, y_pred, zero_division=0))
+        assert metrics['support'] == 6
+
+
+class TestFinancialMetrics:
+    """Test cases for ModelEvaluator.calculate_financial_metrics."""
+    
+    @pytest.mark.parametrize('use_numba', [
+        pytest.param(True, marks=pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")),
+        False,
+    ])
+    def test_known_values(self, evaluator, monkeypatch, use_numba):
+        """Test metrics on a small hand-checked series, skipping NaN returns."""
+        monkeypatch.setattr('modules.ml.evaluation.NUMBA_AVAILABLE', use_numba)
+        predictions = pd.DataFrame({'prediction': [1, 0, 1, 1, 0]})
+        returns = pd.Series([0.01, -0.02, -0.01, np.nan, 0.03])
+        
+        metrics = evaluator.calculate_financial_metrics(predictions, returns)
+        
+        strategy = np.array([0.01, 0.0, -0.01, 0.0])
+        assert metrics['num_trades'] == 4
+        assert metrics['win_rate'] == pytest.approx(0.5)
+        assert metrics['avg_return'] == pytest.approx(strategy.mean())
+        assert metrics['sharpe_ratio'] == pytest.approx(
+            strategy.mean() / strategy.std(ddof=1) * np.sqrt(252)
+        )
+        assert metrics['total_return'] == pytest.approx(np.prod(1 + strategy) - 1)
+    
+    def test_empty_input(self, evaluator):
+        """Test that an empty history yields zeroed metrics."""
+        metrics = evaluator.calculate_financial_metrics(
+            pd.DataFrame({'prediction': []}), pd.Series([], dtype=float)
+        )
+        assert metrics['num_trades'] == 0
+        assert metrics['sharpe_ratio'] == 0.0
+    
+    @pytest.mark.parametrize('use_numba', [
+        pytest.param(True, marks=pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")),
+        False,
+    ])
+    def test_total_return_long_history(self, evaluator, monkeypatch, use_numba):
+        """Test compounding over a long series matches the closed form."""
+        monkeypatch.setattr('modules.ml.evaluation.NUMBA_AVAILABLE', use_numba)
+        n = 20000
+        metrics = evaluator.calculate_financial_metrics(
+            pd.DataFrame({'prediction': np.ones(n)}), pd.Series(np.full(n, 1e-4))
+        )
+        assert metrics['total_return'] == pytest.approx(np.expm1(n * np.log1p(1e-4)), rel=1e-12)
+
+
+class TestFusedEvaluation:
+    """Test cases for the single-pass evaluation kernel."""
+    
+    @pytest.fixture
+    def joined_predictions(self, binary_predictions):
+        """Create a joined predictions frame as returned by the evaluation query."""
+        y_true, y_pred, proba_up = binary_predictions
+        rng = np.random.default_rng(7)
+        returns = np.where(y_true == 1, 1, -1) * rng.uniform(0.0001, 0.03, len(y_true))
+        returns[::50] = np.nan
+        return pd.DataFrame({
+            'prediction': y_pred,
+            'probability_up': proba_up,
+            'probability_down': 1 - proba_up,
+            'actual_outcome': y_true,
+            'actual_return': returns,
+        })
+    
+    @pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+    def test_matches_separate_metric_calls(self, evaluator, joined_predictions):
+        """Test the fused kernel reproduces the per-metric implementations."""
+        df = joined_predictions
+        y_true = df['actual_outcome'].values
+        y_pred = df['prediction'].values
+        
+        classification, cm_dict, financial = evaluator._fused_evaluation(
+            y_true.astype(np.int8), y_pred.astype(np.int8),
+            df['actual_return'].to_numpy(dtype=np.float32),
+            _compute_roc_bundle(y_true, df['probability_up'].to_numpy())
+        )
+        
+        expected_classification = evaluator.evaluate_predictions(
+            y_true, y_pred, df[['probability_down', 'probability_up']].values
+        )
+        _, expected_cm = evaluator.get_confusion_matrix(y_true, y_pred)
+        expected_financial = evaluator.calculate_financial_metrics(
+            df[['prediction']], df['actual_return']
+        )
+        
+        assert classification == pytest.approx(expected_classification)
+        assert cm_dict == expected_cm
+        assert financial == pytest.approx(expected_financial)
+    
+    @pytest.mark.skipif(not NUMBA_AVAILABLE, reason="numba not installed")
+    def test_failed_roc_bundle_falls_back_like_evaluate_predictions(self, evaluator, joined_predictions):
+        """Test a missing ROC bundle gives the same zeroed keys as the non-numba path."""
+        df = joined_predictions
+        y_true = df['actual_outcome'].to_numpy(dtype=np.int8)
+        y_pred = df['prediction'].to_numpy(dtype=np.int8)
+        returns = df['actual_return'].to_numpy(dtype=np.float32)
+        
+        classification, _, _ = evaluator._fused_evaluation(y_true, y_pred, returns, None)
+        with patch('modules.ml.evaluation._compute_roc_bundle', side_effect=ValueError('bad')):
+            expected = evaluator.evaluate_predictions(
+                y_true, y_pred, df[['probability_down', 'probability_up']].values
+            )
+        single_class, _, _ = evaluator._fused_evaluation(
+            np.ones_like(y_true), y_pred, returns, None
+        )
+        
+        assert classification['roc_auc'] == classification['log_loss'] == 0.0
+        assert classification == pytest.approx(expected)
+        assert 'roc_auc' not in single_class and 'log_loss' not in single_class
+
+
+class TestEvaluateModelPredictions:
+    """Test cases for the database-backed evaluation query."""
+    
+    @pytest.fixture
+    def seeded_db(self, monkeypatch):
+        """Seed an in-memory DuckDB with prices and predictions for SPY."""
+        import modules.database.factory as factory
+        
+        monkeypatch.setenv('DATABASE_BACKEND', 'duckdb')
+        monkeypatch.setenv('DUCKDB_PATH', ':memory:')
+        monkeypatch.setattr(factory, '_db_connection', None)
+        monkeypatch.setattr(factory.DatabaseConnection, '_instance', None)
+        monkeypatch.setattr(factory.DatabaseConnection, '_backend', None)
+        db = factory.get_db_connection()
+        
+        dates = pd.bdate_range('2024-01-01', periods=40)
+        closes = 100 + np.cumsum(np.random.default_rng(3).normal(0, 1, len(dates)))
+        db.insert_df(pd.DataFrame({'ticker': 'SPY', 'date': dates.date, 'close': closes}),
+                     'yfinance_ohlcv')
+        
+        db.execute("DROP TABLE IF EXISTS ml_predictions")
+        db.execute("""
+            CREATE TABLE ml_predictions (
+                ticker VARCHAR, date DATE, prediction_type VARCHAR, prediction INTEGER,
+                probability_up DOUBLE, probability_down DOUBLE, confidence DOUBLE
+            )
+        """)
+        proba_up = np.random.default_rng(4).uniform(0.2, 0.8, len(dates))
+        for model_type in ('xgboost', 'ensemble'):
+            db.insert_df(pd.DataFrame({
+                'ticker': 'SPY', 'date': dates.date, 'prediction_type': model_type,
+                'prediction': (proba_up > 0.5).astype(int), 'probability_up': proba_up,
+                'probability_down': 1 - proba_up, 'confidence': np.abs(proba_up - 0.5) * 2,
+            }), 'ml_predictions')
+        
+        yield db
+        db.close()
+    
+    def test_evaluates_joined_outcomes(self, evaluator, seeded_db):
+        """Test the last 5 price rows have no forward outcome and are dropped."""
+        results = evaluator.evaluate_model_predictions('SPY', 'ensemble')
+        
+        assert results['evaluation_period']['num_predictions'] == 35
+        assert results['classification_metrics']['support'] == 35
+        assert results['financial_metrics']['num_trades'] == 35
+    
+    def test_date_range_keeps_forward_prices(self, evaluator, seeded_db):
+        """Test end_date filters predictions without truncating the LEAD window."""
+        results = evaluator.evaluate_model_predictions(
+            'SPY', 'ensemble', start_date='2024-01-08', end_date='2024-02-09'
+        )
+        
+        df = results['predictions_df']
+        assert len(df) == 25
+        assert df['future_close'].notna().all()
+    
+    def test_roc_bundle_shared_with_report(self, evaluator, seeded_db):
+        """Test the ROC bundle is kept on the results and drives roc_auc."""
+        results = evaluator.evaluate_model_predictions('SPY', 'ensemble')
+        df = results['predictions_df']
+        
+        bundle = results['_roc_bundle']
+        assert bundle.auc == pytest.approx(
+            roc_auc_score(df['actual_outcome'], df['probability_up'])
+        )
+        assert results['classification_metrics']['roc_auc'] == bundle.auc
+    
+    def test_sql_summary_matches_full_evaluation(self, evaluator, seeded_db):
+        """Test the in-database aggregate reproduces the Python metrics."""
+        full = evaluator.evaluate_model_predictions(
+            'SPY', 'ensemble', start_date='2024-01-08', end_date='2024-02-09'
+        )
+        summary = evaluator.summarize_model_predictions(
+            'SPY', 'ensemble', start_date='2024-01-08', end_date='2024-02-09'
+        )
+        
+        assert summary['evaluation_period'] == full['evaluation_period']
+        assert summary['confusion_matrix'] == full['confusion_matrix']
+        assert summary['classification_metrics'] == pytest.approx(
+            full['classification_metrics'], rel=1e-5
+        )
+        assert summary['financial_metrics'] == pytest.approx(full['financial_metrics'], rel=1e-5)
+    
+    def test_compare_models(self, evaluator, seeded_db):
+        """Test all models are compared in one grouped query."""
+        with patch.object(type(seeded_db), 'query', wraps=seeded_db.query) as query:
+            comparison = evaluator.compare_models('SPY', ['xgboost', 'ensemble', 'missing'])
+        
+        assert query.call_count == 1
+        assert sorted(comparison['model_type']) == ['ensemble', 'xgboost']
+        assert (comparison['num_predictions'] == 35).all()
+    
+    def test_connection_looked_up_once(self, evaluator, seeded_db):
+        """Test the evaluator reuses its database connection across calls."""
+        with patch('modules.ml.evaluation.get_db_connection', return_value=seeded_db) as lookup:
+            evaluator.evaluate_model_predictions('SPY', 'ensemble')
+            evaluator.compare_models('SPY', ['xgboost', 'ensemble'])
+        
+        lookup.assert_called_once()
+    
+    def test_parameters_are_not_interpolated(self, evaluator, seeded_db):
+        """Test quoted input is treated as a literal ticker."""
+        with pytest.raises(ValueError, match="No predictions found"):
+            evaluator.evaluate_model_predictions("SPY' OR '1'='1", 'ensemble')
+
+    
+    def test_results_cached_until_data_changes(self, evaluator, seeded_db):
+        """Test repeat calls reuse results and new predictions invalidate them."""
+        first = evaluator.evaluate_model_predictions('SPY', 'ensemble')
+        first['classification_report'] = 'annotated by caller'
+        
+        with patch.object(type(seeded_db), 'query', wraps=seeded_db.query) as query:
+            second = evaluator.evaluate_model_predictions('SPY', 'ensemble')
+        assert query.call_count == 1  # data-version probe only
+        assert 'classification_report' not in second
+        assert second['classification_metrics'] == first['classification_metrics']
+        
+        seeded_db.execute("""
+            INSERT INTO ml_predictions
+            SELECT ticker, date + INTERVAL 1 DAY, prediction_type, prediction,
+                   probability_up, probability_down, confidence
+            FROM ml_predictions WHERE prediction_type = 'ensemble'
+            ORDER BY date DESC LIMIT 1
+        """)
+        with patch.object(type(seeded_db), 'query', wraps=seeded_db.query) as query:
+            evaluator.evaluate_model_predictions('SPY', 'ensemble')
+        assert query.call_count == 2
+
+class TestConfusionMatrix:
+    """Test cases for ModelEvaluator.get_confusion_matrix."""
+    
+    def test_matches_sklearn(self, evaluator, binary_predictions):
+        """Test binary tallies agree with sklearn's confusion_matrix."""
+        from sklearn.metrics import confusion_matrix
+        y_true, y_pred, _ = binary_predictions
+        
+        cm, cm_dict = evaluator.get_confusion_matrix(y_true, y_pred)
+        
+        np.testing.assert_array_equal(cm, confusion_matrix(y_true, y_pred))
+        assert cm_dict['true_positives'] == int(((y_true == 1) & (y_pred == 1)).sum())
+    
+    def test_single_class_still_binary(self, evaluator):
+        """Test all-negative input still yields a full 2x2 matrix."""
+        cm, cm_dict = evaluator.get_confusion_matrix(np.zeros(4), np.zeros(4))
+        
+        assert cm.shape == (2, 2)
+        assert cm_dict['true_negatives'] == 4
+
+
+class TestClassificationReport:
+    """Test cases for the confusion-matrix classification report."""
+    
+    @pytest.mark.parametrize('y_pred', [
+        np.array([1, 0, 1, 1, 0, 0]),
+        np.zeros(6, dtype=int),
+    ])
+    def test_matches_sklearn_layout(self, evaluator, y_pred):
+        """Test the report built from a confusion matrix equals sklearn's text."""
+        from sklearn.metrics import classification_report
+        y_true = np.array([1, 0, 0, 1, 1, 0])
+        cm, _ = evaluator.get_confusion_matrix(y_true, y_pred)
+        
+        report = evaluator.generate_classification_report(y_true, y_pred, cm=cm)
+        
+        assert report == classification_report(
+            y_true, y_pred, target_names=['DOWN', 'UP'], zero_division=0
+        )
+
+
+@pytest.mark.skipif(not PLOTTING_AVAILABLE, reason="matplotlib not installed")
+class TestPlots:
+    """Test cases for the evaluation plots."""
+    
+    def test_plots_written(self, evaluator, binary_predictions, tmp_path):
+        """Test ROC and confusion-matrix plots are saved to disk."""
+        y_true, y_pred, proba_up = binary_predictions
+        cm, _ = evaluator.get_confusion_matrix(y_true, y_pred)
+        
+        evaluator.plot_roc_curve(y_true, proba_up, save_path=str(tmp_path / 'roc.png'))
+        evaluator.plot_confusion_matrix(cm, save_path=str(tmp_path / 'cm.png'))
+        
+        assert (tmp_path / 'roc.png').exists()
+        assert (tmp_path / 'cm.png').exists()
+    
+    def test_uses_agg_backend(self, evaluator, tmp_path):
+        """Test plotting selects the non-interactive backend."""
+        import matplotlib
+        
+        evaluator.plot_confusion_matrix(np.array([[3, 1], [2, 4]]),
+                                        save_path=str(tmp_path / 'cm.png'))
+        
+        assert matplotlib.get_backend().lower() == 'agg'
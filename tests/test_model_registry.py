@@ -0,0 +1,746 @@
+"""
+Unit tests for the ML model registry.
+"""
+
+import json
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+
+from modules.ml import model_registry
+from modules.ml.model_registry import ModelMetadata, ModelRegistry, ModelStatus
+
+
+def make_metadata(model_id='SPY_xgboost_v1', version='1.0.0', ticker='SPY',
+                  model_type='xgboost', trained_at='2024-01-02T00:00:00', **overrides):
+    """ModelMetadata with small but complete defaults."""
+    fields = dict(
+        model_id=model_id,
+        model_name=f'{ticker} {model_type}',
+        version=version,
+        ticker=ticker,
+        model_type=model_type,
+        algorithm='gradient_boosting',
+        trained_at=trained_at,
+        training_duration_seconds=1.5,
+        n_train_samples=100,
+        n_features=2,
+        feature_names=['rsi', 'macd'],
+        target_variable='direction',
+        data_start_date='2020-01-01',
+        data_end_date='2023-12-31',
+        train_metrics={'f1': 0.7},
+        val_metrics={'f1': 0.6},
+        test_metrics={'f1': 0.55},
+        hyperparameters={'max_depth': 3},
+    )
+    fields.update(overrides)
+    return ModelMetadata(**fields)
+
+
+@pytest.fixture
+def duckdb(tmp_path, monkeypatch):
+    """Fresh DuckDB database served by get_db_connection."""
+    from modules.database.factory import DuckDBBackend
+    
+    monkeypatch.setenv('DATABASE_BACKEND', 'duckdb')
+    db = DuckDBBackend(db_path=tmp_path / 'registry.duckdb')
+    with patch('modules.database.factory.get_db_connection', return_value=db):
+        yield db
+    db.close()
+
+
+@pytest.fixture
+def registry(tmp_path):
+    """Registry that only writes to disk."""
+    return ModelRegistry(registry_dir=str(tmp_path / 'registry'), persist_to_db=False)
+
+
+class TestModelMetadata:
+    """Test cases for model metadata."""
+    
+    def test_round_trip(self):
+        """Test metadata survives to_dict/from_dict with defaults filled in."""
+        metadata = make_metadata()
+        
+        restored = ModelMetadata.from_dict(metadata.to_dict())
+        
+        assert restored == metadata
+        assert restored.trained_by == 'system'
+        assert restored.status == ModelStatus.STAGING.value
+        assert restored.tags == []
+    
+    def test_to_dict_is_shallow(self):
+        """Test to_dict lists every field and shares containers instead of copying."""
+        metadata = make_metadata()
+        
+        data = metadata.to_dict()
+        
+        assert list(data) == list(ModelMetadata.__dataclass_fields__)
+        assert data['feature_names'] is metadata.feature_names
+        assert data['test_metrics'] is metadata.test_metrics
+    
+    def test_import_does_not_load_pandas(self):
+        """Test importing the registry leaves pandas unloaded until it is needed."""
+        import subprocess
+        import sys
+        
+        code = "import sys, modules.ml.model_registry; print('pandas' in sys.modules)"
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        
+        assert result.stdout.strip() == 'False'
+    
+    def test_slots(self):
+        """Test metadata has no per-instance __dict__ and rejects unknown attributes."""
+        metadata = make_metadata()
+        
+        assert not hasattr(metadata, '__dict__')
+        with pytest.raises(AttributeError):
+            metadata.not_a_field = 1
+        assert pickle.loads(pickle.dumps(metadata)) == metadata
+
+
+class TestPersistToDatabase:
+    """Test cases for writing registry rows to the database."""
+    
+    def test_row_written_and_replaced(self, tmp_path, duckdb):
+        """Test registering then promoting leaves one row with the latest status."""
+        registry = ModelRegistry(registry_dir=str(tmp_path / 'registry'))
+        
+        registry.register_model({'weights': [1, 2]}, make_metadata())
+        registry.promote_to_production('SPY_xgboost_v1')
+        registry.flush_to_db()
+        
+        rows = duckdb.query('SELECT * FROM model_registry')
+        assert len(rows) == 1
+        row = rows.iloc[0]
+        assert row['model_version'] == '1.0.0'
+        assert row['status'] == ModelStatus.PRODUCTION.value
+        assert json.loads(row['feature_names']) == ['rsi', 'macd']
+        assert json.loads(row['validation_metrics']) == {'f1': 0.6}
+        assert os.path.basename(row['artifact_path']).startswith('model.pkl')
+        assert row['promoted_at'] is not None
+    
+    def test_promotion_written_in_one_batch(self, tmp_path, duckdb):
+        """Test demotions and the promotion reach the database in a single call."""
+        registry = ModelRegistry(registry_dir=str(tmp_path / 'registry'))
+        registry.register_model({}, make_metadata('old'), promote_to_production=True)
+        registry.register_model({}, make_metadata('new', version='1.1.0'))
+        registry.flush_to_db()
+        
+        with patch.object(duckdb, 'execute_many', wraps=duckdb.execute_many) as execute_many:
+            registry.promote_to_production('new')
+            registry.flush_to_db()
+        
+        execute_many.assert_called_once()
+        assert [row[0] for row in execute_many.call_args[0][1]] == ['old', 'new']
+        statuses = duckdb.query('SELECT model_id, status FROM model_registry ORDER BY model_id')
+        assert statuses.set_index('model_id')['status'].to_dict() == {
+            'new': ModelStatus.PRODUCTION.value, 'old': ModelStatus.ARCHIVED.value
+        }
+    
+    def test_duckdb_uses_same_upsert_as_postgresql(self, tmp_path, duckdb):
+        """Test DuckDB runs the shared ON CONFLICT upsert, updating only the mutable columns."""
+        from modules.ml.model_registry import _UPSERT_SQL
+        
+        registry = ModelRegistry(registry_dir=str(tmp_path / 'registry'))
+        registry.register_model({}, make_metadata())
+        registry.flush_to_db()
+        
+        with patch.object(duckdb, 'execute_many', wraps=duckdb.execute_many) as execute_many:
+            registry.update_metadata('SPY_xgboost_v1', {'model_name': 'renamed'})
+            registry.promote_to_production('SPY_xgboost_v1')
+            registry.flush_to_db()
+        
+        assert {c.args[0] for c in execute_many.call_args_list} == {_UPSERT_SQL.replace('%s', '?')}
+        row = duckdb.query('SELECT * FROM model_registry').iloc[0]
+        assert row['status'] == ModelStatus.PRODUCTION.value
+        assert row['model_name'] == 'SPY xgboost'
+    
+    def test_db_row_matches_columns(self):
+        """Test the row tuple lines up with the column list."""
+        from modules.ml.model_registry import _DB_COLUMNS
+        
+        row = dict(zip(_DB_COLUMNS, ModelRegistry._db_row(make_metadata(model_path='m.pkl'))))
+        
+        assert len(row) == len(_DB_COLUMNS)
+        assert row['model_version'] == '1.0.0'
+        assert row['artifact_path'] == 'm.pkl'
+        assert json.loads(row['hyperparameters']) == {'max_depth': 3}
+        assert row['promoted_at'] is None
+    
+    def test_postgresql_rows_use_json_adapter(self, tmp_path, monkeypatch):
+        """Test PostgreSQL rows hand JSON columns to psycopg2 as adapted objects."""
+        from psycopg2.extras import Json
+        from modules.ml.model_registry import _DB_COLUMNS, _UPSERT_SQL
+        
+        monkeypatch.setenv('DATABASE_BACKEND', 'postgresql')
+        db = MagicMock()
+        registry = ModelRegistry(registry_dir=str(tmp_path / 'registry'))
+        
+        with patch('modules.database.factory.get_db_connection', return_value=db):
+            registry.register_model({}, make_metadata(hyperparameters={'max_depth': np.int64(3)}))
+            registry.flush_to_db()
+        
+        name, sql, rows = db.execute_prepared.call_args[0]
+        row = dict(zip(_DB_COLUMNS, rows[0]))
+        assert (name, sql) == ('upsert_model_registry', _UPSERT_SQL)
+        assert isinstance(row['feature_names'], Json)
+        assert row['feature_names'].adapted == ['rsi', 'macd']
+        assert json.loads(row['hyperparameters'].dumps(row['hyperparameters'].adapted)) == {'max_depth': 3}
+    
+    def test_sync_to_db_bulk_loads_missing_models(self, tmp_path, duckdb):
+        """Test sync_to_db copies only models the table lacks, in one bulk call."""
+        registry = ModelRegistry(registry_dir=str(tmp_path / 'registry'), persist_to_db=False)
+        registry.register_model({}, make_metadata('a', feature_names=['tab\there', 'new\nline']))
+        registry.register_model({}, make_metadata('b', version='1.1.0'))
+        registry.persist_to_db = True
+        registry.promote_to_production('b')
+        
+        with patch.object(duckdb, 'copy_rows', wraps=duckdb.copy_rows) as copy_rows:
+            assert registry.sync_to_db() == 1
+        
+        copy_rows.assert_called_once()
+        rows = duckdb.query('SELECT * FROM model_registry ORDER BY model_id').set_index('model_id')
+        assert json.loads(rows.loc['a', 'feature_names']) == ['tab\there', 'new\nline']
+        assert rows.loc['a', 'trained_at'] == pd.Timestamp('2024-01-02')
+        assert rows.loc['b', 'status'] == ModelStatus.PRODUCTION.value
+        assert registry.sync_to_db() == 0
+    
+    def test_failure_does_not_raise(self, tmp_path):
+        """Test a database error doesn't fail registration but is reported by flush_to_db."""
+        registry = ModelRegistry(registry_dir=str(tmp_path / 'registry'))
+        
+        with patch('modules.database.factory.get_db_connection', side_effect=RuntimeError('down')):
+            assert registry.register_model({}, make_metadata()) == 'SPY_xgboost_v1'
+            with pytest.raises(RuntimeError, match='SPY_xgboost_v1') as excinfo:
+                registry.flush_to_db()
+        
+        assert str(excinfo.value.__cause__) == 'down'
+        registry.flush_to_db()
+    
+    def test_writes_do_not_block_callers(self, tmp_path, duckdb):
+        """Test registration returns while the database write is still in flight."""
+        import threading
+        
+        release = threading.Event()
+        original = duckdb.execute_many
+        
+        def slow_execute_many(sql, params_seq):
+            release.wait(5)
+            original(sql, params_seq)
+        
+        registry = ModelRegistry(registry_dir=str(tmp_path / 'registry'))
+        with patch.object(duckdb, 'execute_many', side_effect=slow_execute_many):
+            registry.register_model({}, make_metadata())
+            assert duckdb.get_row_count('model_registry') == 0
+            release.set()
+            registry.flush_to_db()
+        
+        assert duckdb.get_row_count('model_registry') == 1
+    
+    def test_queued_writes_are_batched_and_drained_at_stop(self, tmp_path):
+        """Test queued updates coalesce into one row per model and stop drains the queue."""
+        import threading
+        
+        busy, release = threading.Event(), threading.Event()
+        batches = []
+        
+        def write(metadatas):
+            busy.set()
+            release.wait(5)
+            batches.append([(m.model_id, m.description) for m in metadatas])
+        
+        registry = ModelRegistry(registry_dir=str(tmp_path / 'registry'))
+        with patch.object(model_registry, '_write_to_database', side_effect=write):
+            registry._persist_many([make_metadata('first')])
+            busy.wait(5)
+            # Queued while the worker is busy with the first write
+            registry._persist_many([make_metadata('a')])
+            registry._persist_many([make_metadata('b'), make_metadata('a', description='final')])
+            registry._persist_many([make_metadata('c')])
+            release.set()
+            model_registry._flush_and_stop()
+        
+        assert batches == [
+            [('first', None)],
+            [('a', 'final'), ('b', None), ('c', None)],
+        ]
+        assert model_registry._DB_THREAD is None
+    
+    def test_registries_share_one_worker_and_are_not_kept_alive(self, tmp_path):
+        """Test registries queue to one worker thread that holds no reference to them."""
+        import gc
+        import weakref
+        
+        first = ModelRegistry(registry_dir=str(tmp_path / 'first'))
+        second = ModelRegistry(registry_dir=str(tmp_path / 'second'))
+        with patch.object(model_registry, '_write_to_database'):
+            first._persist_many([make_metadata('a')])
+            thread = model_registry._DB_THREAD
+            second._persist_many([make_metadata('b')])
+            second.flush_to_db()
+        
+        assert model_registry._DB_THREAD is thread
+        ref = weakref.ref(first)
+        del first
+        gc.collect()
+        assert ref() is None
+
+
+class TestRegistry:
+    """Test cases for registering and loading models."""
+    
+    def test_register_and_load(self, registry):
+        """Test a registered model loads back with its metadata."""
+        registry.register_model({'weights': [1, 2]}, make_metadata())
+        
+        model, metadata = registry.load_model('SPY_xgboost_v1')
+        
+        assert model == {'weights': [1, 2]}
+        assert os.path.basename(metadata.model_path).startswith('model.pkl')
+        assert ModelRegistry(registry_dir=str(registry.registry_dir), persist_to_db=False).models == {
+            'SPY_xgboost_v1': metadata
+        }
+    
+    def test_promotion_demotes_previous_production(self, registry):
+        """Test promoting a model archives the ticker's current production model."""
+        registry.register_model({}, make_metadata('old'), promote_to_production=True)
+        registry.register_model({}, make_metadata('new', version='1.1.0'))
+        
+        registry.promote_to_production('new')
+        
+        assert registry.models['old'].status == ModelStatus.ARCHIVED.value
+        assert registry.models['new'].status == ModelStatus.PRODUCTION.value
+        assert registry.get_production_model('SPY')[1].model_id == 'new'
+
+
+class TestSerialization:
+    """Test cases for model and artifact files."""
+    
+    def test_plain_pickle_still_loads(self, registry):
+        """Test a model file written before compression loads unchanged."""
+        registry.register_model({}, make_metadata())
+        legacy_path = registry.registry_dir / 'SPY_xgboost_v1' / 'legacy.pkl'
+        legacy_path.write_bytes(pickle.dumps({'weights': [3]}))
+        registry.update_metadata('SPY_xgboost_v1', {'model_path': str(legacy_path)})
+        
+        assert registry.load_model('SPY_xgboost_v1')[0] == {'weights': [3]}
+    
+    def test_zstd_round_trip(self, registry):
+        """Test models and artifacts are zstd-compressed when zstandard is installed."""
+        pytest.importorskip('zstandard')
+        from modules.ml.model_registry import _ZSTD_MAGIC
+        
+        registry.register_model({'weights': list(range(100))}, make_metadata(),
+                                artifacts={'report': {'f1': 0.5}})
+        
+        model_path = registry.models['SPY_xgboost_v1'].model_path
+        assert model_path.endswith('model.pkl.zst')
+        with open(model_path, 'rb') as f:
+            assert f.read(4) == _ZSTD_MAGIC
+        assert registry.load_model('SPY_xgboost_v1')[0] == {'weights': list(range(100))}
+    
+    def test_zstd_file_without_zstandard(self, tmp_path, monkeypatch):
+        """Test a compressed file names the missing dependency."""
+        from modules.ml import model_registry
+        
+        monkeypatch.setattr(model_registry, 'ZSTD_AVAILABLE', False)
+        path = tmp_path / 'model.pkl.zst'
+        path.write_bytes(model_registry._ZSTD_MAGIC + b'rest')
+        
+        with pytest.raises(ImportError, match='zstandard'):
+            model_registry._load_pickle(str(path))
+
+
+class TestJsonFiles:
+    """Test cases for registry JSON files."""
+    
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_registry_and_export_round_trip(self, tmp_path, monkeypatch, use_orjson):
+        """Test registry.json, metadata.json and exports with and without orjson."""
+        from modules.ml import model_registry
+        
+        if use_orjson and not model_registry.ORJSON_AVAILABLE:
+            pytest.skip('orjson not installed')
+        monkeypatch.setattr(model_registry, 'ORJSON_AVAILABLE', use_orjson)
+        registry = ModelRegistry(registry_dir=str(tmp_path / 'registry'), persist_to_db=False)
+        metadata = make_metadata(hyperparameters={'max_depth': 3, 'eta': 0.1})
+        
+        registry.register_model({}, metadata)
+        registry.export_registry(str(tmp_path / 'export.json'))
+        
+        reopened = ModelRegistry(registry_dir=str(tmp_path / 'registry'), persist_to_db=False)
+        assert reopened.models['SPY_xgboost_v1'].hyperparameters == {'max_depth': 3, 'eta': 0.1}
+        saved = json.loads((tmp_path / 'registry' / 'SPY_xgboost_v1' / 'metadata.json').read_text())
+        assert saved['feature_names'] == ['rsi', 'macd']
+        exported = json.loads((tmp_path / 'export.json').read_text())
+        assert list(exported['registry']) == ['SPY_xgboost_v1']
+        assert 'exported_at' in exported
+    
+    def test_export_streams_every_model(self, registry, tmp_path):
+        """Test the streamed export is one valid JSON document, including an empty registry."""
+        export_path = tmp_path / 'export.json'
+        registry.export_registry(str(export_path))
+        assert json.loads(export_path.read_text())['registry'] == {}
+        
+        registry.register_model({}, make_metadata('a'))
+        registry.register_model({}, make_metadata('b"quoted', version='1.1.0'))
+        registry.export_registry(str(export_path))
+        
+        exported = json.loads(export_path.read_text())
+        assert list(exported['registry']) == ['a', 'b"quoted']
+        assert exported['registry']['a'] == json.loads(json.dumps(registry.models['a'].to_dict()))
+
+
+class TestDelete:
+    """Test cases for deleting models."""
+    
+    def test_directory_moved_aside_then_removed(self, registry):
+        """Test delete renames the model directory into .trash and removes it in the background."""
+        from modules.ml import model_registry
+        
+        registry.register_model({}, make_metadata())
+        model_dir = registry.registry_dir / 'SPY_xgboost_v1'
+        
+        with patch.object(model_registry, '_DELETE_EXECUTOR') as executor:
+            registry.delete_model('SPY_xgboost_v1', confirm=True)
+        
+        assert not model_dir.exists()
+        (func, trash), kwargs = executor.submit.call_args
+        assert func is model_registry.shutil.rmtree
+        assert trash.parent == registry.trash_dir
+        assert trash.name.startswith('SPY_xgboost_v1-')
+        assert (trash / 'metadata.json').exists()
+        assert 'SPY_xgboost_v1' not in registry.models
+        
+        func(trash, **kwargs)
+        registry.register_model({}, make_metadata())
+        assert model_dir.exists()
+    
+    def test_leftover_trash_removed_on_open(self, registry):
+        """Test directories left in .trash by an earlier run are cleaned up."""
+        from modules.ml import model_registry
+        
+        leftover = registry.trash_dir / 'old-model'
+        leftover.mkdir(parents=True)
+        (leftover / 'model.pkl').write_bytes(b'x')
+        
+        ModelRegistry(registry_dir=str(registry.registry_dir), persist_to_db=False)
+        model_registry._DELETE_EXECUTOR.submit(lambda: None).result()
+        
+        assert not leftover.exists()
+
+
+class TestReports:
+    """Test cases for history and comparison DataFrames."""
+    
+    @pytest.fixture
+    def reports(self, registry):
+        registry.register_model({}, make_metadata('v1', trained_at='2024-01-01T00:00:00',
+                                                  test_metrics={'f1': 0.5}))
+        registry.register_model({}, make_metadata('v2', version='1.1.0', trained_at='2024-02-01T00:00:00',
+                                                  test_metrics={'f1': 0.6}))
+        registry.register_model({}, make_metadata('qqq', ticker='QQQ', test_metrics={}))
+        return registry
+    
+    def test_model_history(self, reports):
+        """Test history rows are the ticker's models, newest first."""
+        history = reports.get_model_history('SPY')
+        
+        assert history.columns.tolist() == [
+            'model_id', 'version', 'model_type', 'trained_at', 'status',
+            'train_f1', 'val_f1', 'test_f1', 'n_train_samples', 'n_features'
+        ]
+        assert history['model_id'].tolist() == ['v2', 'v1']
+        assert history['test_f1'].tolist() == [0.6, 0.5]
+        assert reports.get_model_history('IWM').empty
+    
+    def test_compare_models(self, reports):
+        """Test comparison sorts by the metric and skips unknown models."""
+        comparison = reports.compare_models(['v1', 'missing', 'v2', 'qqq'])
+        
+        assert comparison['model_id'].tolist() == ['v2', 'v1', 'qqq']
+        assert comparison['test_metrics.f1'].tolist()[:2] == [0.6, 0.5]
+        assert pd.isna(comparison['test_metrics.f1'].iloc[2])
+        assert reports.compare_models(['missing']).empty
+    
+    def test_compare_models_metric_paths(self, reports):
+        """Test top-level, nested and unknown metric paths without serializing metadata."""
+        with patch.object(ModelMetadata, 'to_dict', side_effect=AssertionError):
+            assert reports.compare_models(['v1'], metric='n_features')['n_features'].tolist() == [2]
+            assert reports.compare_models(['v1'], metric='val_metrics.f1')['val_metrics.f1'].tolist() == [0.6]
+            assert reports.compare_models(['v1'], metric='test_metrics.f1.extra')['test_metrics.f1.extra'].isna().all()
+            assert reports.compare_models(['v1'], metric='nope.f1')['nope.f1'].isna().all()
+
+
+    def test_statistics(self, reports):
+        """Test statistics count models by status, type and ticker."""
+        reports.promote_to_production('v2')
+        
+        stats = reports.get_statistics()
+        
+        assert stats == {
+            'total_models': 3,
+            'by_status': {ModelStatus.STAGING.value: 2, ModelStatus.PRODUCTION.value: 1},
+            'by_model_type': {'xgboost': 3},
+            'by_ticker': {'SPY': 2, 'QQQ': 1},
+            'production_models': 1,
+        }
+        assert all(type(counts) is dict for counts in list(stats.values())[1:4])
+
+
+class TestModelCache:
+    """Test cases for the loaded-model LRU cache."""
+    
+    def test_repeat_loads_skip_unpickling(self, registry):
+        """Test a cached model is returned without reading it from disk again."""
+        registry.register_model({'weights': [1]}, make_metadata())
+        
+        with patch('modules.ml.model_registry._load_pickle', return_value={'weights': [1]}) as load:
+            first, _ = registry.load_model('SPY_xgboost_v1')
+            second, _ = registry.load_model('SPY_xgboost_v1')
+        
+        assert load.call_count == 1
+        assert first is second
+    
+    def test_least_recently_used_is_evicted(self, tmp_path):
+        """Test the cache holds at most cache_size models, dropping the oldest use."""
+        registry = ModelRegistry(registry_dir=str(tmp_path), persist_to_db=False, cache_size=2)
+        for name in ('a', 'b', 'c'):
+            registry.register_model({'name': name}, make_metadata(name))
+        
+        registry.load_model('a')
+        registry.load_model('b')
+        registry.load_model('a')
+        registry.load_model('c')
+        
+        assert list(registry._model_cache) == ['a', 'c']
+    
+    def test_mutations_invalidate(self, registry):
+        """Test update, promotion, re-registration and delete drop cached models."""
+        registry.register_model({'v': 1}, make_metadata())
+        
+        for mutate in (
+            lambda: registry.update_metadata('SPY_xgboost_v1', {'description': 'x'}),
+            lambda: registry.promote_to_production('SPY_xgboost_v1'),
+            lambda: registry.register_model({'v': 2}, make_metadata()),
+        ):
+            registry.load_model('SPY_xgboost_v1')
+            mutate()
+            assert 'SPY_xgboost_v1' not in registry._model_cache
+        
+        assert registry.load_model('SPY_xgboost_v1')[0] == {'v': 2}
+        registry.update_metadata('SPY_xgboost_v1', {'status': ModelStatus.ARCHIVED.value})
+        registry.load_model('SPY_xgboost_v1')
+        registry.delete_model('SPY_xgboost_v1', confirm=True)
+        assert not registry._model_cache
+    
+    def test_zero_size_disables_cache(self, tmp_path):
+        """Test cache_size=0 always reads from disk."""
+        registry = ModelRegistry(registry_dir=str(tmp_path), persist_to_db=False, cache_size=0)
+        registry.register_model({}, make_metadata())
+        
+        registry.load_model('SPY_xgboost_v1')
+        
+        assert not registry._model_cache
+
+
+class TestWriteAheadLog:
+    """Test cases for the registry write-ahead log."""
+    
+    def test_mutations_append_instead_of_rewriting(self, registry):
+        """Test each mutation appends one WAL line and leaves registry.json alone."""
+        registry.register_model({}, make_metadata('a'))
+        registry.register_model({}, make_metadata('b', version='1.1.0'))
+        registry.update_metadata('a', {'description': 'retrained'})
+        registry.delete_model('b', confirm=True)
+        
+        assert not registry.metadata_file.exists()
+        events = [json.loads(line) for line in registry.wal_file.read_text().splitlines()]
+        assert [(e['op'], e['model_id']) for e in events] == [
+            ('upsert', 'a'), ('upsert', 'b'), ('upsert', 'a'), ('delete', 'b')
+        ]
+    
+    def test_reopen_replays_log_over_snapshot(self, registry):
+        """Test reopening applies logged upserts, promotions and deletes to the snapshot."""
+        registry.register_model({}, make_metadata('old'), promote_to_production=True)
+        registry._save_registry()
+        registry.register_model({}, make_metadata('new', version='1.1.0'), promote_to_production=True)
+        registry.register_model({}, make_metadata('tmp', version='1.2.0'))
+        registry.delete_model('tmp', confirm=True)
+        
+        reopened = ModelRegistry(registry_dir=str(registry.registry_dir), persist_to_db=False)
+        
+        assert reopened.models == registry.models
+        assert reopened.get_production_model('SPY')[1].model_id == 'new'
+        assert reopened.models['old'].status == ModelStatus.ARCHIVED.value
+    
+    def test_compaction_after_threshold(self, registry, monkeypatch):
+        """Test the log is folded into registry.json once it reaches the threshold."""
+        from modules.ml import model_registry
+        
+        monkeypatch.setattr(model_registry, '_WAL_COMPACT_EVENTS', 3)
+        for i in range(4):
+            registry.register_model({}, make_metadata(f'm{i}', version=f'1.{i}.0'))
+        
+        snapshot = json.loads(registry.metadata_file.read_text())
+        assert list(snapshot) == ['m0', 'm1', 'm2']
+        assert len(registry.wal_file.read_text().splitlines()) == 1
+        reopened = ModelRegistry(registry_dir=str(registry.registry_dir), persist_to_db=False)
+        assert list(reopened.models) == ['m0', 'm1', 'm2', 'm3']
+    
+    def test_failed_snapshot_keeps_previous_registry(self, registry):
+        """Test a crash while writing the snapshot leaves the old registry.json readable."""
+        registry.register_model({}, make_metadata('a'))
+        registry._save_registry()
+        registry.register_model({}, make_metadata('b', version='1.1.0'))
+        
+        with patch('modules.ml.model_registry.os.replace', side_effect=OSError('disk full')):
+            with pytest.raises(OSError):
+                registry._save_registry()
+        
+        assert list(json.loads(registry.metadata_file.read_text())) == ['a']
+        reopened = ModelRegistry(registry_dir=str(registry.registry_dir), persist_to_db=False)
+        assert list(reopened.models) == ['a', 'b']
+    
+    def test_torn_last_line_is_skipped(self, registry):
+        """Test a partially written final entry does not prevent loading."""
+        registry.register_model({}, make_metadata('a'))
+        with open(registry.wal_file, 'ab') as f:
+            f.write(b'{"op": "upsert", "model_id": "b", "me')
+        
+        reopened = ModelRegistry(registry_dir=str(registry.registry_dir), persist_to_db=False)
+        
+        assert list(reopened.models) == ['a']
+
+
+class TestArtifacts:
+    """Test cases for artifact storage formats."""
+    
+    def test_native_formats_round_trip(self, registry):
+        """Test each common artifact type gets its own format and loads back equal."""
+        artifacts = {
+            'importances': np.array([0.25, 0.75]),
+            'predictions': pd.DataFrame({'proba': [0.1, 0.9], 'label': [0, 1]}),
+            'report': {'f1': 0.5, 'n': 10},
+            'config': {'nested': {'a': 1}},
+        }
+        registry.register_model({}, make_metadata(), artifacts=artifacts)
+        
+        index = json.loads(
+            (registry.registry_dir / 'SPY_xgboost_v1' / 'artifacts' / 'artifacts.index.json').read_text()
+        )
+        assert index['importances'] == 'importances.npy'
+        assert index['report'] == 'report.json'
+        assert index['config'].startswith('config.pkl')
+        
+        np.testing.assert_array_equal(registry.load_artifact('SPY_xgboost_v1', 'importances'),
+                                      artifacts['importances'])
+        pd.testing.assert_frame_equal(registry.load_artifact('SPY_xgboost_v1', 'predictions'),
+                                      artifacts['predictions'])
+        assert registry.load_artifact('SPY_xgboost_v1', 'report') == artifacts['report']
+        assert registry.load_artifact('SPY_xgboost_v1', 'config') == artifacts['config']
+    
+    def test_object_arrays_and_odd_frames_are_pickled(self, registry):
+        """Test artifacts the native formats can't hold fall back to pickle."""
+        artifacts = {
+            'labels': np.array(['up', None], dtype=object),
+            'matrix': pd.DataFrame([[1, 2], [3, 4]]),  # Integer column names
+        }
+        registry.register_model({}, make_metadata(), artifacts=artifacts)
+        
+        np.testing.assert_array_equal(registry.load_artifact('SPY_xgboost_v1', 'labels'),
+                                      artifacts['labels'])
+        pd.testing.assert_frame_equal(registry.load_artifact('SPY_xgboost_v1', 'matrix'),
+                                      artifacts['matrix'])
+    
+    def test_legacy_pickled_artifacts(self, registry):
+        """Test artifacts saved before the index existed still load."""
+        registry.register_model({}, make_metadata(), artifacts={'report': {'f1': 0.5}})
+        artifacts_dir = registry.registry_dir / 'SPY_xgboost_v1' / 'artifacts'
+        for path in artifacts_dir.iterdir():
+            path.unlink()
+        (artifacts_dir / 'old.pkl').write_bytes(pickle.dumps([1, 2]))
+        
+        assert registry.load_artifact('SPY_xgboost_v1', 'old') == [1, 2]
+        with pytest.raises(ValueError, match='Artifact not found'):
+            registry.load_artifact('SPY_xgboost_v1', 'missing')
+
+
+class TestLookups:
+    """Test cases for the registry's secondary indexes."""
+    
+    @pytest.fixture
+    def populated(self, registry):
+        """Registry with two tickers, two model types and one production model."""
+        registry.register_model({}, make_metadata('spy_x1'))
+        registry.register_model({}, make_metadata('spy_l1', model_type='lightgbm'))
+        registry.register_model({}, make_metadata('qqq_x1', ticker='QQQ'))
+        registry.register_model({}, make_metadata('spy_x2', version='1.1.0',
+                                                  trained_at='2024-02-01T00:00:00'),
+                                promote_to_production=True)
+        return registry
+    
+    @staticmethod
+    def scan(registry, ticker=None, status=None, model_type=None):
+        """Reference result from a full scan of the registry."""
+        return [
+            mid for mid, meta in registry.models.items()
+            if (not ticker or meta.ticker == ticker)
+            and (not status or meta.status == status)
+            and (not model_type or meta.model_type == model_type)
+        ]
+    
+    @pytest.mark.parametrize('filters', [
+        {}, {'ticker': 'SPY'}, {'status': 'staging'}, {'model_type': 'xgboost'},
+        {'ticker': 'SPY', 'model_type': 'xgboost'}, {'ticker': 'SPY', 'status': 'production'},
+        {'ticker': 'SPY', 'status': 'staging', 'model_type': 'xgboost'}, {'ticker': 'IWM'},
+    ])
+    def test_list_models_matches_scan(self, populated, filters):
+        """Test indexed filtering returns what a full scan would, in registry order."""
+        assert populated.list_models(**filters) == self.scan(populated, **filters)
+    
+    def test_indexes_follow_mutations(self, populated):
+        """Test promotion, metadata updates and deletion keep the indexes current."""
+        populated.promote_to_production('spy_x1')
+        populated.update_metadata('spy_l1', {'ticker': 'QQQ'})
+        populated.delete_model('qqq_x1', confirm=True)
+        
+        assert populated.list_models(status='production') == ['spy_x1']
+        assert populated.list_models(status='archived') == ['spy_x2']
+        assert populated.list_models(ticker='QQQ') == ['spy_l1']
+        assert 'qqq_x1' not in populated.list_models()
+        assert populated.get_model_history('SPY')['model_id'].tolist() == ['spy_x2', 'spy_x1']
+    
+    def test_status_change_keeps_registration_order(self, registry):
+        """Test a promoted or archived model keeps its place in filtered results."""
+        for model_id in ('m1', 'm2', 'm3'):
+            registry.register_model({}, make_metadata(model_id))
+        registry.register_model({}, make_metadata('m4', model_type='lightgbm'))
+        
+        registry.promote_to_production('m1')
+        registry.update_metadata('m2', {'status': ModelStatus.ARCHIVED.value})
+        
+        assert registry.list_models(ticker='SPY') == ['m1', 'm2', 'm3', 'm4']
+        assert registry.list_models(ticker='SPY', model_type='xgboost') == ['m1', 'm2', 'm3']
+        for status in ('staging', 'production', 'archived'):
+            assert registry.list_models(status=status) == self.scan(registry, status=status)
+        assert registry.rollback_to_version('SPY', '1.0.0') == 'm1'
+    
+    def test_indexes_rebuilt_on_load(self, populated):
+        """Test a registry reopened from disk answers lookups the same way."""
+        reopened = ModelRegistry(registry_dir=str(populated.registry_dir), persist_to_db=False)
+        
+        assert reopened.get_production_model('SPY', 'xgboost')[1].model_id == 'spy_x2'
+        assert reopened.list_models(ticker='SPY') == populated.list_models(ticker='SPY')
+        assert reopened.rollback_to_version('SPY', '1.0.0') == 'spy_x1'
+    
+    def test_no_production_model(self, populated):
+        """Test a ticker without a production model raises."""
+        with pytest.raises(ValueError, match='No production model'):
+            populated.get_production_model('QQQ')
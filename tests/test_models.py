@@ -0,0 +1,376 @@
+"""
+Unit tests for the ML model wrappers.
+"""
+
+import os
+import pickle
+import threading
+import pytest
+import numpy as np
+import pandas as pd
+import lightgbm as lgb
+import xgboost as xgb
+from unittest.mock import patch
+
+from modules.ml import models
+from modules.ml.models import BaseModel, EnsembleModel, LightGBMModel, XGBoostModel
+
+
+@pytest.fixture
+def dataset():
+    """Small separable classification problem."""
+    rng = np.random.default_rng(0)
+    n = 200
+    X = pd.DataFrame(rng.normal(size=(n, 4)), columns=[f'f{i}' for i in range(4)])
+    y = pd.Series((X['f0'] + 0.5 * X['f1'] + rng.normal(0, 0.5, n) > 0).astype(int))
+    return X, y
+
+
+class TestXGBoostModel:
+    """Test cases for the XGBoost wrapper."""
+    
+    def test_histogram_on_detected_device(self):
+        """Test hist tree building on CUDA only when the probe finds a usable GPU."""
+        with patch.object(models, '_xgboost_cuda_available', return_value=True):
+            assert XGBoostModel().params['device'] == 'cuda'
+        with patch.object(models, '_xgboost_cuda_available', return_value=False):
+            params = XGBoostModel().params
+        
+        assert params['tree_method'] == 'hist'
+        assert params['device'] == 'cpu'
+        assert XGBoostModel(device='cpu').params['device'] == 'cpu'
+    
+    def test_fit_passes_arrays(self, dataset):
+        """Test training hands NumPy arrays to XGBoost while keeping feature names."""
+        X, y = dataset
+        model = XGBoostModel(n_estimators=10, device='cpu')
+        
+        with patch.object(models.xgb.XGBClassifier, 'fit', autospec=True,
+                          side_effect=models.xgb.XGBClassifier.fit) as fit:
+            model.fit(X, y, eval_set=[(X, y)])
+        
+        args, kwargs = fit.call_args
+        assert isinstance(args[1], np.ndarray)
+        assert isinstance(kwargs['eval_set'][0][0], np.ndarray)
+        assert model.feature_names == ['f0', 'f1', 'f2', 'f3']
+        assert model.predict_proba(X).shape == (len(X), 2)
+        assert model.get_feature_importance()['feature'].iloc[0] == 'f0'
+
+
+class TestLightGBMModel:
+    """Test cases for the LightGBM wrapper."""
+    
+    def test_cuda_params_when_available(self):
+        """Test CUDA training settings are added only when the probe succeeds."""
+        with patch.object(models, '_lightgbm_cuda_available', return_value=True):
+            params = LightGBMModel().params
+        with patch.object(models, '_lightgbm_cuda_available', return_value=False):
+            cpu_params = LightGBMModel().params
+        
+        assert (params['device_type'], params['gpu_use_dp'], params['max_bin']) == ('cuda', False, 63)
+        assert 'device_type' not in cpu_params and 'max_bin' not in cpu_params
+    
+    def test_max_depth_clamps_num_leaves_on_cuda(self):
+        """Test a user max_depth bounds num_leaves, with a warning, on the CUDA learner."""
+        with patch.object(models, '_lightgbm_cuda_available', return_value=True):
+            with pytest.warns(UserWarning, match='max_depth=4'):
+                params = LightGBMModel(num_leaves=63, max_depth=4).params
+            assert LightGBMModel(num_leaves=7, max_depth=4).params['num_leaves'] == 7
+        with patch.object(models, '_lightgbm_cuda_available', return_value=False):
+            assert LightGBMModel(num_leaves=63, max_depth=4).params['num_leaves'] == 63
+        
+        assert params['num_leaves'] == 16
+    
+    def test_probe_fails_on_cpu_only_build(self):
+        """Test the probe reports no CUDA when LightGBM cannot train on it."""
+        models._lightgbm_cuda_available.cache_clear()
+        with patch.object(models.lgb, 'train', side_effect=models.lgb.basic.LightGBMError('no CUDA')):
+            assert models._lightgbm_cuda_available() is False
+        models._lightgbm_cuda_available.cache_clear()
+
+
+class TestPersistence:
+    """Test cases for saving and loading models."""
+    
+    @pytest.mark.parametrize('model_class, suffix', [
+        (XGBoostModel, '.ubj'),
+        (LightGBMModel, '.txt'),
+    ])
+    def test_native_booster_round_trip(self, dataset, tmp_path, model_class, suffix):
+        """Test boosters are saved in their native format and reload to the same predictions."""
+        X, y = dataset
+        model = model_class(n_estimators=10).fit(X, y)
+        path = tmp_path / 'model.pkl'
+        
+        model.save(str(path))
+        loaded = model_class()
+        loaded.load(str(path))
+        
+        assert (tmp_path / f'model.pkl{suffix}').exists()
+        with open(path, 'rb') as f:
+            assert 'model' not in pickle.load(f)
+        np.testing.assert_allclose(loaded.predict_proba(X), model.predict_proba(X), rtol=1e-6)
+        assert (loaded.predict(X) == model.predict(X)).all()
+        assert loaded.feature_names == model.feature_names
+        pd.testing.assert_frame_equal(loaded.get_feature_importance(), model.get_feature_importance())
+    
+    @pytest.mark.parametrize('model_class', [XGBoostModel, LightGBMModel])
+    def test_legacy_pickled_model_loads(self, dataset, tmp_path, model_class):
+        """Test files written before native saving, with the whole estimator pickled, still load."""
+        X, y = dataset
+        model = model_class(n_estimators=10).fit(X, y)
+        path = tmp_path / 'legacy.pkl'
+        BaseModel.save(model, str(path))
+        
+        loaded = model_class()
+        loaded.load(str(path))
+        
+        np.testing.assert_allclose(loaded.predict_proba(X), model.predict_proba(X))
+    
+    def test_ensemble_round_trip(self, dataset, tmp_path):
+        """Test an ensemble reloads its natively saved base models."""
+        X, y = dataset
+        model = EnsembleModel([XGBoostModel(n_estimators=10), LightGBMModel(n_estimators=10)]).fit(X, y)
+        path = tmp_path / 'ensemble.pkl'
+        
+        model.save(str(path))
+        loaded = EnsembleModel()
+        loaded.load(str(path))
+        
+        np.testing.assert_allclose(loaded.predict_proba(X), model.predict_proba(X), rtol=1e-6)
+
+
+class FakeForestInference:
+    """Stands in for cuML's ForestInference, scoring with the saved booster on the CPU."""
+    
+    loaded = []
+    
+    def __init__(self, path, model_type):
+        self.model_type = model_type
+        self.batch_sizes = []
+        if model_type == 'xgboost_ubj':
+            self.model = xgb.XGBClassifier()
+            self.model.load_model(path)
+        else:
+            self.booster = lgb.Booster(model_file=path)
+    
+    @classmethod
+    def load(cls, path, is_classifier, model_type):
+        assert is_classifier
+        fil = cls(path, model_type)
+        cls.loaded.append(fil)
+        return fil
+    
+    def optimize(self, batch_size):
+        self.batch_sizes.append(batch_size)
+    
+    def predict_proba(self, X):
+        assert isinstance(X, np.ndarray)
+        if self.model_type == 'xgboost_ubj':
+            return self.model.predict_proba(X)
+        p = self.booster.predict(X)
+        return np.column_stack([1 - p, p])
+
+
+class TestForestInference:
+    """Test cases for GPU inference through cuML's Forest Inference Library."""
+    
+    @pytest.fixture
+    def fil(self, monkeypatch):
+        FakeForestInference.loaded = []
+        monkeypatch.setattr(models, 'CUML_AVAILABLE', True)
+        monkeypatch.setattr(models, 'ForestInference', FakeForestInference, raising=False)
+        return FakeForestInference
+    
+    @pytest.mark.parametrize('model_class, model_type', [
+        (XGBoostModel, 'xgboost_ubj'),
+        (LightGBMModel, 'lightgbm'),
+    ])
+    def test_predictions_routed_through_fil(self, dataset, fil, model_class, model_type):
+        """Test trained models predict through FIL, optimized once for the batch size."""
+        X, y = dataset
+        model = model_class(n_estimators=10).fit(X, y)
+        
+        proba = model.predict_proba(X)
+        labels = model.predict(X)
+        
+        [loaded] = fil.loaded
+        assert loaded.model_type == model_type
+        assert loaded.batch_sizes == [len(X)]
+        np.testing.assert_allclose(proba, model.model.predict_proba(X), rtol=1e-6)
+        assert (labels == model.model.predict(X)).all()
+    
+    def test_fil_rebuilt_on_load_and_not_pickled(self, dataset, fil, tmp_path):
+        """Test the FIL copy is dropped from pickles and rebuilt when a saved model loads."""
+        X, y = dataset
+        model = XGBoostModel(n_estimators=10).fit(X, y)
+        model.predict_proba(X)
+        
+        assert '_fil' not in model.__getstate__()
+        model.save(str(tmp_path / 'model.pkl'))
+        loaded = XGBoostModel()
+        loaded.load(str(tmp_path / 'model.pkl'))
+        
+        assert loaded._fil is fil.loaded[-1]
+        np.testing.assert_allclose(loaded.predict_proba(X), model.predict_proba(X), rtol=1e-6)
+    
+    @pytest.mark.parametrize('model_class', [XGBoostModel, LightGBMModel])
+    def test_fil_rebuilt_on_unpickle(self, dataset, fil, model_class):
+        """Test a trained model restored with pickle, as the registry does, predicts through FIL."""
+        X, y = dataset
+        model = model_class(n_estimators=10).fit(X, y)
+        
+        restored = pickle.loads(pickle.dumps(model))
+        
+        assert restored._fil is fil.loaded[-1] and restored._fil is not model._fil
+        np.testing.assert_allclose(restored.predict_proba(X), model.predict_proba(X), rtol=1e-6)
+        assert pickle.loads(pickle.dumps(model_class()))._fil is None
+    
+    def test_cpu_fallback(self, dataset, fil, monkeypatch):
+        """Test use_fil=False, missing cuML and FIL load errors all predict on the CPU."""
+        X, y = dataset
+        
+        assert XGBoostModel(n_estimators=5, use_fil=False).fit(X, y)._fil is None
+        monkeypatch.setattr(fil, 'load', classmethod(lambda cls, *a, **k: 1 / 0))
+        assert XGBoostModel(n_estimators=5).fit(X, y)._fil is None
+        monkeypatch.setattr(models, 'CUML_AVAILABLE', False)
+        model = LightGBMModel(n_estimators=5).fit(X, y)
+        
+        assert model._fil is None
+        assert model.predict_proba(X).shape == (len(X), 2)
+
+
+class TestEnsembleModel:
+    """Test cases for the stacked ensemble."""
+    
+    @pytest.fixture
+    def ensemble(self, dataset):
+        X, y = dataset
+        return EnsembleModel([XGBoostModel(n_estimators=10), LightGBMModel(n_estimators=10)]).fit(X, y)
+    
+    def test_labels_and_probabilities_share_one_scoring_pass(self, ensemble, dataset):
+        """Test predict after predict_proba, and predict_with_proba, score base models once."""
+        X, _ = dataset
+        
+        with patch.object(XGBoostModel, 'predict_proba', autospec=True,
+                          side_effect=XGBoostModel.predict_proba) as base_proba:
+            proba = ensemble.predict_proba(X)
+            labels = ensemble.predict(X)
+            both = ensemble.predict_with_proba(X)
+        
+        assert base_proba.call_count == 1
+        assert (both[0] == labels).all()
+        np.testing.assert_array_equal(both[1], proba)
+        assert (labels == ensemble.meta_learner.classes_[proba.argmax(axis=1)]).all()
+    
+    def test_cache_distinguishes_inputs(self, ensemble, dataset):
+        """Test a different or edited input is rescored rather than served from the cache."""
+        X, _ = dataset
+        first = ensemble.predict_proba(X)
+        
+        X_copy = X.copy()
+        assert ensemble._cached_meta_features(X_copy) is not ensemble._cached_meta_features(X)
+        X_edited = X.copy()
+        X_edited.iloc[-1] += 10
+        
+        assert not np.allclose(ensemble.predict_proba(X_edited)[-1], first[-1])
+        assert len(ensemble._meta_cache) <= EnsembleModel._META_CACHE_SIZE
+        assert '_meta_cache' not in ensemble.__getstate__()
+        assert pickle.loads(pickle.dumps(ensemble))._meta_cache == {}
+    
+    def test_meta_features_single_precision(self, ensemble, dataset):
+        """Test meta-features are one float32 block that the meta-learner keeps in float32."""
+        X, _ = dataset
+        meta = ensemble._generate_meta_features(X)
+        
+        assert meta.dtype == np.float32 and meta.shape == (len(X), 4)
+        assert meta.flags['C_CONTIGUOUS']
+        np.testing.assert_allclose(meta[:, 2:], ensemble.base_models[1].predict_proba(X), rtol=1e-6)
+        assert ensemble.meta_learner.coef_.dtype == np.float32
+    
+    def test_base_models_train_concurrently(self, dataset):
+        """Test base models fit at the same time with the CPU cores split between them."""
+        X, y = dataset
+        barrier = threading.Barrier(2, timeout=10)
+        fit_n_jobs = set()
+        
+        def fit_together(original):
+            def fit(self, *args, **kwargs):
+                barrier.wait()
+                fit_n_jobs.add((type(self), self.params['n_jobs']))
+                return original(self, *args, **kwargs)
+            return fit
+        
+        base_models = [XGBoostModel(n_estimators=10), LightGBMModel(n_estimators=10, n_jobs=1)]
+        with patch.object(XGBoostModel, 'fit', fit_together(XGBoostModel.fit)), \
+                patch.object(LightGBMModel, 'fit', fit_together(LightGBMModel.fit)):
+            ensemble = EnsembleModel(base_models).fit(X, y)
+        
+        assert all(model.is_trained for model in ensemble.base_models)
+        assert fit_n_jobs == {
+            (XGBoostModel, max(1, (os.cpu_count() or 1) // 2)), (LightGBMModel, 1)
+        }
+        # The caller's models keep their own setting once the ensemble is fitted
+        assert base_models[0].params['n_jobs'] == -1
+        assert base_models[0].model.get_params()['n_jobs'] == -1
+        assert base_models[1].params['n_jobs'] == 1
+    
+    def test_meta_learner_trains_on_out_of_fold_predictions(self, dataset):
+        """Test meta-features come from fold models scoring held-out rows, not an in-sample pass."""
+        X, y = dataset
+        ensemble = EnsembleModel([XGBoostModel(n_estimators=10), LightGBMModel(n_estimators=10)], cv_folds=3)
+        
+        with patch.object(EnsembleModel, '_generate_meta_features') as in_sample, \
+                patch.object(XGBoostModel, 'fit', autospec=True, side_effect=XGBoostModel.fit) as fit, \
+                patch.object(ensemble.meta_learner, 'fit', wraps=ensemble.meta_learner.fit) as meta_fit:
+            ensemble.fit(X, y)
+        
+        in_sample.assert_not_called()
+        assert fit.call_count == 4
+        assert sorted(len(call.args[1]) for call in fit.call_args_list) == [133, 133, 134, 200]
+        
+        meta = meta_fit.call_args.args[0]
+        assert meta.dtype == np.float32 and not np.isnan(meta).any()
+        assert not np.allclose(meta, ensemble._generate_meta_features(X))
+        assert ensemble.predict_proba(X).shape == (len(X), 2)
+    
+    def test_too_few_rows_per_class_falls_back_to_in_sample(self, dataset):
+        """Test a class too small to fold trains the meta-learner on in-sample predictions."""
+        X, y = dataset
+        y = pd.Series(np.r_[1, np.zeros(len(y) - 1, dtype=int)])
+        ensemble = EnsembleModel([LightGBMModel(n_estimators=5, min_child_samples=1)])
+        
+        with pytest.warns(UserWarning, match='out-of-fold'):
+            ensemble.fit(X, y)
+        
+        assert ensemble._folds(pd.Series([0, 0, 1, 1, 1])) and ensemble.is_trained
+
+
+class TestSinglePrecision:
+    """Test cases for training on float32 features."""
+    
+    def test_float64_frame_cast_once_float32_frame_reused(self, dataset):
+        """Test float64 features are cast to float32 while float32 frames pass through uncopied."""
+        X, _ = dataset
+        X32 = X.astype(np.float32)
+        
+        assert (models._as_float32(X).dtypes == np.float32).all()
+        assert np.shares_memory(models._as_float32(X32).to_numpy(), X32.to_numpy())
+        assert models._as_float32(X.to_numpy()).dtype == np.float32
+    
+    @pytest.mark.parametrize('model_class, estimator', [
+        (XGBoostModel, xgb.XGBClassifier),
+        (LightGBMModel, lgb.LGBMClassifier),
+    ])
+    def test_boosters_train_on_float32(self, dataset, model_class, estimator):
+        """Test both boosters receive float32 training data and score float64 input consistently."""
+        X, y = dataset
+        model = model_class(n_estimators=10, use_fil=False)
+        
+        with patch.object(estimator, 'fit', autospec=True, side_effect=estimator.fit) as fit:
+            model.fit(X, y, eval_set=[(X, y)])
+        
+        args, kwargs = fit.call_args
+        assert np.asarray(args[1]).dtype == np.float32
+        assert np.asarray(kwargs['eval_set'][0][0]).dtype == np.float32
+        np.testing.assert_allclose(model.predict_proba(X), model.predict_proba(X.astype(np.float32)))
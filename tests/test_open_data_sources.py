@@ -268,5 +268,29 @@ class TestDatabaseModels:
         assert hasattr(EIAData, 'series_id')
 
 
+
+class TestIMFDataLoader:
+    """Test IMF response parsing."""
+    
+    @patch('modules.imf_data.IMFClient')
+    def test_fetch_imf_indicator_skips_non_numeric_values(self, mock_client):
+        """Empty and non-numeric cells are dropped; year bounds are applied."""
+        from modules.imf_data import fetch_imf_indicator
+        
+        mock_client.return_value.get_json.return_value = {
+            'values': {
+                'US': {'2020': '1.5', '2021': '', '2022': None, '2023': 2.0},
+                'JP': {'2020': 'n/a', '2021': 0.25},
+            }
+        }
+        
+        df = fetch_imf_indicator('NGDP_RPCH', start_year=2020, end_year=2022)
+        
+        assert list(df['country_code']) == ['US', 'JP']
+        assert list(df['year']) == [2020, 2021]
+        assert list(df['value']) == [1.5, 0.25]
+        assert (df['indicator'] == 'NGDP_RPCH').all()
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])